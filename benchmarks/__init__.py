@@ -0,0 +1,5 @@
+"""
+End-to-end benchmarks for PDF2Graph.
+
+Run ``python -m benchmarks.run_benchmarks --help`` from the repository root.
+"""
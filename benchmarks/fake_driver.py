@@ -0,0 +1,97 @@
+"""
+In-process stand-in for the Neo4j driver.
+
+It records every Cypher statement and its parameters instead of sending
+them anywhere, so the client-side cost of the write path and the searcher
+can be measured without a database.
+"""
+
+# Values returned for any key the code under test reads from a record
+DEFAULT_RECORD = {
+    "version": 0,
+    "relevance": 0.0,
+    "concepts": [],
+    "result": {},
+    "stats": {},
+}
+
+class FakeRecord(dict):
+    def __missing__(self, key):
+        return None
+
+class FakeResult:
+    def __init__(self, records):
+        self._records = records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def consume(self):
+        return None
+
+class FakeTransaction:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        self._driver.queries.append((query, params))
+        if "rows" in params:
+            self._driver.rows_written += len(params["rows"])
+        return FakeResult(self._driver.respond(query, params))
+
+class FakeSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        return FakeTransaction(self._driver).run(query, parameters, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        self._driver.transactions += 1
+        return work(FakeTransaction(self._driver), *args, **kwargs)
+
+    execute_read = execute_write
+
+    def close(self):
+        pass
+
+class FakeDriver:
+    """
+    Driver double with the subset of the API used by this project.
+
+    ``responder(query, params)`` may return the list of records for a query;
+    by default every query yields one record whose keys default to empty
+    values, which keeps the searcher's result handling on its normal path.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder
+        self.queries = []
+        self.rows_written = 0
+        self.transactions = 0
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def respond(self, query, params):
+        if self.responder is not None:
+            return [FakeRecord(record) for record in self.responder(query, params)]
+        return [FakeRecord(DEFAULT_RECORD)]
+
+    def reset(self):
+        self.queries.clear()
+        self.rows_written = 0
+        self.transactions = 0
+
+    def close(self):
+        pass
@@ -0,0 +1,230 @@
+"""
+Benchmark extraction, the Neo4j write path and the searcher queries.
+
+Example:
+    python -m benchmarks.run_benchmarks --pages 1 10 50 --table_density 0 0.5 --output bench.json
+    python -m benchmarks.run_benchmarks --output new.json --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.fake_driver import FakeDriver
+from benchmarks.synthetic_pdfs import generate_pdf
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+@contextmanager
+def timed(results, name):
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+def benchmark_extraction(extractor, pdf_path):
+    """Time every extraction stage separately, then the end-to-end ``extract``."""
+    stages = {}
+    with timed(stages, "extract_text_and_tables"):
+        text, tables = extractor.extract_text_and_tables(pdf_path)
+    with timed(stages, "parse"):
+        doc = extractor.nlp(text)
+    with timed(stages, "entities"):
+        entities, _ = extractor.extract_entities(doc)
+    with timed(stages, "context_vectors"):
+        extractor.compute_context_vectors(doc)
+    with timed(stages, "analyze_relationships"):
+        extractor.analyze_relationships(doc, entities)
+    with timed(stages, "concept_relationships"):
+        extractor.extract_concept_relationships(doc)
+    with timed(stages, "tables"):
+        extractor.process_table_content(tables)
+    with timed(stages, "keywords"):
+        extractor.extract_keywords(text)
+    with timed(stages, "topics"):
+        extractor.extract_topics(text)
+
+    start = time.perf_counter()
+    concepts = extractor.extract(pdf_path)
+    total = time.perf_counter() - start
+
+    counts = {
+        "characters": len(text),
+        "tables": len(tables),
+        "distinct_entities": sum(len(found) for found in entities.values()),
+    }
+    return {"stages": stages, "total": total, "counts": counts}, concepts
+
+def make_connector(args, nlp):
+    from neo4j_integration import Neo4jConnector
+
+    connector = Neo4jConnector(args.neo4j_uri or "bolt://localhost:7687", args.neo4j_user,
+                               args.neo4j_password or "", nlp=nlp, batch_size=args.batch_size)
+    if not args.neo4j_uri:
+        connector.driver.close()
+        connector.driver = FakeDriver()
+    return connector
+
+def make_searcher(args):
+    from neo4j_searcher import Neo4jSearcher
+
+    searcher = Neo4jSearcher(args.neo4j_uri or "bolt://localhost:7687", args.neo4j_user,
+                             args.neo4j_password or "")
+    if not args.neo4j_uri:
+        searcher.driver.close()
+        searcher.driver = FakeDriver()
+    return searcher
+
+def benchmark_write(connector, concepts, document):
+    start = time.perf_counter()
+    connector.add_nodes_and_relationships(concepts, document)
+    result = {"seconds": time.perf_counter() - start}
+    if isinstance(connector.driver, FakeDriver):
+        result.update(queries=len(connector.driver.queries),
+                      transactions=connector.driver.transactions,
+                      rows=connector.driver.rows_written)
+        connector.driver.reset()
+    return result
+
+def benchmark_search(searcher, topics, concepts, repeat):
+    """Average seconds per call of each searcher query over ``repeat`` calls."""
+    topic = next(iter(topics), "data")
+    concept = next(iter(concepts), "data")
+    calls = {
+        "search_topics": lambda: searcher.search_topics(topic),
+        "search_topics_fulltext": lambda: searcher.search_topics(topic, mode="fulltext"),
+        "get_topic_concepts": lambda: searcher.get_topic_concepts(topic),
+        "search_concept_network": lambda: searcher.search_concept_network(topic, concept),
+        "get_topic_statistics": lambda: searcher.get_topic_statistics(),
+    }
+    results = {}
+    for name, call in calls.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        results[name] = {"seconds": (time.perf_counter() - start) / repeat}
+    return results
+
+def flatten_timings(data, prefix=""):
+    """Map dotted paths to every timing (``seconds``/``total``/stage) in a result tree."""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, (dict, list)):
+                flat.update(flatten_timings(value, path))
+            elif isinstance(value, float) and (key in ("seconds", "total") or ".stages." in f".{path}"):
+                flat[path] = value
+    elif isinstance(data, list):
+        for item in data:
+            flat.update(flatten_timings(item, f"{prefix}.{item.get('name', '')}" if isinstance(item, dict) else prefix))
+    return flat
+
+def compare(current, baseline, tolerance, min_seconds=0.001):
+    """
+    Print per-metric ratios against the baseline and return the regressed
+    metrics. Metrics faster than ``min_seconds`` in both runs are skipped as noise.
+    """
+    now, before = flatten_timings(current), flatten_timings(baseline)
+    regressions = []
+    for path in sorted(now):
+        if path not in before or before[path] <= 0:
+            continue
+        if max(now[path], before[path]) < min_seconds:
+            continue
+        ratio = now[path] / before[path]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(path)
+            flag = "  REGRESSION"
+        print(f"{path}: {before[path]:.4f}s -> {now[path]:.4f}s ({ratio:.2f}x){flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF2Graph extraction, ingestion and search.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50], help="Page counts of the synthetic PDFs.")
+    parser.add_argument("--table_density", type=float, nargs="+", default=[0.0, 0.5],
+                        help="Fractions of pages that carry a table.")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per searcher query.")
+    parser.add_argument("--batch_size", type=int, default=1000, help="Rows per batched write transaction.")
+    parser.add_argument("--neo4j_uri", type=str, default=None,
+                        help="Benchmark against this Neo4j instance instead of the in-process fake driver.")
+    parser.add_argument("--neo4j_user", type=str, default="neo4j", help="Neo4j username.")
+    parser.add_argument("--neo4j_password", type=str, default=None, help="Neo4j password.")
+    parser.add_argument("--output", type=str, default="bench_output.json", help="Where to write the JSON results.")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline before a metric counts as a regression.")
+    parser.add_argument("--min_seconds", type=float, default=0.001,
+                        help="Ignore metrics faster than this in both runs when comparing.")
+    args = parser.parse_args(argv)
+
+    from pdf_concept_extractor import ConceptExtractor
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "backend": args.neo4j_uri or "fake",
+        },
+        "scenarios": [],
+    }
+
+    start = time.perf_counter()
+    extractor = ConceptExtractor()
+    results["model_load_seconds"] = time.perf_counter() - start
+    connector = make_connector(args, extractor.nlp)
+    searcher = make_searcher(args)
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for pages in args.pages:
+                for density in args.table_density:
+                    name = f"pages={pages},tables={density}"
+                    pdf_path = generate_pdf(Path(workdir) / f"synthetic_{pages}_{density}.pdf",
+                                            pages, table_density=density, seed=pages)
+                    print(f"Running {name}")
+                    extraction, concepts = benchmark_extraction(extractor, pdf_path)
+                    scenario = {"name": name, "pages": pages, "table_density": density,
+                                "extraction": extraction}
+                    if concepts:
+                        scenario["write"] = benchmark_write(connector, concepts, pdf_path.name)
+                        scenario["search"] = benchmark_search(
+                            searcher, concepts["topics"],
+                            [entity for found in concepts["named_entities"].values() for entity in found],
+                            args.repeat)
+                    scenario["peak_rss_mb"] = peak_rss_mb()
+                    results["scenarios"].append(scenario)
+    finally:
+        connector.close()
+        searcher.close()
+
+    results["peak_rss_mb"] = peak_rss_mb()
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import random
+from pathlib import Path
+
+# Vocabulary for sentences that the NER, noun-chunk and keyword stages pick up
+ORGANIZATIONS = ["Acme Corporation", "Globex Industries", "Initech", "Umbrella Group",
+                 "Stark Enterprises", "Wayne Holdings", "Hooli", "Vandelay Imports"]
+PEOPLE = ["Alice Johnson", "Robert Chen", "Maria Garcia", "David Smith",
+          "Priya Patel", "Tom Walker", "Sara Nilsson", "Kenji Tanaka"]
+PLACES = ["Berlin", "Toronto", "Sydney", "Nairobi", "Chicago", "Singapore", "Madrid"]
+SUBJECTS = ["renewable energy", "supply chain", "machine learning", "market growth",
+            "customer retention", "risk management", "data privacy", "cloud infrastructure"]
+VERBS = ["acquired", "reported", "announced", "invested in", "partnered with", "reviewed"]
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+LINE_HEIGHT = 14
+CHARS_PER_LINE = 95
+
+def synthetic_sentence(rng):
+    """One sentence mixing organizations, people, places and subject phrases."""
+    templates = [
+        "{org} {verb} {org2} in {place} to expand its {subject} business.",
+        "{person} said the {subject} program at {org} grew strongly in {place}.",
+        "In {place}, {person} {verb} a new {subject} initiative with {org}.",
+        "{org} and {org2} compared {subject} results across {place} offices.",
+    ]
+    return rng.choice(templates).format(
+        org=rng.choice(ORGANIZATIONS), org2=rng.choice(ORGANIZATIONS),
+        person=rng.choice(PEOPLE), place=rng.choice(PLACES),
+        subject=rng.choice(SUBJECTS), verb=rng.choice(VERBS),
+    )
+
+def synthetic_table(rng, rows=6):
+    """A header row plus ``rows`` data rows of short categorical values."""
+    header = ["Company", "Region", "Contact", "Focus"]
+    body = [[rng.choice(ORGANIZATIONS), rng.choice(PLACES), rng.choice(PEOPLE), rng.choice(SUBJECTS)]
+            for _ in range(rows)]
+    return [header] + body
+
+def _wrap(text, width=CHARS_PER_LINE):
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _page_stream(lines, table):
+    """PDF content stream drawing ``lines`` of text and an optional ruled table."""
+    ops = ["BT", "/F1 10 Tf", f"{LINE_HEIGHT} TL", f"50 {PAGE_HEIGHT - 50} Td"]
+    for line in lines:
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+
+    if table:
+        col_width, row_height = 125, 18
+        left, top = 50, 50 + row_height * len(table)
+        right = left + col_width * len(table[0])
+        # Ruling lines let pdfplumber's table finder detect the grid
+        ops.append("0.5 w")
+        for r in range(len(table) + 1):
+            y = top - r * row_height
+            ops.append(f"{left} {y} m {right} {y} l S")
+        for c in range(len(table[0]) + 1):
+            x = left + c * col_width
+            ops.append(f"{x} {top} m {x} {top - row_height * len(table)} l S")
+        ops.append("BT /F1 8 Tf")
+        for r, row in enumerate(table):
+            for c, cell in enumerate(row):
+                x = left + c * col_width + 3
+                y = top - (r + 1) * row_height + 5
+                ops.append(f"1 0 0 1 {x} {y} Tm ({_escape(cell[:28])}) Tj")
+        ops.append("ET")
+
+    return "\n".join(ops).encode("latin-1", "replace")
+
+def write_pdf(path, pages):
+    """
+    Write a minimal PDF. ``pages`` is a list of ``(lines, table)`` where
+    ``table`` is a list of rows or None.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for lines, table in pages:
+        stream = _page_stream(lines, table)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_ref)
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_refs)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+
+def generate_pdf(path, page_count, table_density=0.0, seed=0):
+    """
+    Generate a synthetic report of ``page_count`` pages; ``table_density`` is
+    the fraction of pages that also carry a ruled table.
+    """
+    rng = random.Random(seed)
+    lines_per_page = (PAGE_HEIGHT - 100) // LINE_HEIGHT
+    pages = []
+    for _ in range(page_count):
+        table = synthetic_table(rng) if rng.random() < table_density else None
+        # Leave room at the bottom of the page for the table
+        budget = lines_per_page - (12 if table else 0)
+        lines = []
+        while len(lines) < budget:
+            lines.extend(_wrap(" ".join(synthetic_sentence(rng) for _ in range(3))))
+        pages.append((lines[:budget], table))
+    write_pdf(path, pages)
+    return Path(path)
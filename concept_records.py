@@ -0,0 +1,151 @@
+import sys
+from array import array
+from collections.abc import Mapping
+
+class SentenceTable:
+    """
+    Every context sentence of a document, stored once and referenced by ID.
+
+    Entities and relationship records keep integer sentence IDs instead of
+    their own copies of the text. Adding a sentence that is already in the
+    table returns its existing ID. Pickled tables (e.g. in the extraction
+    cache or between worker processes) hold one string plus offsets.
+    """
+
+    def __init__(self):
+        self._texts = []
+        self._index = {}
+        # Set instead of _texts after unpickling
+        self._joined = None
+        self._offsets = None
+
+    def add(self, text):
+        """ID of ``text``, adding it to the table when it is new."""
+        if self._joined is not None:
+            self._thaw()
+        sentence_id = self._index.get(text)
+        if sentence_id is None:
+            sentence_id = self._index[text] = len(self._texts)
+            self._texts.append(text)
+        return sentence_id
+
+    def text(self, sentence_id):
+        if self._joined is not None:
+            return self._joined[self._offsets[sentence_id]:self._offsets[sentence_id + 1]]
+        return self._texts[sentence_id]
+
+    def __len__(self):
+        return len(self._offsets) - 1 if self._joined is not None else len(self._texts)
+
+    def _thaw(self):
+        self._texts = [self.text(i) for i in range(len(self))]
+        self._index = {text: i for i, text in enumerate(self._texts)}
+        self._joined = None
+        self._offsets = None
+
+    def __getstate__(self):
+        if self._joined is not None:
+            return {"joined": self._joined, "offsets": self._offsets}
+        offsets = array('q', [0])
+        for text in self._texts:
+            offsets.append(offsets[-1] + len(text))
+        return {"joined": "".join(self._texts), "offsets": offsets}
+
+    def __setstate__(self, state):
+        self._texts = []
+        self._index = {}
+        self._joined = state["joined"]
+        self._offsets = state["offsets"]
+
+class EntityContexts(Mapping):
+    """
+    Entity text -> the sentences it is mentioned in (one per mention).
+
+    Sentence IDs into a shared ``SentenceTable`` are stored in compact
+    integer arrays; indexing an entity materializes its list of sentence
+    texts only when a caller actually needs the text.
+    """
+
+    def __init__(self, sentences):
+        self.sentences = sentences
+        self._ids = {}
+
+    @classmethod
+    def from_texts(cls, entity_contexts):
+        """Build from a plain ``{entity: [sentence, ...]}`` mapping."""
+        contexts = cls(SentenceTable())
+        for entity, texts in entity_contexts.items():
+            for text in texts:
+                contexts.add(entity, contexts.sentences.add(text))
+        return contexts
+
+    def add(self, entity, sentence_id):
+        ids = self._ids.get(entity)
+        if ids is None:
+            ids = self._ids[entity] = array('i')
+        ids.append(sentence_id)
+
+    def merge(self, other):
+        """Append the mentions of ``other``, which must share this sentence table."""
+        for entity, ids in other._ids.items():
+            if entity in self._ids:
+                self._ids[entity].extend(ids)
+            else:
+                self._ids[entity] = array('i', ids)
+
+    def sentence_ids(self, entity):
+        return self._ids[entity]
+
+    def __getitem__(self, entity):
+        return [self.sentences.text(i) for i in self._ids[entity]]
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+class _Record:
+    """
+    Relationship record with ``__slots__`` and a lazily resolved ``sentence``.
+    Fields are attributes; ``record['field']`` is kept for dict-style callers.
+    """
+    __slots__ = ('sentence_id', 'sentences')
+    fields = ()
+
+    def __init__(self, *values, sentence_id, sentences):
+        for field, value in zip(self.fields, values):
+            # Short strings repeat a lot across records
+            setattr(self, field, sys.intern(value))
+        self.sentence_id = sentence_id
+        self.sentences = sentences
+
+    @property
+    def sentence(self):
+        return self.sentences.text(self.sentence_id)
+
+    def __getitem__(self, field):
+        return getattr(self, field)
+
+    def as_dict(self):
+        """The record as a dict, sentence text included."""
+        return {**{field: getattr(self, field) for field in self.fields}, 'sentence': self.sentence}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        # Equal records have equal fields and sentence text, whatever their sentence IDs
+        return hash((type(self),) + tuple(getattr(self, field) for field in self.fields) + (self.sentence,))
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}({values}, sentence_id={self.sentence_id})"
+
+class SubjectObject(_Record):
+    __slots__ = ('subject', 'verb', 'object')
+    fields = ('subject', 'verb', 'object')
+
+class NounChunkRelation(_Record):
+    __slots__ = ('entity1', 'relationship', 'entity2')
+    fields = ('entity1', 'relationship', 'entity2')
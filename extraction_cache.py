@@ -0,0 +1,95 @@
+import hashlib
+import logging
+import pickle
+import sqlite3
+import time
+import zlib
+
+class ExtractionCache:
+    """
+    On-disk cache of extraction results for incremental folder runs.
+
+    Entries are keyed by the SHA-256 of the PDF's bytes plus the extractor
+    version string, so a changed file or a changed model/settings never hits
+    a stale entry. Results are pickled, zlib-compressed and stored in a single
+    SQLite file. When the total stored size exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_bytes=2 * 1024 ** 3):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def key_for(pdf_path, version, chunk_size=1 << 20):
+        """Content hash of the PDF combined with the extractor version."""
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                digest.update(block)
+        return f"{digest.hexdigest()}:{version}"
+
+    def get(self, key):
+        """Return the cached concepts for ``key``, or None on a miss."""
+        row = self.conn.execute("SELECT data FROM extractions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        try:
+            return pickle.loads(zlib.decompress(row[0]))
+        except Exception as e:
+            self.logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            self.conn.commit()
+            return None
+
+    def put(self, key, concepts):
+        """Store ``concepts`` under ``key`` and evict old entries if over the size limit."""
+        data = zlib.compress(pickle.dumps(concepts, protocol=pickle.HIGHEST_PROTOCOL))
+        if len(data) > self.max_bytes:
+            self.logger.warning(f"Not caching {key}: {len(data)} bytes exceeds the cache size limit")
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO extractions (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, sqlite3.Binary(data), len(data), time.time())
+        )
+        self._evict()
+        self.conn.commit()
+
+    def clear(self):
+        """Remove every entry, e.g. to rebuild the cache from scratch."""
+        self.conn.execute("DELETE FROM extractions")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def total_size(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+
+    def _evict(self):
+        excess = self.total_size() - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in self.conn.execute("SELECT key, size FROM extractions ORDER BY last_used"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.conn.executemany("DELETE FROM extractions WHERE key = ?", evicted)
+        self.logger.info(f"Evicted {len(evicted)} least recently used cache entries")
@@ -0,0 +1,396 @@
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from neo4j_integration import MAX_CONTEXTS, TOP_CONCEPTS, find_topic_concept_relationships, graph_rows
+
+# Separates the elements of string[] columns (passed to neo4j-admin as --array-delimiter)
+ARRAY_DELIMITER = "\x1f"
+
+# Node files: label (also the ID space) -> (file name, [(property, CSV type or None for string)])
+NODE_FILES = {
+    'Concept': ('concepts.csv', [('name', None), ('type', None)]),
+    'Topic': ('topics.csv', [('name', None), ('relevance', 'double'), ('conceptCount', 'long'),
+                             ('topConcepts', 'string[]')]),
+    'GraphMeta': ('graph_meta.csv', [('name', None), ('version', 'long'), ('topicConceptTotal', 'long')]),
+}
+
+# Relationship files: kind -> (file name, start ID space, end ID space, type, properties)
+RELATIONSHIP_FILES = {
+    'topic_association': ('topic_concept_related_to.csv', 'Topic', 'Concept', 'RELATED_TO',
+                          [('type', None), ('weight', 'double'), ('contextSimilarity', 'double'),
+                           ('documentCount', 'long')]),
+    'topic_similarity': ('topic_topic_related_to.csv', 'Topic', 'Topic', 'RELATED_TO',
+                         [('type', None), ('weight', 'double'), ('shared_concepts', 'long')]),
+    'weighted': ('related_weighted.csv', 'Concept', 'Concept', 'RELATED',
+                 [('type', None), ('weight', 'double'), ('count', 'long'), ('documentCount', 'long')]),
+    'labelled': ('related_labelled.csv', 'Concept', 'Concept', 'RELATED',
+                 [('type', None), ('relation', None), ('count', 'long'), ('documentCount', 'long')]),
+    'unweighted': ('related.csv', 'Concept', 'Concept', 'RELATED',
+                   [('type', None), ('count', 'long'), ('documentCount', 'long')]),
+    'noun_chunk': ('related_noun_chunk.csv', 'Concept', 'Concept', 'RELATED',
+                   [('type', None), ('relation', None), ('count', 'long'), ('contexts', 'string[]'),
+                    ('documentCount', 'long')]),
+    'column': ('related_column.csv', 'Concept', 'Concept', 'RELATED',
+               [('type', None), ('relation', None), ('count', 'long'), ('documentCount', 'long')]),
+    'action': ('action.csv', 'Concept', 'Concept', 'ACTION',
+               [('type', None), ('verb', None), ('count', 'long'), ('contexts', 'string[]'),
+                ('documentCount', 'long')]),
+}
+
+def node_id(label, *key):
+    """Stable ID of a node, derived from its label and the properties it is merged on."""
+    digest = hashlib.blake2b("\x1f".join((label,) + key).encode("utf-8"), digest_size=12)
+    return f"{label[0].lower()}{digest.hexdigest()}"
+
+class GraphExporter:
+    """
+    Offline export of extracted concepts to CSV files for ``neo4j-admin database import``.
+
+    Documents are added one at a time with ``add(concepts)`` and produce the
+    same Concept and Topic nodes and relationships between them that
+    ``Neo4jConnector.add_nodes_and_relationships`` would MERGE, including its
+    last-write-wins properties, ``documentCount`` and the topic similarity
+    relationships. Unlike the connector it writes no ``Document`` nodes, so
+    no ``MENTIONS``/``HAS_TOPIC`` edges or per-document contributions: a
+    bulk-loaded PDF cannot be replaced or removed through the connector
+    later. Everything is staged in a SQLite file next to the output, so
+    memory use does not grow with the corpus; ``finish()`` streams the
+    deduplicated rows out to the CSV files.
+
+    Node IDs are stable hashes of the merge keys, so exporting the same
+    corpus twice yields the same IDs.
+    """
+
+    def __init__(self, output_dir, nlp):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.nlp = nlp
+        self.logger = logging.getLogger(__name__)
+        self.documents = 0
+        fd, self.work_path = tempfile.mkstemp(prefix=".export-", suffix=".sqlite", dir=self.output_dir)
+        os.close(fd)
+        self.conn = sqlite3.connect(self.work_path)
+        self.conn.create_function("merge_props", 2, _merge_props, deterministic=True)
+        self.conn.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE concepts (id TEXT PRIMARY KEY, name TEXT NOT NULL, type TEXT NOT NULL);
+            CREATE INDEX concepts_name ON concepts (name);
+            CREATE TABLE topics (id TEXT PRIMARY KEY, name TEXT NOT NULL, relevance REAL);
+            CREATE TABLE relationships (
+                kind TEXT NOT NULL,
+                start TEXT NOT NULL,
+                end TEXT NOT NULL,
+                merge_key TEXT NOT NULL,
+                props TEXT NOT NULL,
+                PRIMARY KEY (kind, start, end, merge_key)
+            );
+            CREATE TEMP TABLE staged (start TEXT, end TEXT, merge_key TEXT, props TEXT);
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Drop the staging database (after ``finish`` or to abandon the export)."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            Path(self.work_path).unlink(missing_ok=True)
+
+    def add(self, concepts):
+        """Stage the nodes and relationships of one document."""
+        topic_concept_rels = find_topic_concept_relationships(
+            self.nlp, concepts['topics'], concepts['entity_contexts'], concepts.get('context_vectors'))
+        rows = graph_rows(concepts, topic_concept_rels)
+
+        # Same order as the connector's writes, so name lookups see the same nodes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO concepts VALUES (?, ?, ?)",
+                ((node_id('Concept', row['name'], row['type']), row['name'], row['type'])
+                 for row in rows['concept']))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO topics VALUES (?, ?, ?)",
+                ((node_id('Topic', row['name']), row['name'], float(row['relevance']))
+                 for row in rows['topic']))
+
+            self._stage(((node_id('Topic', row['topic']), row['entity'], "",
+                          {'type': 'topic_association', 'weight': float(row['strength']),
+                           'contextSimilarity': float(row['context_similarity']), 'documentCount': 1})
+                         for row in rows['topic_association']))
+            self.conn.execute("""
+                INSERT INTO relationships
+                SELECT 'topic_association', s.start, c.id, s.merge_key, s.props
+                FROM staged s JOIN concepts c ON c.name = s.end
+                WHERE true
+                ON CONFLICT (kind, start, end, merge_key) DO UPDATE SET props = merge_props(props, excluded.props)
+            """)
+
+            self._merge_by_name('weighted', (
+                (row['entity1'], row['entity2'],
+                 {'type': row['rel_type'], 'weight': float(row['weight']), 'count': row['count'],
+                  'documentCount': 1})
+                for row in rows['weighted']), merge_on=('type',))
+            self._merge_by_name('labelled', (
+                (row['entity1'], row['entity2'],
+                 {'type': row['rel_type'], 'relation': row['relation'], 'count': row['count'],
+                  'documentCount': 1})
+                for row in rows['labelled']), merge_on=('type', 'relation'))
+            self._merge_by_name('unweighted', (
+                (row['entity1'], row['entity2'],
+                 {'type': row['rel_type'], 'count': row['count'], 'documentCount': 1})
+                for row in rows['unweighted']), merge_on=('type',))
+            self._merge_by_name('action', (
+                (row['subject'], row['object'],
+                 {'type': 'subject_object', 'verb': row['verb'], 'count': row['count'],
+                  'contexts': row['contexts'], 'documentCount': 1})
+                for row in rows['action']), merge_on=('type', 'verb'))
+            self._merge_by_name('noun_chunk', (
+                (row['entity1'], row['entity2'],
+                 {'type': 'noun_chunk', 'relation': row['relationship'], 'count': row['count'],
+                  'contexts': row['contexts'], 'documentCount': 1})
+                for row in rows['noun_chunk']), merge_on=('type', 'relation'))
+
+            # Column relationships MERGE their own typed concept nodes
+            column_nodes = []
+            column_rels = []
+            for row in rows['column']:
+                start = node_id('Concept', row['entity1'], row['col1'])
+                end = node_id('Concept', row['entity2'], row['col2'])
+                column_nodes += [(start, row['entity1'], row['col1']), (end, row['entity2'], row['col2'])]
+                props = {'type': 'column_relationship', 'relation': row['relation'], 'count': int(row['count']),
+                         'documentCount': 1}
+                column_rels.append(('column', start, end, _merge_key(props, ('type', 'relation')),
+                                    json.dumps(props)))
+            self.conn.executemany("INSERT OR IGNORE INTO concepts VALUES (?, ?, ?)", column_nodes)
+            self.conn.executemany("""
+                INSERT INTO relationships VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, start, end, merge_key) DO UPDATE SET props = merge_props(props, excluded.props)
+            """, column_rels)
+
+        self.documents += 1
+
+    def _stage(self, rows):
+        self.conn.execute("DELETE FROM staged")
+        self.conn.executemany("INSERT INTO staged VALUES (?, ?, ?, ?)",
+                              ((start, end, key, json.dumps(props)) for start, end, key, props in rows))
+
+    def _merge_by_name(self, kind, rows, merge_on):
+        """Relationships between every pair of concepts matching the two names, like ``MATCH ... {name}``."""
+        self._stage((start, end, _merge_key(props, merge_on), props) for start, end, props in rows)
+        self.conn.execute("""
+            INSERT INTO relationships
+            SELECT ?, a.id, b.id, s.merge_key, s.props
+            FROM staged s
+            JOIN concepts a ON a.name = s.start
+            JOIN concepts b ON b.name = s.end
+            WHERE true
+            ON CONFLICT (kind, start, end, merge_key) DO UPDATE SET props = merge_props(props, excluded.props)
+        """, (kind,))
+
+    def finish(self):
+        """
+        Write all CSV files and return their paths keyed by node label or
+        relationship kind. Topic similarity is computed here, over the
+        whole corpus, as the connector's query does after every document.
+        """
+        with self.conn:
+            # Built once the staging is done; the self-join looks up the topics of each concept
+            self.conn.execute("CREATE INDEX IF NOT EXISTS relationships_kind_end ON relationships (kind, end)")
+            self.conn.execute("""
+                INSERT OR REPLACE INTO relationships
+                SELECT 'topic_similarity', r1.start, r2.start, '',
+                       json_object('type', 'topic_similarity',
+                                   'weight', AVG(json_extract(r1.props, '$.weight') + json_extract(r2.props, '$.weight')),
+                                   'shared_concepts', COUNT(*))
+                FROM relationships r1
+                JOIN relationships r2 ON r1.end = r2.end AND r1.start <> r2.start
+                WHERE r1.kind = 'topic_association' AND r2.kind = 'topic_association'
+                GROUP BY r1.start, r2.start
+            """)
+
+        paths = {}
+        paths['Concept'] = self._write_nodes('Concept', "SELECT id, name, type FROM concepts ORDER BY id")
+        # Topic statistics materialized as Neo4jConnector maintains them
+        paths['Topic'] = self._write_nodes('Topic', """
+            SELECT t.id, t.name, t.relevance,
+                   (SELECT COUNT(*) FROM relationships r
+                    WHERE r.kind = 'topic_association' AND r.start = t.id),
+                   (SELECT group_concat(name, ?) FROM (
+                        SELECT c.name, MAX(json_extract(r.props, '$.weight')) AS weight
+                        FROM relationships r JOIN concepts c ON c.id = r.end
+                        WHERE r.kind = 'topic_association' AND r.start = t.id
+                        GROUP BY c.name
+                        ORDER BY weight DESC, c.name
+                        LIMIT ?))
+            FROM topics t ORDER BY t.id
+        """, (ARRAY_DELIMITER, TOP_CONCEPTS))
+        # Lets Neo4jSearcher's query cache see a graph version from the start
+        paths['GraphMeta'] = self._write_nodes('GraphMeta', """
+            SELECT ?, 'graph', 1, (SELECT COUNT(*) FROM relationships WHERE kind = 'topic_association')
+        """, (node_id('GraphMeta', 'graph'),))
+
+        for kind, (file_name, start_space, end_space, rel_type, properties) in RELATIONSHIP_FILES.items():
+            header = [f":START_ID({start_space})", f":END_ID({end_space})", ":TYPE"]
+            header += [_column(name, csv_type) for name, csv_type in properties]
+            cursor = self.conn.execute(
+                "SELECT start, end, props FROM relationships WHERE kind = ? ORDER BY start, end, merge_key",
+                (kind,))
+            rows = ([start, end, rel_type] + [_csv_value(json.loads(props).get(name)) for name, _ in properties]
+                    for start, end, props in cursor)
+            paths[kind] = self._write_csv(file_name, header, rows)
+
+        self.logger.info(f"Exported {self.documents} documents to {self.output_dir}")
+        return paths
+
+    def _write_nodes(self, label, query, params=()):
+        file_name, properties = NODE_FILES[label]
+        header = [f":ID({label})"]
+        header += [_column(name, csv_type) for name, csv_type in properties] + [":LABEL"]
+        rows = (list(row) + [label] for row in self.conn.execute(query, params))
+        return self._write_csv(file_name, header, rows)
+
+    def _write_csv(self, file_name, header, rows):
+        path = self.output_dir / file_name
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        self.logger.info(f"Wrote {count} rows to {path}")
+        return path
+
+def import_command(paths, database="neo4j"):
+    """The ``neo4j-admin`` command line that loads the files returned by ``GraphExporter.finish``."""
+    parts = ["neo4j-admin database import full", database, "--multiline-fields=true",
+             f"--array-delimiter=U+{ord(ARRAY_DELIMITER):04X}"]
+    parts += [f"--nodes={paths[label]}" for label in NODE_FILES]
+    parts += [f"--relationships={paths[kind]}" for kind in RELATIONSHIP_FILES]
+    return " ".join(parts)
+
+def _column(name, csv_type):
+    return f"{name}:{csv_type}" if csv_type else name
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ARRAY_DELIMITER.join(str(item).replace(ARRAY_DELIMITER, " ") for item in value)
+    return value
+
+def _merge_props(old, new):
+    """
+    Properties of a relationship MERGEd again: counts (and document counts)
+    add up and example contexts are appended up to ``MAX_CONTEXTS``; the
+    rest is overwritten.
+    """
+    old, new = json.loads(old), json.loads(new)
+    for name in ('count', 'documentCount'):
+        if name in new:
+            new[name] += old.get(name) or 0
+    if 'contexts' in new:
+        contexts = old.get('contexts') or []
+        contexts += [context for context in new['contexts'] if context not in contexts]
+        new['contexts'] = contexts[:MAX_CONTEXTS]
+    return json.dumps(new)
+
+def _merge_key(props, merge_on):
+    """The properties a relationship is MERGEd on, as one comparable string."""
+    return json.dumps([props[name] for name in merge_on])
+
+def export_concepts(documents, output_dir, nlp):
+    """
+    Export an iterable of ``concepts`` dicts (one per document, e.g. from
+    ``extract_concepts_from_pdf``) and return the written file paths.
+    ``None`` entries from failed extractions are skipped.
+    """
+    with GraphExporter(output_dir, nlp) as exporter:
+        for concepts in documents:
+            if concepts is not None:
+                exporter.add(concepts)
+        return exporter.finish()
+
+def main(folder, output_dir, extractor_options=None, cache_path=None, topic_model_path=None):
+    """
+    Extract every PDF in a folder (reusing cached extraction results when
+    ``cache_path`` is given) and export the graph for neo4j-admin. Topics
+    are scored against the corpus model at ``topic_model_path`` when given.
+    """
+    from pdf_concept_extractor import ConceptExtractor, extractor_version
+    from extraction_cache import ExtractionCache
+    from topic_model import CorpusTopicModel
+
+    logger = logging.getLogger(__name__)
+    extractor_options = extractor_options or {}
+    version = extractor_version(**extractor_options)
+    topic_model = CorpusTopicModel.load(topic_model_path) if topic_model_path else CorpusTopicModel()
+    extractor = ConceptExtractor(topic_model=topic_model, **extractor_options)
+    cache = ExtractionCache(cache_path) if cache_path else None
+
+    def documents():
+        for pdf_file in sorted(Path(folder).glob("*.pdf")):
+            logger.info(f"Processing PDF: {pdf_file.name}")
+            cache_key = cache.key_for(pdf_file, version) if cache else None
+            concepts = cache.get(cache_key) if cache else None
+            if concepts is None:
+                concepts = extractor.extract(pdf_file)
+                if cache and concepts is not None:
+                    cache.put(cache_key, concepts)
+            elif concepts.get('topic_terms') is not None:
+                concepts['topics'] = topic_model.score(concepts['topic_terms'])
+            yield concepts
+
+    try:
+        paths = export_concepts(documents(), output_dir, extractor.nlp)
+        logger.info(f"Import with: {import_command(paths)}")
+        logger.info("Then create the constraints and indexes with: python neo4j_schema.py")
+    finally:
+        if cache:
+            cache.close()
+        if topic_model_path:
+            topic_model.save()
+    return paths
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Export concepts from PDFs as CSV files for neo4j-admin import.")
+    parser.add_argument("--folder", type=str, required=True, help="Path to the folder containing PDF files.")
+    parser.add_argument("--output_dir", type=str, required=True, help="Directory for the CSV files.")
+    parser.add_argument("--chunk_size", type=int, default=None,
+                        help="Stream each PDF through spaCy in sentence-aligned chunks of this many characters.")
+    parser.add_argument("--keyword_diversity", choices=["maxsum", "mmr", "none"], default="maxsum",
+                        help="How KeyBERT keywords are diversified; mmr and none are much cheaper than maxsum.")
+    parser.add_argument("--table_key_columns", type=int, default=None,
+                        help="Only relate table columns to the first N (key) columns of each table.")
+    parser.add_argument("--max_column_pairs", type=int, default=None,
+                        help="Maximum number of column pairs related per table.")
+    parser.add_argument("--max_chunk_distance", type=int, default=None,
+                        help="Only relate noun chunks at most this many chunks apart in a sentence.")
+    parser.add_argument("--pdf_profile", choices=["accurate", "fast"], default="accurate",
+                        help="PDF reading: pdfplumber layout text, or fast PyPDF2 text with tables only on ruled pages.")
+    parser.add_argument("--page_workers", type=int, default=1,
+                        help="Processes reading the pages of one PDF in parallel.")
+    parser.add_argument("--cache_path", type=str, default=".pdf2graph_cache.sqlite",
+                        help="SQLite file caching extraction results of unchanged PDFs.")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Do not read or write the extraction cache.")
+    parser.add_argument("--topic_model_path", type=str, default=".pdf2graph_topics.npz",
+                        help="File with the corpus document frequencies topics are scored against.")
+    args = parser.parse_args()
+
+    # Same option set as main.py, so both share extraction cache entries
+    extractor_options = {'chunk_size': args.chunk_size, 'keyword_diversity': args.keyword_diversity,
+                         'table_key_columns': args.table_key_columns, 'max_column_pairs': args.max_column_pairs,
+                         'max_chunk_distance': args.max_chunk_distance,
+                         'pdf_profile': args.pdf_profile, 'page_workers': args.page_workers}
+    main(args.folder, args.output_dir, extractor_options=extractor_options,
+         cache_path=None if args.no_cache else args.cache_path, topic_model_path=args.topic_model_path)
@@ -0,0 +1,220 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+
+class _NullStage:
+    """Shared no-op context manager handed out while instrumentation is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.owner.record_stage(self.name, time.perf_counter() - self.start)
+        return False
+
+class _Document:
+    def __init__(self, name):
+        self.name = name
+        self.stage_seconds = defaultdict(float)
+        self.counters = Counter()
+
+class Instrumentation:
+    """
+    Stage timers and counters for extraction and ingestion.
+
+    ``stage(name)`` times a block and ``count(name, n)`` bumps a counter; both
+    are no-ops costing one attribute check while ``enabled`` is False.
+    ``document(name)`` groups everything recorded inside it into one
+    structured log record and can additionally capture a cProfile dump
+    (``profile_dir``) and the tracemalloc peak (``trace_memory``).
+    """
+
+    def __init__(self, enabled=False, profile_dir=None, trace_memory=False):
+        self.enabled = enabled
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.logger = logging.getLogger(__name__)
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = Counter()
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] += amount
+        document = getattr(self._local, "document", None)
+        if document is not None:
+            document.counters[name] += amount
+
+    def record_stage(self, name, seconds):
+        """Add ``seconds`` to stage ``name``, for time measured without ``stage``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name] += 1
+        document = getattr(self._local, "document", None)
+        if document is not None:
+            document.stage_seconds[name] += seconds
+
+    def document(self, name):
+        """Context manager collecting per-document metrics (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _DocumentScope(self, name)
+
+    def snapshot(self, reset=False):
+        """Totals recorded so far as plain dicts, e.g. to send from a worker process."""
+        with self._lock:
+            data = {
+                "stage_seconds": dict(self.stage_seconds),
+                "stage_calls": dict(self.stage_calls),
+                "counters": dict(self.counters),
+            }
+            if reset:
+                self.stage_seconds.clear()
+                self.stage_calls.clear()
+                self.counters.clear()
+        return data
+
+    def merge(self, snapshot):
+        """Add totals collected elsewhere (see ``snapshot``)."""
+        if not self.enabled or not snapshot:
+            return
+        with self._lock:
+            for name, seconds in snapshot["stage_seconds"].items():
+                self.stage_seconds[name] += seconds
+            self.stage_calls.update(snapshot["stage_calls"])
+            self.counters.update(snapshot["counters"])
+
+    def write_prometheus(self, path):
+        """Write the totals in Prometheus text exposition format (atomically)."""
+        data = self.snapshot()
+        lines = [
+            "# HELP pdf2graph_stage_seconds_total Time spent in each processing stage.",
+            "# TYPE pdf2graph_stage_seconds_total counter",
+        ]
+        lines += [f'pdf2graph_stage_seconds_total{{stage="{_label(name)}"}} {seconds:.6f}'
+                  for name, seconds in sorted(data["stage_seconds"].items())]
+        lines += [
+            "# HELP pdf2graph_stage_calls_total Number of times each stage ran.",
+            "# TYPE pdf2graph_stage_calls_total counter",
+        ]
+        lines += [f'pdf2graph_stage_calls_total{{stage="{_label(name)}"}} {calls}'
+                  for name, calls in sorted(data["stage_calls"].items())]
+        lines += [
+            "# HELP pdf2graph_items_total Items processed (entities, pairs compared, rows written, ...).",
+            "# TYPE pdf2graph_items_total counter",
+        ]
+        lines += [f'pdf2graph_items_total{{name="{_label(name)}"}} {value}'
+                  for name, value in sorted(data["counters"].items())]
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+def _label(value):
+    """A Prometheus label value with backslashes, quotes and newlines escaped."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class _DocumentScope:
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.document = _Document(str(name))
+        self.profiler = None
+        self.started_tracing = False
+
+    def __enter__(self):
+        owner = self.owner
+        owner._local.document = self.document
+        if owner.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            tracemalloc.reset_peak()
+        if owner.profile_dir:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        owner = self.owner
+        elapsed = time.perf_counter() - self.start
+        owner._local.document = None
+        record = {
+            "event": "document_metrics",
+            "document": self.document.name,
+            "seconds": round(elapsed, 6),
+            "failed": exc_info[0] is not None,
+            "stages": {name: round(seconds, 6) for name, seconds in self.document.stage_seconds.items()},
+            "counters": dict(self.document.counters),
+        }
+        if self.profiler is not None:
+            self.profiler.disable()
+            Path(owner.profile_dir).mkdir(parents=True, exist_ok=True)
+            profile_path = Path(owner.profile_dir) / (re.sub(r"[^\w.-]", "_", self.document.name) + ".prof")
+            self.profiler.dump_stats(profile_path)
+            record["profile"] = str(profile_path)
+        if owner.trace_memory:
+            record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+            if self.started_tracing:
+                tracemalloc.stop()
+        owner.logger.info(json.dumps(record))
+        return False
+
+_instrumentation = Instrumentation()
+
+def get_instrumentation():
+    """The process-wide instrumentation (disabled unless ``configure`` was called)."""
+    return _instrumentation
+
+def timed_stage(name):
+    """Decorator timing every call of the function as stage ``name``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            instrumentation = _instrumentation
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            with instrumentation.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def configure(enabled=True, profile_dir=None, trace_memory=False):
+    """Replace the process-wide instrumentation with one using these options."""
+    global _instrumentation
+    _instrumentation = Instrumentation(enabled=enabled, profile_dir=profile_dir, trace_memory=trace_memory)
+    return _instrumentation
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+import logging
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from keybert._maxsum import max_sum_distance
+from keybert._mmr import mmr
+from similarity import cosine_matrix
+from instrumentation import get_instrumentation
+
+# Ways of picking the final keywords among a text's candidate phrases
+DIVERSITY_MODES = ("maxsum", "mmr", "none")
+
+class KeywordExtractor:
+    """
+    Batched KeyBERT keyword extraction.
+
+    ``extract(texts)`` scores the candidate phrases of several texts (the
+    document and all of its tables) with one vectorizer pass and one
+    embedding call for the texts. Candidate-phrase embeddings are kept in an
+    LRU cache keyed by the phrase text, so phrases seen in earlier tables or
+    documents are not embedded again.
+
+    ``diversity`` selects how keywords are picked from the candidates:
+    ``"maxsum"`` (KeyBERT's Max Sum Distance, the previous behaviour),
+    ``"mmr"`` (Maximal Marginal Relevance, much cheaper) or ``"none"``
+    (plain top-n by similarity to the text).
+    """
+
+    def __init__(self, kw_model, diversity="maxsum", keyphrase_ngram_range=(1, 2),
+                 stop_words='english', top_n=10, nr_candidates=20, mmr_diversity=0.5,
+                 cache_size=100000):
+        if diversity not in DIVERSITY_MODES:
+            raise ValueError(f"Unknown keyword diversity mode: {diversity}")
+        self.kw_model = kw_model
+        self.diversity = diversity
+        self.keyphrase_ngram_range = keyphrase_ngram_range
+        self.stop_words = stop_words
+        self.top_n = top_n
+        self.nr_candidates = nr_candidates
+        self.mmr_diversity = mmr_diversity
+        self.cache_size = cache_size
+        self.logger = logging.getLogger(__name__)
+        self._phrase_vectors = OrderedDict()
+
+    def extract(self, texts):
+        """Return one ``{phrase: score}`` dict per text, in the order of ``texts``."""
+        texts = list(texts)
+        results = [{} for _ in texts]
+        present = [i for i, text in enumerate(texts) if text.strip()]
+        if not present:
+            return results
+
+        vectorizer = CountVectorizer(ngram_range=self.keyphrase_ngram_range, stop_words=self.stop_words)
+        try:
+            counts = vectorizer.fit_transform([texts[i] for i in present])
+        except ValueError:
+            # Nothing but stop words
+            return results
+        phrases = vectorizer.get_feature_names_out()
+
+        phrase_vectors = self._embed_phrases(phrases)
+        text_vectors = np.asarray(self.kw_model.model.embed([texts[i] for i in present]))
+
+        for row, i in enumerate(present):
+            candidate_indices = counts[row].nonzero()[1]
+            candidates = [phrases[index] for index in candidate_indices]
+            try:
+                keywords = self._select(text_vectors[row].reshape(1, -1),
+                                        phrase_vectors[candidate_indices], candidates)
+            except ValueError:
+                # Too few candidates for the selection, as in KeyBERT
+                keywords = []
+            results[i] = dict(keywords)
+
+        return results
+
+    def _embed_phrases(self, phrases):
+        """Embedding matrix for ``phrases``, embedding only the ones not cached yet."""
+        cache = self._phrase_vectors
+        missing = [phrase for phrase in phrases if phrase not in cache]
+        metrics = get_instrumentation()
+        metrics.count("keyword_phrases_cached", len(phrases) - len(missing))
+        metrics.count("keyword_phrases_embedded", len(missing))
+
+        vectors = {}
+        if missing:
+            for phrase, vector in zip(missing, np.asarray(self.kw_model.model.embed(missing))):
+                vectors[phrase] = vector
+        for phrase in phrases:
+            if phrase in cache:
+                cache.move_to_end(phrase)
+                vectors[phrase] = cache[phrase]
+
+        cache.update((phrase, vectors[phrase]) for phrase in missing)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+        return np.vstack([vectors[phrase] for phrase in phrases])
+
+    def _select(self, text_vector, candidate_vectors, candidates):
+        if not candidates:
+            return []
+        if self.diversity == "maxsum":
+            return max_sum_distance(text_vector, candidate_vectors, candidates,
+                                    self.top_n, self.nr_candidates)
+        if self.diversity == "mmr":
+            return mmr(text_vector, candidate_vectors, candidates, self.top_n, self.mmr_diversity)
+        similarities = cosine_matrix(text_vector, candidate_vectors)[0]
+        best = similarities.argsort()[-self.top_n:][::-1]
+        return [(candidates[index], round(float(similarities[index]), 4)) for index in best]
+
+    def cache_info(self):
+        return {"phrases": len(self._phrase_vectors), "max_phrases": self.cache_size}
+
+    def clear_cache(self):
+        self._phrase_vectors.clear()
@@ -0,0 +1,532 @@
+import csv
+import json
+import logging
+import math
+import mmap
+import re
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from graph_export import ARRAY_DELIMITER, NODE_FILES, RELATIONSHIP_FILES, export_concepts
+from neo4j_schema import fulltext_query
+from neo4j_integration import TOP_CONCEPTS
+from neo4j_searcher import DEFAULT_MAX_CONNECTIONS
+
+CONCEPT, TOPIC = 0, 1
+RELATIONSHIP_LABELS = ("RELATED", "ACTION")
+
+_MAGIC = b"P2GLOCAL"
+_ALIGN = 64
+
+class LocalGraph:
+    """
+    Read-only, in-memory copy of the knowledge graph in CSR form.
+
+    Node names and string properties are interned into one string table and
+    nodes are referenced by integer index. Two adjacency structures are
+    kept: Topic -> Concept ``RELATED_TO`` edges per topic, sorted by weight
+    (``tc_*``), and the undirected Concept - Concept ``RELATED``/``ACTION``
+    edges (``cc_*``) whose properties live in the ``edge_*`` arrays.
+    Topic - Topic similarity edges are not kept; no query reads them.
+
+    ``save`` writes every array into one file that ``load`` memory-maps, so
+    opening even a large graph only reads the pages a query touches.
+    """
+
+    ARRAYS = (
+        "strings_blob", "strings_offsets",
+        "node_name", "node_label", "node_type", "node_relevance",
+        "concept_order", "topic_order",
+        "tc_offsets", "tc_target", "tc_weight", "tc_context",
+        "cc_offsets", "cc_target", "cc_edge",
+        "edge_label", "edge_type", "edge_weight", "edge_relation", "edge_verb", "edge_count",
+        "edge_contexts",
+    )
+
+    def __init__(self, arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.logger = logging.getLogger(__name__)
+        self._topic_names_lower = None
+
+    # Construction
+
+    @classmethod
+    def from_import_csv(cls, directory):
+        """Load the node and relationship CSV files written by ``graph_export``."""
+        directory = Path(directory)
+        builder = _GraphBuilder()
+        for label, (file_name, _) in NODE_FILES.items():
+            if label == 'GraphMeta':
+                continue
+            for row in _read_csv(directory / file_name):
+                builder.add_node(row[f":ID({label})"], label, row['name'], row.get('type'),
+                                 row.get('relevance:double'))
+        for kind, (file_name, _, end_space, rel_type, properties) in RELATIONSHIP_FILES.items():
+            if end_space != 'Concept':
+                continue
+            for row in _read_csv(directory / file_name):
+                props = {name: _parse(row[_header(name, csv_type)], csv_type)
+                         for name, csv_type in properties}
+                builder.add_edge(row[':START_ID(Topic)'] if kind == 'topic_association' else row[':START_ID(Concept)'],
+                                 row[':END_ID(Concept)'], rel_type, props)
+        return builder.build()
+
+    @classmethod
+    def from_concepts(cls, documents, nlp):
+        """
+        Build the graph ``Neo4jConnector`` would write for an iterable of
+        ``concepts`` dicts, via the bulk exporter in a temporary directory.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            export_concepts(documents, directory, nlp)
+            return cls.from_import_csv(directory)
+
+    @classmethod
+    def from_networkx(cls, concept_graph):
+        """
+        Load a ``concept_graph`` from the extractor. Its nodes become concepts
+        (typed by a ``type`` node attribute when present) and its edges
+        ``RELATED`` relationships with the edge attributes as properties.
+        There are no topics in this graph.
+        """
+        builder = _GraphBuilder()
+        for node, data in concept_graph.nodes(data=True):
+            builder.add_node(node, 'Concept', str(node), data.get('type'), None)
+        for u, v, data in concept_graph.edges(data=True):
+            props = {name: data.get(name) for name in ('type', 'weight', 'relation', 'verb', 'count')}
+            builder.add_edge(u, v, 'RELATED', props)
+        return builder.build()
+
+    # Persistence
+
+    def save(self, path):
+        """Write every array into a single file for ``load``."""
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in self.ARRAYS}
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout[name] = [array.dtype.str, list(array.shape), offset]
+            offset += array.nbytes
+        header = json.dumps({"version": 1, "arrays": layout}).encode("utf-8")
+        data_start = -(-(len(_MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC + len(header).to_bytes(8, "little") + header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name][2])
+                f.write(array.tobytes())
+            # Trailing empty arrays start past the last byte written
+            f.truncate(data_start + offset)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Open a file written by ``save``; arrays are memory-mapped, not read."""
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a saved LocalGraph")
+            header_length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_length))
+            # Plain arrays over one shared read-only mapping of the file
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data_start = -(-(len(_MAGIC) + 8 + header_length) // _ALIGN) * _ALIGN
+
+        arrays = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            if math.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.frombuffer(mapping, dtype=dtype, count=math.prod(shape),
+                                         offset=data_start + offset).reshape(shape)
+        return cls(arrays)
+
+    # Lookups
+
+    def string(self, index):
+        if index < 0:
+            return None
+        start, end = self.strings_offsets[index], self.strings_offsets[index + 1]
+        return bytes(self.strings_blob[start:end]).decode("utf-8")
+
+    def name(self, node):
+        return self.string(int(self.node_name[node]))
+
+    def concept_type(self, node):
+        return self.string(int(self.node_type[node]))
+
+    def relevance(self, node):
+        value = float(self.node_relevance[node])
+        return None if math.isnan(value) else value
+
+    def _find(self, order, name):
+        """Node indexes in ``order`` (sorted by name) whose name is ``name``."""
+        position = bisect_left(order, name, key=self.name)
+        nodes = []
+        while position < len(order) and self.name(order[position]) == name:
+            nodes.append(int(order[position]))
+            position += 1
+        return nodes
+
+    def find_topic(self, name):
+        nodes = self._find(self.topic_order, name)
+        return nodes[0] if nodes else None
+
+    def find_concepts(self, name):
+        return self._find(self.concept_order, name)
+
+    def topic_names_lower(self):
+        """``(node, lower-cased name)`` of every topic, built on first use."""
+        if self._topic_names_lower is None:
+            self._topic_names_lower = [(int(node), self.name(node).lower()) for node in self.topic_order]
+        return self._topic_names_lower
+
+    def top_concepts(self, topic):
+        """
+        Names of the topic's ``TOP_CONCEPTS`` most strongly associated
+        concepts, each once (concepts of one name can have several types).
+        """
+        names = []
+        for concept in self.tc_target[int(self.tc_offsets[topic]):int(self.tc_offsets[topic + 1])]:
+            name = self.name(int(concept))
+            if name not in names:
+                names.append(name)
+                if len(names) == TOP_CONCEPTS:
+                    break
+        return names
+
+    def topic_degree(self, node):
+        return int(self.tc_offsets[node + 1] - self.tc_offsets[node])
+
+    def edge_properties(self, edge):
+        """``properties(r)`` of a Concept - Concept relationship."""
+        props = {}
+        for name, value in (("type", self.string(int(self.edge_type[edge]))),
+                            ("weight", float(self.edge_weight[edge])),
+                            ("relation", self.string(int(self.edge_relation[edge]))),
+                            ("verb", self.string(int(self.edge_verb[edge]))),
+                            ("count", int(self.edge_count[edge])),
+                            ("contexts", self.string(int(self.edge_contexts[edge])))):
+            if value is None or (name == "weight" and math.isnan(value)) or (name == "count" and value < 0):
+                continue
+            props[name] = value.split(ARRAY_DELIMITER) if name == "contexts" else value
+        return props
+
+class _GraphBuilder:
+    """Collects nodes and edges, interning strings, then lays them out as CSR arrays."""
+
+    def __init__(self):
+        self.strings = {}
+        self.nodes = {}
+        self.node_name, self.node_label, self.node_type, self.node_relevance = [], [], [], []
+        self.topic_edges = []
+        self.concept_edges = []
+
+    def intern(self, value):
+        if value is None or value == "":
+            return -1
+        return self.strings.setdefault(value, len(self.strings))
+
+    def add_node(self, key, label, name, concept_type, relevance):
+        if key in self.nodes:
+            return
+        self.nodes[key] = len(self.nodes)
+        self.node_name.append(self.intern(name))
+        self.node_label.append(TOPIC if label == 'Topic' else CONCEPT)
+        self.node_type.append(self.intern(concept_type))
+        self.node_relevance.append(np.nan if relevance in (None, "") else float(relevance))
+
+    def add_edge(self, start, end, rel_type, props):
+        start, end = self.nodes[start], self.nodes[end]
+        if rel_type == 'RELATED_TO':
+            self.topic_edges.append((start, end, _float(props.get('weight')),
+                                     _float(props.get('contextSimilarity'))))
+        else:
+            count = props.get('count')
+            contexts = props.get('contexts')
+            self.concept_edges.append((start, end, RELATIONSHIP_LABELS.index(rel_type),
+                                       self.intern(props.get('type')), _float(props.get('weight')),
+                                       self.intern(props.get('relation')), self.intern(props.get('verb')),
+                                       -1 if count is None else int(count),
+                                       self.intern(ARRAY_DELIMITER.join(contexts) if contexts else None)))
+
+    def build(self):
+        node_count = len(self.nodes)
+        strings = [value.encode("utf-8") for value in self.strings]
+        arrays = {
+            "strings_blob": np.frombuffer(b"".join(strings), dtype=np.uint8),
+            "strings_offsets": np.cumsum([0] + [len(value) for value in strings], dtype=np.int64),
+            "node_name": np.array(self.node_name, dtype=np.int32),
+            "node_label": np.array(self.node_label, dtype=np.int8),
+            "node_type": np.array(self.node_type, dtype=np.int32),
+            "node_relevance": np.array(self.node_relevance, dtype=np.float64),
+        }
+        names = list(self.strings)
+        for kind, order in ((CONCEPT, "concept_order"), (TOPIC, "topic_order")):
+            members = [node for node in range(node_count) if self.node_label[node] == kind]
+            members.sort(key=lambda node: names[self.node_name[node]])
+            arrays[order] = np.array(members, dtype=np.int32)
+
+        # Topic -> Concept edges grouped by topic, strongest first, then by
+        # concept name as in the Cypher queries
+        name_rank = np.empty(node_count, dtype=np.int64)
+        name_rank[arrays["concept_order"]] = np.arange(len(arrays["concept_order"]))
+        topic_edges = np.array(self.topic_edges, dtype=np.float64).reshape(-1, 4)
+        order = np.lexsort((name_rank[topic_edges[:, 1].astype(np.int64)], -topic_edges[:, 2], topic_edges[:, 0]))
+        topic_edges = topic_edges[order]
+        arrays["tc_offsets"] = _offsets(topic_edges[:, 0].astype(np.int64), node_count)
+        arrays["tc_target"] = topic_edges[:, 1].astype(np.int32)
+        arrays["tc_weight"] = topic_edges[:, 2]
+        arrays["tc_context"] = topic_edges[:, 3]
+
+        # Concept - Concept edges, listed under both end nodes (self-loops once)
+        edges = self.concept_edges
+        arrays["edge_label"] = np.array([edge[2] for edge in edges], dtype=np.int8)
+        arrays["edge_type"] = np.array([edge[3] for edge in edges], dtype=np.int32)
+        arrays["edge_weight"] = np.array([edge[4] for edge in edges], dtype=np.float64)
+        arrays["edge_relation"] = np.array([edge[5] for edge in edges], dtype=np.int32)
+        arrays["edge_verb"] = np.array([edge[6] for edge in edges], dtype=np.int32)
+        arrays["edge_count"] = np.array([edge[7] for edge in edges], dtype=np.int64)
+        arrays["edge_contexts"] = np.array([edge[8] for edge in edges], dtype=np.int32)
+        starts = np.array([edge[0] for edge in edges], dtype=np.int64)
+        ends = np.array([edge[1] for edge in edges], dtype=np.int64)
+        edge_ids = np.arange(len(edges), dtype=np.int32)
+        reverse = starts != ends
+        sources = np.concatenate([starts, ends[reverse]])
+        targets = np.concatenate([ends, starts[reverse]])
+        incident = np.concatenate([edge_ids, edge_ids[reverse]])
+        order = np.argsort(sources, kind="stable")
+        arrays["cc_offsets"] = _offsets(sources[order], node_count)
+        arrays["cc_target"] = targets[order].astype(np.int32)
+        arrays["cc_edge"] = incident[order]
+        return LocalGraph(arrays)
+
+def _offsets(sorted_sources, node_count):
+    """CSR row offsets for edge sources that are already sorted."""
+    return np.searchsorted(sorted_sources, np.arange(node_count + 1)).astype(np.int64)
+
+def _float(value):
+    return np.nan if value is None or value == "" else float(value)
+
+def _header(name, csv_type):
+    return f"{name}:{csv_type}" if csv_type else name
+
+def _parse(value, csv_type):
+    if value == "":
+        return None
+    if csv_type == 'double':
+        return float(value)
+    if csv_type == 'long':
+        return int(value)
+    if csv_type == 'string[]':
+        return value.split(ARRAY_DELIMITER)
+    return value
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+def _match_score(name, search):
+    if name == search:
+        return 1.0
+    if search in name:
+        return 0.8
+    return 0.5
+
+class LocalSearcher:
+    """
+    ``Neo4jSearcher`` API answered from a ``LocalGraph`` in this process.
+    Results have the same shapes as the Cypher queries in ``neo4j_searcher``.
+    """
+
+    def __init__(self, graph: LocalGraph):
+        self.graph = graph
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def open(cls, path):
+        return cls(LocalGraph.load(path))
+
+    def close(self):
+        pass
+
+    def search_topics(self, search_term: str, min_relevance: float = 0.3,
+                      mode: str = "contains", limit: Optional[int] = None) -> List[Dict]:
+        """
+        Search for topics that match the search term. ``mode="fulltext"``
+        matches every search word as a prefix of a word in the topic name.
+        """
+        graph = self.graph
+        search = search_term.lower()
+        matches = []
+        if mode == "fulltext":
+            if not fulltext_query(search_term):
+                return []
+            terms = re.findall(r"\w+", search)
+            for node, name in graph.topic_names_lower():
+                words = re.findall(r"\w+", name)
+                score = sum(1 for term in terms if any(word.startswith(term) for word in words))
+                if score:
+                    matches.append((node, name, score))
+        elif mode == "contains":
+            words = search.split(' ')
+            for node, name in graph.topic_names_lower():
+                if search in name or any(word in name for word in words):
+                    matches.append((node, name, 0))
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        results = []
+        for node, name, score in matches:
+            match_score = _match_score(name, search)
+            if match_score < min_relevance:
+                continue
+            relevance = graph.relevance(node)
+            # Missing relevance sorts as 0.0, as COALESCE does in the Cypher; then by name
+            results.append(((-match_score, -score, -(relevance or 0.0), graph.name(node)), {
+                "topic": graph.name(node),
+                "relevance": relevance if relevance is not None else 0.0,
+                "matchScore": match_score,
+                "relatedConceptsCount": graph.topic_degree(node),
+                "topConcepts": graph.top_concepts(node),
+            }))
+        results.sort(key=lambda item: item[0])
+        return [result for _, result in results[:limit]]
+
+    def get_topic_concepts(self, topic_name: str,
+                           min_weight: float = 0.3,
+                           limit: int = 20,
+                           max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """
+        Get all concepts related to a specific topic with their relationships
+        (at most ``max_connections`` per concept, strongest first).
+        """
+        graph = self.graph
+        topic = graph.find_topic(topic_name)
+        if topic is None:
+            return {"error": f"Topic '{topic_name}' not found"}
+
+        concepts = []
+        start, end = int(graph.tc_offsets[topic]), int(graph.tc_offsets[topic + 1])
+        # Edges are sorted by weight, so stop at the first one below min_weight
+        for position in range(start, min(end, start + max(limit, 0))):
+            weight = float(graph.tc_weight[position])
+            if not weight >= min_weight:
+                break
+            concept = int(graph.tc_target[position])
+            connections = []
+            for other, edge in self._neighbours(concept):
+                edge_weight = float(graph.edge_weight[edge])
+                connections.append({
+                    "otherConcept": graph.name(other),
+                    "relationType": RELATIONSHIP_LABELS[graph.edge_label[edge]],
+                    "relationWeight": 1.0 if math.isnan(edge_weight) else edge_weight,
+                })
+            if not connections:
+                # What OPTIONAL MATCH collects when there is no relationship
+                connections.append({"otherConcept": None, "relationType": None, "relationWeight": 1.0})
+            concepts.append({
+                "concept": graph.name(concept),
+                "type": graph.concept_type(concept),
+                "topicRelationWeight": weight,
+                "contextSimilarity": _optional(graph.tc_context[position]),
+                "connections": sorted(_distinct(connections),
+                                      key=lambda connection: -connection["relationWeight"])[:max_connections],
+            })
+
+        return {
+            "topic": topic_name,
+            "topicRelevance": graph.relevance(topic),
+            "relatedConcepts": concepts,
+        }
+
+    def search_concept_network(self, topic_name: str, concept_name: str,
+                               max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """
+        Get detailed information about a specific concept within a topic's context.
+        """
+        graph = self.graph
+        topic = graph.find_topic(topic_name)
+        if topic is None:
+            return None
+        candidates = set(graph.find_concepts(concept_name))
+        start, end = int(graph.tc_offsets[topic]), int(graph.tc_offsets[topic + 1])
+        for position in range(start, end):
+            concept = int(graph.tc_target[position])
+            if concept not in candidates:
+                continue
+            connections = [{
+                "concept": graph.name(other),
+                "type": graph.concept_type(other),
+                "relationshipType": RELATIONSHIP_LABELS[graph.edge_label[edge]],
+                "properties": graph.edge_properties(edge),
+            } for other, edge in self._neighbours(concept)]
+            if not connections:
+                connections.append({"concept": None, "type": None, "relationshipType": None, "properties": None})
+            return {
+                "concept": graph.name(concept),
+                "type": graph.concept_type(concept),
+                "topicRelation": {
+                    "weight": _optional(graph.tc_weight[position]),
+                    "contextSimilarity": _optional(graph.tc_context[position]),
+                },
+                "connections": _distinct(connections)[:max_connections],
+            }
+        return None
+
+    def get_topic_statistics(self, top_k: int = 5) -> Dict:
+        """
+        Get general statistics about topics in the knowledge graph, with the
+        ``top_k`` topics that have the most concepts.
+        """
+        graph = self.graph
+        topics = np.asarray(graph.topic_order)
+        degrees = graph.tc_offsets[topics + 1] - graph.tc_offsets[topics]
+        # topic_order is sorted by name, which breaks ties as in the Cypher
+        top = np.argsort(-degrees, kind="stable")[:top_k]
+        return {
+            "totalTopics": len(topics),
+            "averageConceptsPerTopic": float(degrees.mean()) if len(topics) else None,
+            "topTopics": [{
+                "topic": graph.name(int(topics[index])),
+                "conceptCount": int(degrees[index]),
+                "relevance": graph.relevance(int(topics[index])),
+            } for index in top],
+        }
+
+    def _neighbours(self, concept):
+        graph = self.graph
+        start, end = int(graph.cc_offsets[concept]), int(graph.cc_offsets[concept + 1])
+        return zip(graph.cc_target[start:end].tolist(), graph.cc_edge[start:end].tolist())
+
+def _optional(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+def _distinct(maps):
+    """Drop repeated maps, keeping the first of each, like ``COLLECT(DISTINCT ...)``."""
+    seen = set()
+    unique = []
+    for item in maps:
+        key = json.dumps(item, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Build a memory-mappable local graph from graph_export CSV files.")
+    parser.add_argument("--import_dir", type=str, required=True, help="Directory written by graph_export.py.")
+    parser.add_argument("--output", type=str, required=True, help="File to save the local graph to.")
+    args = parser.parse_args()
+
+    LocalGraph.from_import_csv(args.import_dir).save(args.output)
+    logging.getLogger(__name__).info(f"Saved local graph to {args.output}")
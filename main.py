@@ -29,8 +29,16 @@ DETACH DELETE n;
 
 import argparse
 import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from pdf_concept_extractor import extract_concepts_from_pdf
+from pdf_concept_extractor import ConceptExtractor, extractor_version
+from extraction_cache import ExtractionCache
+from topic_model import CorpusTopicModel
+from instrumentation import configure as configure_instrumentation, get_instrumentation
 from neo4j_integration import Neo4jConnector
 import json
 import sys
@@ -40,7 +48,148 @@ def setup_logging():
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     return logging.getLogger(__name__)
 
-def process_pdfs_in_folder(folder_path, neo4j_uri, neo4j_user, neo4j_password):
+class IngestSummary:
+    """Tracks the outcome of every PDF in a folder run."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.uploaded = []
+        self.cached = []
+        self.extract_failed = []
+        self.upload_failed = []
+
+    def report(self, logger):
+        """Log throughput and the files that failed."""
+        elapsed = time.perf_counter() - self.start
+        total = len(self.uploaded) + len(self.extract_failed) + len(self.upload_failed)
+        logger.info(f"Processed {total} PDFs in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.2f} PDFs/sec): "
+                    f"{len(self.uploaded)} uploaded ({len(self.cached)} from cache), "
+                    f"{len(self.extract_failed)} failed extraction, "
+                    f"{len(self.upload_failed)} failed upload")
+        for name in self.extract_failed:
+            logger.warning(f"  Extraction failed: {name}")
+        for name in self.upload_failed:
+            logger.warning(f"  Upload failed: {name}")
+
+def upload_concepts(neo4j_conn, pdf_file, concepts, summary, logger, topic_model=None):
+    """
+    Upload one PDF's concepts, recording failures instead of raising.
+    With a ``topic_model`` the topics are (re)scored against its corpus first,
+    so cached and worker results use the same document frequencies.
+    """
+    if not concepts:
+        logger.warning(f"Failed to extract concepts from: {pdf_file.name}")
+        summary.extract_failed.append(pdf_file.name)
+        return
+    
+    # Upload to Neo4j
+    try:
+        if topic_model is not None and concepts.get('topic_terms') is not None:
+            concepts['topics'] = topic_model.score(concepts['topic_terms'])
+        neo4j_conn.add_nodes_and_relationships(concepts, pdf_file.name)
+        logger.info(f"Data successfully uploaded for: {pdf_file.name}")
+        summary.uploaded.append(pdf_file.name)
+    except Exception as e:
+        logger.error(f"Failed to upload data for {pdf_file.name}: {e}", exc_info=True)
+        summary.upload_failed.append(pdf_file.name)
+
+def load_cached(cache, cache_key, pdf_file, summary, logger):
+    """Return cached concepts for ``pdf_file`` or None when there is no usable entry."""
+    if cache is None:
+        return None
+    concepts = cache.get(cache_key)
+    if concepts is not None:
+        logger.info(f"Using cached extraction for: {pdf_file.name}")
+        summary.cached.append(pdf_file.name)
+    return concepts
+
+def store_cached(cache, cache_key, concepts):
+    if cache is not None and concepts:
+        cache.put(cache_key, concepts)
+
+# Each worker process keeps its own warmed models
+_worker_extractor = None
+
+def _init_worker(extractor_options, metrics_options):
+    global _worker_extractor
+    setup_logging()
+    configure_instrumentation(**metrics_options)
+    _worker_extractor = ConceptExtractor(**extractor_options)
+
+def _extract_in_worker(pdf_file):
+    logging.getLogger(__name__).info(f"Processing PDF: {pdf_file.name}")
+    metrics = get_instrumentation()
+    with metrics.document(pdf_file.name):
+        concepts = _worker_extractor.extract(pdf_file)
+    # Hand this document's totals back so the parent can aggregate them
+    return concepts, metrics.snapshot(reset=True) if metrics.enabled else None
+
+def process_in_parallel(pdf_files, neo4j_conn, workers, summary, logger, extractor_options=None,
+                        cache=None, queue_size=None, topic_model=None):
+    """
+    Extract PDFs in a pool of ``workers`` processes while a single thread
+    uploads finished results to Neo4j. At most ``queue_size`` extractions
+    are in flight or waiting for upload, so memory stays bounded. PDFs
+    found in ``cache`` skip the pool and go straight to the uploader.
+    Topics are scored by the uploader thread, the only user of ``topic_model``.
+    Workers are spawned rather than forked: the pool starts them lazily,
+    when the uploader thread may hold driver or logging locks.
+    """
+    extractor_options = extractor_options or {}
+    version = extractor_version(**extractor_options)
+    metrics = get_instrumentation()
+    metrics_options = {"enabled": metrics.enabled, "profile_dir": metrics.profile_dir,
+                       "trace_memory": metrics.trace_memory}
+    queue_size = queue_size or workers * 2
+    uploads = queue.Queue(maxsize=queue_size)
+    pending = {}
+
+    def upload_loop():
+        while True:
+            item = uploads.get()
+            if item is None:
+                break
+            upload_concepts(neo4j_conn, *item, summary, logger, topic_model)
+
+    def collect(done):
+        for future in done:
+            pdf_file, cache_key = pending.pop(future)
+            try:
+                concepts, worker_metrics = future.result()
+                metrics.merge(worker_metrics)
+            except Exception as e:
+                logger.error(f"Worker failed on {pdf_file.name}: {e}")
+                concepts = None
+            store_cached(cache, cache_key, concepts)
+            # Blocks while the uploader is behind
+            uploads.put((pdf_file, concepts))
+
+    uploader = threading.Thread(target=upload_loop, name="neo4j-uploader")
+    uploader.start()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker,
+                                 initargs=(extractor_options, metrics_options)) as pool:
+            for pdf_file in pdf_files:
+                cache_key = cache.key_for(pdf_file, version) if cache else None
+                concepts = load_cached(cache, cache_key, pdf_file, summary, logger)
+                if concepts is not None:
+                    uploads.put((pdf_file, concepts))
+                    continue
+                pending[pool.submit(_extract_in_worker, pdf_file)] = (pdf_file, cache_key)
+                if len(pending) >= queue_size:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+    finally:
+        uploads.put(None)
+        uploader.join()
+
+def process_pdfs_in_folder(folder_path, neo4j_uri, neo4j_user, neo4j_password, batch_size=1000, workers=1,
+                           extractor_options=None, cache=None, defer_topic_similarity=False,
+                           topic_model=None):
     """
     Process all PDFs in a folder and update the Neo4j knowledge graph.
 
@@ -49,8 +198,15 @@ def process_pdfs_in_folder(folder_path, neo4j_uri, neo4j_user, neo4j_password):
         neo4j_uri: Neo4j database URI.
         neo4j_user: Neo4j username.
         neo4j_password: Neo4j password.
+        batch_size: Rows sent per batched write transaction.
+        workers: Number of extraction processes; 1 processes PDFs sequentially.
+        extractor_options: Keyword arguments for ConceptExtractor (e.g. chunk_size).
+        cache: Optional ExtractionCache; unchanged PDFs found in it are not re-extracted.
+        defer_topic_similarity: Update topic similarity once for all PDFs instead of per PDF.
+        topic_model: CorpusTopicModel scoring every PDF's topics; None keeps per-process models.
     """
     logger = setup_logging()
+    extractor_options = extractor_options or {}
     folder = Path(folder_path)
     
     if not folder.exists() or not folder.is_dir():
@@ -63,30 +219,54 @@ def process_pdfs_in_folder(folder_path, neo4j_uri, neo4j_user, neo4j_password):
         logger.warning(f"No PDF files found in the folder: {folder_path}")
         sys.exit(1)
     
+    summary = IngestSummary()
+    
+    if workers > 1:
+        # Workers load their own models; the connector only needs spaCy here
+        neo4j_conn = Neo4jConnector(uri=neo4j_uri, user=neo4j_user, password=neo4j_password,
+                                    batch_size=batch_size, defer_topic_similarity=defer_topic_similarity)
+        try:
+            process_in_parallel(pdf_files, neo4j_conn, workers, summary, logger, extractor_options, cache,
+                                topic_model=topic_model)
+            neo4j_conn.update_topic_similarity()
+        finally:
+            neo4j_conn.close()
+        summary.report(logger)
+        return
+    
     # Connect to Neo4j
-    neo4j_conn = Neo4jConnector(uri=neo4j_uri, user=neo4j_user, password=neo4j_password)
+    neo4j_conn = Neo4jConnector(uri=neo4j_uri, user=neo4j_user, password=neo4j_password,
+                                batch_size=batch_size, defer_topic_similarity=defer_topic_similarity)
+    # Loaded on the first cache miss and sharing the connector's spaCy pipeline
+    extractor = None
+    version = extractor_version(**extractor_options)
+    metrics = get_instrumentation()
     
     try:
         for pdf_file in pdf_files:
             logger.info(f"Processing PDF: {pdf_file.name}")
             
-            # Extract concepts from the PDF
-            concepts = extract_concepts_from_pdf(pdf_file)
-            
-            if not concepts:
-                logger.warning(f"Failed to extract concepts from: {pdf_file.name}")
-                continue
-            
-            # Upload to Neo4j
-            try:
-                neo4j_conn.add_nodes_and_relationships(concepts)
-                logger.info(f"Data successfully uploaded for: {pdf_file.name}")
-            except Exception as e:
-                logger.error(f"Failed to upload data for {pdf_file.name}: {e}", exc_info=True)
+            with metrics.document(pdf_file.name):
+                cache_key = cache.key_for(pdf_file, version) if cache else None
+                concepts = load_cached(cache, cache_key, pdf_file, summary, logger)
+                if concepts is None:
+                    if extractor is None:
+                        extractor = ConceptExtractor(nlp=neo4j_conn.nlp, topic_model=topic_model,
+                                                     **extractor_options)
+                    
+                    # Extract concepts from the PDF
+                    concepts = extractor.extract(pdf_file)
+                    store_cached(cache, cache_key, concepts)
+                upload_concepts(neo4j_conn, pdf_file, concepts, summary, logger, topic_model)
+        # Topics of every uploaded PDF when the update was deferred
+        neo4j_conn.update_topic_similarity()
     finally:
         neo4j_conn.close()
+    summary.report(logger)
 
-def main(folder=None, neo4j_uri=None, neo4j_user=None, neo4j_password=None):
+def main(folder=None, neo4j_uri=None, neo4j_user=None, neo4j_password=None, batch_size=1000, workers=1,
+         extractor_options=None, cache_path=None, cache_size_mb=2048, rebuild_cache=False,
+         metrics_options=None, metrics_file=None, defer_topic_similarity=False, topic_model_path=None):
     """
     Main function to process PDFs and update the Neo4j knowledge graph.
 
@@ -95,6 +275,18 @@ def main(folder=None, neo4j_uri=None, neo4j_user=None, neo4j_password=None):
         neo4j_uri: Neo4j database URI.
         neo4j_user: Neo4j username.
         neo4j_password: Neo4j password.
+        batch_size: Rows sent per batched write transaction.
+        workers: Number of extraction processes.
+        extractor_options: Keyword arguments for ConceptExtractor.
+        cache_path: SQLite file for cached extraction results; None disables the cache.
+        cache_size_mb: Size limit of the cache before least recently used entries are evicted.
+        rebuild_cache: Drop every cached result before processing.
+        metrics_options: Enables per-stage instrumentation when given; keyword
+            arguments for instrumentation.configure (profile_dir, trace_memory).
+        metrics_file: Where to write the collected metrics in Prometheus text format.
+        defer_topic_similarity: Update topic similarity once at the end of the run.
+        topic_model_path: File holding the corpus document frequencies topics are scored
+            against; updated with every new PDF. None keeps them in memory for this run.
     """
     logger = setup_logging()
     
@@ -102,11 +294,31 @@ def main(folder=None, neo4j_uri=None, neo4j_user=None, neo4j_password=None):
         logger.error("Missing required arguments.")
         sys.exit(1)
 
+    if metrics_options is not None:
+        configure_instrumentation(**metrics_options)
+
+    cache = ExtractionCache(cache_path, max_bytes=cache_size_mb * 1024 * 1024) if cache_path else None
+    topic_model = CorpusTopicModel.load(topic_model_path) if topic_model_path else CorpusTopicModel()
     try:
-        process_pdfs_in_folder(folder, neo4j_uri, neo4j_user, neo4j_password)
+        if cache and rebuild_cache:
+            logger.info(f"Rebuilding extraction cache: {cache_path}")
+            cache.clear()
+        process_pdfs_in_folder(folder, neo4j_uri, neo4j_user, neo4j_password,
+                               batch_size=batch_size, workers=workers,
+                               extractor_options=extractor_options, cache=cache,
+                               defer_topic_similarity=defer_topic_similarity,
+                               topic_model=topic_model)
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if cache:
+            cache.close()
+        if topic_model_path:
+            topic_model.save()
+        if metrics_file:
+            get_instrumentation().write_prometheus(metrics_file)
+            logger.info(f"Metrics written to: {metrics_file}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -116,6 +328,40 @@ if __name__ == "__main__":
     parser.add_argument("--neo4j_uri", type=str, default="bolt://localhost:7687", help="URI of the Neo4j database.")
     parser.add_argument("--neo4j_user", type=str, default="neo4j", help="Neo4j username.")
     parser.add_argument("--neo4j_password", type=str, required=True, help="Neo4j password.")
+    parser.add_argument("--batch_size", type=int, default=1000, help="Rows sent per batched Neo4j write transaction.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes extracting PDFs in parallel.")
+    parser.add_argument("--chunk_size", type=int, default=None,
+                        help="Stream each PDF through spaCy in sentence-aligned chunks of this many characters.")
+    parser.add_argument("--keyword_diversity", choices=["maxsum", "mmr", "none"], default="maxsum",
+                        help="How KeyBERT keywords are diversified; mmr and none are much cheaper than maxsum.")
+    parser.add_argument("--table_key_columns", type=int, default=None,
+                        help="Only relate table columns to the first N (key) columns of each table.")
+    parser.add_argument("--max_column_pairs", type=int, default=None,
+                        help="Maximum number of column pairs related per table.")
+    parser.add_argument("--max_chunk_distance", type=int, default=None,
+                        help="Only relate noun chunks at most this many chunks apart in a sentence.")
+    parser.add_argument("--pdf_profile", choices=["accurate", "fast"], default="accurate",
+                        help="PDF reading: pdfplumber layout text, or fast PyPDF2 text with tables only on ruled pages.")
+    parser.add_argument("--page_workers", type=int, default=1,
+                        help="Processes reading the pages of one PDF in parallel.")
+    parser.add_argument("--cache_path", type=str, default=".pdf2graph_cache.sqlite",
+                        help="SQLite file caching extraction results of unchanged PDFs.")
+    parser.add_argument("--cache_size_mb", type=int, default=2048, help="Size limit of the extraction cache in MB.")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Do not read or write the extraction cache.")
+    parser.add_argument("--rebuild-cache", dest="rebuild_cache", action="store_true",
+                        help="Discard cached extraction results and re-extract every PDF.")
+    parser.add_argument("--topic_model_path", type=str, default=".pdf2graph_topics.npz",
+                        help="File with the corpus document frequencies topics are scored against.")
+    parser.add_argument("--defer_topic_similarity", action="store_true",
+                        help="Update topic similarity once after all PDFs instead of after each PDF.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Log per-document stage timings and counters as structured records.")
+    parser.add_argument("--metrics_file", type=str, default=None,
+                        help="Write aggregated metrics to this file in Prometheus text format (implies --metrics).")
+    parser.add_argument("--profile_dir", type=str, default=None,
+                        help="Save a cProfile dump per document into this directory (implies --metrics).")
+    parser.add_argument("--trace_memory", action="store_true",
+                        help="Record the tracemalloc peak per document (implies --metrics).")
     
     args = parser.parse_args()
 
@@ -123,7 +369,22 @@ if __name__ == "__main__":
         folder=args.folder,
         neo4j_uri=args.neo4j_uri,
         neo4j_user=args.neo4j_user,
-        neo4j_password=args.neo4j_password
+        neo4j_password=args.neo4j_password,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        extractor_options={'chunk_size': args.chunk_size, 'keyword_diversity': args.keyword_diversity,
+                           'table_key_columns': args.table_key_columns,
+                           'max_column_pairs': args.max_column_pairs,
+                           'max_chunk_distance': args.max_chunk_distance,
+                           'pdf_profile': args.pdf_profile, 'page_workers': args.page_workers},
+        cache_path=None if args.no_cache else args.cache_path,
+        cache_size_mb=args.cache_size_mb,
+        rebuild_cache=args.rebuild_cache,
+        metrics_options=({"profile_dir": args.profile_dir, "trace_memory": args.trace_memory}
+                         if args.metrics or args.metrics_file or args.profile_dir or args.trace_memory else None),
+        metrics_file=args.metrics_file,
+        defer_topic_similarity=args.defer_topic_similarity,
+        topic_model_path=args.topic_model_path
     )
 
 
@@ -0,0 +1,152 @@
+from neo4j import AsyncGraphDatabase
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+import asyncio
+import logging
+from neo4j_searcher import (
+    CONCEPT_NETWORK_QUERY,
+    DEFAULT_MAX_CONNECTIONS,
+    TOPIC_CONCEPTS_QUERY,
+    TOPIC_CONCEPTS_STREAM_QUERY,
+    TOPIC_STATISTICS_QUERY,
+    concept_network_result,
+    topic_concepts_result,
+    topic_page_result,
+    topic_search_query,
+)
+
+class AsyncNeo4jSearcher:
+    """
+    asyncio counterpart of ``Neo4jSearcher`` built on the async driver.
+    Methods return the same result shapes as the synchronous searcher.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, max_concurrency: int = 8):
+        self.driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+        self.logger = logging.getLogger(__name__)
+        # Default cap on queries in flight for the fan-out helpers
+        self.max_concurrency = max_concurrency
+
+    async def close(self):
+        await self.driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def search_topics(self, search_term: str, min_relevance: float = 0.3,
+                            mode: str = "contains", limit: Optional[int] = None) -> List[Dict]:
+        """
+        Search for topics that match the search term using native Neo4j string operations,
+        or the topic full-text index with ``mode="fulltext"``.
+        """
+        if limit is not None:
+            page = await self.search_topics_page(search_term, min_relevance, mode, page_size=limit)
+            return page["results"]
+        query = topic_search_query(search_term, mode)
+        if query is None:
+            return []
+        cypher, params = query
+
+        async with self.driver.session() as session:
+            result = await session.run(cypher, search=search_term, min_relevance=min_relevance, **params)
+            return [dict(record["result"]) async for record in result]
+
+    async def search_topics_page(self, search_term: str, min_relevance: float = 0.3,
+                                 mode: str = "contains", page_size: int = 50,
+                                 cursor: Optional[Dict] = None) -> Dict:
+        """One page of ``search_topics`` results with the ``nextCursor`` of the following page."""
+        query = topic_search_query(search_term, mode, paged=True)
+        if query is None:
+            return {"results": [], "nextCursor": None}
+        cypher, params = query
+
+        async with self.driver.session() as session:
+            result = await session.run(cypher, search=search_term, min_relevance=min_relevance,
+                                       after=cursor, limit=page_size, **params)
+            return topic_page_result([record async for record in result], page_size)
+
+    async def iter_topics(self, search_term: str, min_relevance: float = 0.3,
+                          mode: str = "contains", fetch_size: int = 1000) -> AsyncIterator[Dict]:
+        """Yield ``search_topics`` results as the driver receives them."""
+        query = topic_search_query(search_term, mode)
+        if query is None:
+            return
+        cypher, params = query
+
+        async with self.driver.session(fetch_size=fetch_size) as session:
+            result = await session.run(cypher, search=search_term, min_relevance=min_relevance, **params)
+            async for record in result:
+                yield dict(record["result"])
+
+    async def get_topic_concepts(self, topic_name: str,
+                                 min_weight: float = 0.3,
+                                 limit: int = 20,
+                                 max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """
+        Get all concepts related to a specific topic with their relationships,
+        checking that the topic exists in the same round trip.
+        """
+        async with self.driver.session() as session:
+            result = await session.run(TOPIC_CONCEPTS_QUERY, topic=topic_name, min_weight=min_weight,
+                                       limit=limit, max_connections=max_connections, after=None)
+            return topic_concepts_result(topic_name, await result.single())
+
+    async def get_topic_concepts_page(self, topic_name: str, min_weight: float = 0.3,
+                                      page_size: int = 20, cursor: Optional[Dict] = None,
+                                      max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """One page of a topic's concepts with the ``nextCursor`` of the following page."""
+        async with self.driver.session() as session:
+            result = await session.run(TOPIC_CONCEPTS_QUERY, topic=topic_name, min_weight=min_weight,
+                                       limit=page_size, max_connections=max_connections, after=cursor)
+            return topic_concepts_result(topic_name, await result.single(), page_size)
+
+    async def iter_topic_concepts(self, topic_name: str, min_weight: float = 0.3,
+                                  max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                                  fetch_size: int = 1000) -> AsyncIterator[Dict]:
+        """Yield every concept of a topic as the driver receives it."""
+        async with self.driver.session(fetch_size=fetch_size) as session:
+            result = await session.run(TOPIC_CONCEPTS_STREAM_QUERY, topic=topic_name, min_weight=min_weight,
+                                       max_connections=max_connections)
+            async for record in result:
+                yield dict(record["concept"])
+
+    async def get_many_topic_concepts(self, topics: Iterable[str],
+                                      min_weight: float = 0.3,
+                                      limit: int = 20,
+                                      max_concurrency: int = None,
+                                      max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict[str, Dict]:
+        """
+        Run ``get_topic_concepts`` for several topics concurrently, with at most
+        ``max_concurrency`` queries in flight. Returns results keyed by topic.
+        """
+        topics = list(dict.fromkeys(topics))
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def fetch(topic):
+            async with semaphore:
+                return await self.get_topic_concepts(topic, min_weight=min_weight, limit=limit,
+                                                     max_connections=max_connections)
+
+        results = await asyncio.gather(*(fetch(topic) for topic in topics))
+        return dict(zip(topics, results))
+
+    async def search_concept_network(self, topic_name: str, concept_name: str,
+                                     max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """
+        Get detailed information about a specific concept within a topic's context.
+        """
+        async with self.driver.session() as session:
+            result = await session.run(CONCEPT_NETWORK_QUERY, topic=topic_name, concept=concept_name,
+                                       max_connections=max_connections)
+            return concept_network_result(await result.single())
+
+    async def get_topic_statistics(self, top_k: int = 5) -> Dict:
+        """
+        Get general statistics about topics in the knowledge graph.
+        """
+        async with self.driver.session() as session:
+            result = await session.run(TOPIC_STATISTICS_QUERY, top_k=top_k)
+            record = await result.single()
+            return dict(record["stats"])
@@ -1,133 +1,696 @@
 from neo4j import GraphDatabase
 import spacy
-from collections import defaultdict
+import hashlib
+import json
+import logging
+import time
+import numpy as np
+from collections import Counter, defaultdict
+from similarity import cosine_matrix, embed_texts
+from concept_records import EntityContexts
+from neo4j_schema import GRAPH_VERSION_BUMP, ensure_schema
+from instrumentation import get_instrumentation, timed_stage
+
+# Example sentences kept per relationship (also the [..3] slices in the Cypher below)
+MAX_CONTEXTS = 3
+
+# Concept names kept in Topic.topConcepts, strongest association first
+TOP_CONCEPTS = 10
+
+# Appended to the SET of relationship writes: how many documents wrote the
+# relationship. What each document added is kept on its Document node
+# (``contributions``), so shared relationships stay the same size however
+# many documents contribute to them.
+_PROVENANCE = """
+                r.documentCount = COALESCE(r.documentCount, 0) + 1
+"""
+
+# The row fields that identify each relationship a document wrote, per
+# graph_rows group, stored as the document's ``contributions``
+CONTRIBUTION_FIELDS = {
+    'topic_association': ('topic', 'entity'),
+    'weighted': ('entity1', 'entity2', 'rel_type', 'count'),
+    'labelled': ('entity1', 'entity2', 'rel_type', 'relation', 'count'),
+    'unweighted': ('entity1', 'entity2', 'rel_type', 'count'),
+    'action': ('subject', 'verb', 'object', 'count'),
+    'noun_chunk': ('entity1', 'relationship', 'entity2', 'count'),
+    'column': ('entity1', 'entity2', 'col1', 'col2', 'relation', 'count'),
+}
+
+# Takes one document's share out of the relationship ``r`` it wrote and
+# deletes relationships no other document wrote
+_WITHDRAW = """
+            SET r.count = r.count - COALESCE(row.count, 0),
+                r.documentCount = r.documentCount - 1
+            WITH r
+            WHERE r.documentCount <= 0
+            DELETE r
+"""
+
+# The relationships of every group, matched the way they were written.
+# Both ends must be concepts the document MENTIONS, which are exactly the
+# nodes the write matched by name.
+_REMOVE_QUERIES = {
+    'topic_association': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(c:Concept {name: row.entity})
+            MATCH (:Topic {name: row.topic})-[r:RELATED_TO]->(c)
+    """,
+    'weighted': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.entity1})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.entity2})
+            MATCH (a)-[r:RELATED {type: row.rel_type}]->(b)
+    """,
+    'labelled': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.entity1})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.entity2})
+            MATCH (a)-[r:RELATED {type: row.rel_type, relation: row.relation}]->(b)
+    """,
+    'unweighted': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.entity1})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.entity2})
+            MATCH (a)-[r:RELATED {type: row.rel_type}]->(b)
+    """,
+    'action': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.subject})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.object})
+            MATCH (a)-[r:ACTION {type: 'subject_object', verb: row.verb}]->(b)
+    """,
+    'noun_chunk': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.entity1})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.entity2})
+            MATCH (a)-[r:RELATED {type: 'noun_chunk', relation: row.relationship}]->(b)
+    """,
+    'column': """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})-[:MENTIONS]->(a:Concept {name: row.entity1, type: row.col1})
+            MATCH (d)-[:MENTIONS]->(b:Concept {name: row.entity2, type: row.col2})
+            MATCH (a)-[r:RELATED {type: 'column_relationship', relation: row.relation}]->(b)
+    """,
+}
+
+class _WriteLog:
+    """
+    Rows written and stage timings of one transaction attempt. The driver
+    runs a transaction function again after a transient error, so these are
+    only logged and counted (``report``) once the transaction has committed.
+    """
+
+    def __init__(self):
+        self.writes = []
+        self.stages = []
+
+    def wrote(self, name, rows, seconds):
+        self.writes.append((name, rows, seconds))
+        self.stages.append(("neo4j_write", seconds))
+
+    def report(self, logger, batch_size):
+        metrics = get_instrumentation()
+        for stage, seconds in self.stages:
+            metrics.record_stage(stage, seconds)
+        for name, rows, seconds in self.writes:
+            metrics.count("rows_written", rows)
+            logger.info(f"Wrote {rows} {name} rows in {seconds:.2f}s "
+                        f"({rows / max(seconds, 1e-9):.0f} rows/sec, batch size {batch_size})")
 
 class Neo4jConnector:
-    def __init__(self, uri, user, password):
+    def __init__(self, uri, user, password, nlp=None, batch_size=1000, manage_schema=True,
+                 defer_topic_similarity=False):
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
-        self.nlp = spacy.load("en_core_web_sm")
+        self.logger = logging.getLogger(__name__)
+        # Rows sent per UNWIND write transaction
+        self.batch_size = batch_size
+        # Create constraints and indexes before the first write
+        self.manage_schema = manage_schema
+        self._schema_ready = False
+        # Update topic_similarity edges in each document's write, or only for
+        # the collected topics when update_topic_similarity() is called
+        self.defer_topic_similarity = defer_topic_similarity
+        self._pending_topics = set()
+        # Share an already loaded spaCy pipeline (e.g. ConceptExtractor.nlp) when given
+        self.nlp = nlp if nlp is not None else spacy.load("en_core_web_sm")
 
     def close(self):
         self.driver.close()
 
-    def _find_topic_concept_relationships(self, topics, entity_contexts):
-        """Find relationships between topics and concepts based on context."""
-        relationships = defaultdict(list)
-        
-        # Create a mapping of entities to their contexts
-        entity_text = {entity: ' '.join(contexts) 
-                      for entity, contexts in entity_contexts.items()}
+    def ensure_schema(self):
+        """Idempotently create the graph's constraints and indexes (once per connector)."""
+        if not self._schema_ready:
+            ensure_schema(self.driver)
+            self._schema_ready = True
+
+    def _find_topic_concept_relationships(self, topics, entity_contexts, context_vectors=None):
+        return find_topic_concept_relationships(self.nlp, topics, entity_contexts, context_vectors)
+
+    def _write_rows(self, tx, log, name, query, rows, **params):
+        """
+        Send ``rows`` through ``query`` (which reads them from ``$rows`` via
+        UNWIND) in batches of ``batch_size`` inside the transaction ``tx``,
+        noting the write in the attempt's ``_WriteLog``.
+        """
+        if not rows:
+            return
+        start = time.perf_counter()
+        for offset in range(0, len(rows), self.batch_size):
+            tx.run(query, rows=rows[offset:offset + self.batch_size], **params).consume()
+        log.wrote(name, len(rows), time.perf_counter() - start)
+
+    def add_nodes_and_relationships(self, concepts, document=None):
+        """
+        Write the extracted concepts of ``document`` (its identifier, e.g.
+        the PDF file name; derived from the content by ``document_id`` when
+        not given) to the graph and return the identifier.
+
+        Everything the document wrote before is removed first, in the same
+        transaction, so re-ingesting a document atomically replaces its
+        subgraph. Rows are grouped by node and relationship type and sent in
+        batches through ``UNWIND $rows`` instead of one round trip per row.
+        """
+        if document is None:
+            document = document_id(concepts)
+        if self.manage_schema:
+            self.ensure_schema()
+
+        # Add topic nodes and relationships
+        topic_concept_rels = self._find_topic_concept_relationships(
+            concepts['topics'], 
+            concepts['entity_contexts'],
+            concepts.get('context_vectors')
+        )
+        rows = graph_rows(concepts, topic_concept_rels)
+
+        with self.driver.session() as session:
+            # Retried as a whole by the driver on transient errors
+            affected_topics, log = session.execute_write(self._write_document, document, rows)
+            log.report(self.logger, self.batch_size)
+            if self.defer_topic_similarity:
+                self._pending_topics.update(affected_topics)
+        return document
+
+    def _write_document(self, tx, document, rows):
+        """
+        Replace ``document``'s subgraph with ``rows``; returns the topics
+        whose links changed and the attempt's ``_WriteLog``.
+        """
+        doc = {'document': document}
+        log = _WriteLog()
+        old_topics = self._remove_document(tx, log, document)
+
+        tx.run("""
+            MERGE (d:Document {id: $document})
+            SET d.ingestedAt = datetime(),
+                d.contributions = $contributions
+        """, contributions=_contributions(rows), **doc).consume()
+
+        self._write_rows(tx, log, 'Concept', """
+            UNWIND $rows AS row
+            MERGE (n:Concept {name: row.name, type: row.type})
+        """, rows['concept'])
+
+        # Create topic nodes with their relevance scores
+        self._write_rows(tx, log, 'Topic', """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})
+            MERGE (t:Topic {name: row.name})
+            SET t.relevance = row.relevance
+            MERGE (d)-[h:HAS_TOPIC]->(t)
+            SET h.relevance = row.relevance
+        """, rows['topic'], **doc)
+
+        # Create relationships with related concepts
+        self._write_rows(tx, log, 'topic_association', """
+            UNWIND $rows AS row
+            MATCH (t:Topic {name: row.topic})
+            MATCH (c:Concept {name: row.entity})
+            MERGE (t)-[r:RELATED_TO]->(c)
+            SET r.type = 'topic_association',
+                r.weight = row.strength,
+                r.contextSimilarity = row.context_similarity,
+        """ + _PROVENANCE, rows['topic_association'], **doc)
+
+        self._write_rows(tx, log, 'weighted RELATED', """
+            UNWIND $rows AS row
+            MATCH (a:Concept {name: row.entity1}), (b:Concept {name: row.entity2})
+            MERGE (a)-[r:RELATED {type: row.rel_type}]->(b)
+            SET r.weight = row.weight,
+                r.count = COALESCE(r.count, 0) + row.count,
+        """ + _PROVENANCE, rows['weighted'], **doc)
+        self._write_rows(tx, log, 'labelled RELATED', """
+            UNWIND $rows AS row
+            MATCH (a:Concept {name: row.entity1}), (b:Concept {name: row.entity2})
+            MERGE (a)-[r:RELATED {type: row.rel_type, relation: row.relation}]->(b)
+            SET r.count = COALESCE(r.count, 0) + row.count,
+        """ + _PROVENANCE, rows['labelled'], **doc)
+        self._write_rows(tx, log, 'RELATED', """
+            UNWIND $rows AS row
+            MATCH (a:Concept {name: row.entity1}), (b:Concept {name: row.entity2})
+            MERGE (a)-[r:RELATED {type: row.rel_type}]->(b)
+            SET r.count = COALESCE(r.count, 0) + row.count,
+        """ + _PROVENANCE, rows['unweighted'], **doc)
+
+        self._write_rows(tx, log, 'ACTION', """
+            UNWIND $rows AS row
+            MATCH (a:Concept {name: row.subject}), (b:Concept {name: row.object})
+            MERGE (a)-[r:ACTION {type: 'subject_object', verb: row.verb}]->(b)
+            SET r.count = COALESCE(r.count, 0) + row.count,
+                r.contexts = (COALESCE(r.contexts, []) + [c IN row.contexts WHERE NOT c IN COALESCE(r.contexts, [])])[..3],
+        """ + _PROVENANCE, rows['action'], **doc)
+        self._write_rows(tx, log, 'noun_chunk', """
+            UNWIND $rows AS row
+            MATCH (a:Concept {name: row.entity1}), (b:Concept {name: row.entity2})
+            MERGE (a)-[r:RELATED {type: 'noun_chunk', relation: row.relationship}]->(b)
+            SET r.count = COALESCE(r.count, 0) + row.count,
+                r.contexts = (COALESCE(r.contexts, []) + [c IN row.contexts WHERE NOT c IN COALESCE(r.contexts, [])])[..3],
+        """ + _PROVENANCE, rows['noun_chunk'], **doc)
+
+        self._write_rows(tx, log, 'column_relationship', """
+            UNWIND $rows AS row
+            MERGE (a:Concept {name: row.entity1, type: row.col1})
+            MERGE (b:Concept {name: row.entity2, type: row.col2})
+            MERGE (a)-[r:RELATED {type: 'column_relationship', relation: row.relation}]->(b)
+            SET r.count = COALESCE(r.count, 0) + row.count,
+        """ + _PROVENANCE, rows['column'], **doc)
+
+        # Provenance of the concepts: every concept a relationship above may
+        # have matched, which is also where _remove_document starts from
+        self._write_rows(tx, log, 'MENTIONS', """
+            UNWIND $rows AS row
+            MATCH (d:Document {id: $document})
+            MATCH (c:Concept {name: row.name})
+            MERGE (d)-[:MENTIONS]->(c)
+        """, [{'name': name} for name in _concept_names(rows)], **doc)
+
+        affected_topics = sorted(old_topics | {row['name'] for row in rows['topic']})
+        update_topic_summaries(tx, affected_topics)
+        if not self.defer_topic_similarity:
+            start = time.perf_counter()
+            _update_topic_similarity(tx, affected_topics)
+            log.stages.append(("topic_similarity", time.perf_counter() - start))
+
+        # Signal readers (e.g. Neo4jSearcher's query cache) that the graph changed
+        tx.run(GRAPH_VERSION_BUMP).consume()
+        return affected_topics, log
+
+    def _remove_document(self, tx, log, document):
+        """
+        Take ``document``'s contribution back out of the graph: its share of
+        every relationship's ``count`` and ``documentCount``, relationships
+        no other document wrote, and concepts and topics left without any
+        connection. Returns the names of the document's previous topics.
+        """
+        record = tx.run("""
+            OPTIONAL MATCH (d:Document {id: $document})
+            OPTIONAL MATCH (d)-[:HAS_TOPIC]->(t:Topic)
+            RETURN d.contributions AS contributions, collect(t.name) AS topics
+        """, document=document).single()
+        contributions = json.loads(record["contributions"]) if record and record["contributions"] else {}
+
+        # Only the relationships this document wrote, looked up like the writes
+        for kind, query in _REMOVE_QUERIES.items():
+            self._write_rows(tx, log, f'removed {kind}', query + _WITHDRAW,
+                             contributions.get(kind, []), document=document)
+
+        tx.run("""
+            MATCH (:Document {id: $document})-[m:MENTIONS]->(c:Concept)
+            DELETE m
+            WITH DISTINCT c
+            WHERE NOT (c)--()
+            DELETE c
+        """, document=document).consume()
+
+        tx.run("""
+            MATCH (:Document {id: $document})-[h:HAS_TOPIC]->(t:Topic)
+            DELETE h
+            WITH DISTINCT t
+            WHERE NOT (t)<-[:HAS_TOPIC]-() AND NOT (t)-[:RELATED_TO]->(:Concept)
+            WITH t, COALESCE(t.conceptCount, 0) as stale
+            DETACH DELETE t
+            WITH SUM(stale) as stale
+            MATCH (m:GraphMeta {name: 'graph'})
+            SET m.topicConceptTotal = m.topicConceptTotal - stale
+        """, document=document).consume()
+
+        return set(record["topics"] or []) if record else set()
+
+    def remove_document(self, document):
+        """Delete ``document`` and everything only it contributed to the graph."""
+        if self.manage_schema:
+            self.ensure_schema()
+        with self.driver.session() as session:
+            affected_topics, log = session.execute_write(self._delete_document, document)
+            log.report(self.logger, self.batch_size)
+            if self.defer_topic_similarity:
+                self._pending_topics.update(affected_topics)
+
+    def _delete_document(self, tx, document):
+        log = _WriteLog()
+        affected_topics = sorted(self._remove_document(tx, log, document))
+        update_topic_summaries(tx, affected_topics)
+        tx.run("MATCH (d:Document {id: $document}) DETACH DELETE d", document=document).consume()
+        if not self.defer_topic_similarity:
+            start = time.perf_counter()
+            _update_topic_similarity(tx, affected_topics)
+            log.stages.append(("topic_similarity", time.perf_counter() - start))
+        tx.run(GRAPH_VERSION_BUMP).consume()
+        return affected_topics, log
+
+    def update_topic_similarity(self, topics=None):
+        """
+        Recompute topic_similarity edges of ``topics`` (default: the topics
+        collected while ``defer_topic_similarity`` is set) in one pass.
+        """
+        topics = sorted(self._pending_topics if topics is None else topics)
+        if not topics:
+            return
+        with get_instrumentation().stage("topic_similarity"):
+            with self.driver.session() as session:
+                for offset in range(0, len(topics), self.batch_size):
+                    session.execute_write(_update_topic_similarity, topics[offset:offset + self.batch_size])
+                session.execute_write(_run_query, GRAPH_VERSION_BUMP)
+        self.logger.info(f"Updated topic similarity of {len(topics)} topics")
+        self._pending_topics.difference_update(topics)
+
+
+@timed_stage("topic_association")
+def find_topic_concept_relationships(nlp, topics, entity_contexts, context_vectors=None):
+    """
+    Find relationships between topics and concepts based on context.
+    Topic and context vectors are computed once each (or reused from
+    ``context_vectors`` produced by the extractor) and compared in a
+    single matrix product. Substring checks run over each distinct context
+    sentence once; only topics with a space, which can span two adjacent
+    sentences of an entity's joined contexts, also check the joined text.
+    """
+    relationships = defaultdict(list)
+    if not isinstance(entity_contexts, EntityContexts):
+        entity_contexts = EntityContexts.from_texts(entity_contexts)
+    sentences = entity_contexts.sentences
+    
+    # Entities and the sentences they appear in, skipping ones without context
+    entity_names = [entity for entity in entity_contexts
+                    if entity and any(sentences.text(i) for i in entity_contexts.sentence_ids(entity))]
+    topic_names = list(topics)
+    if not entity_names or not topic_names:
+        return relationships
+    
+    topic_vectors = embed_texts(nlp, topic_names)
+    if context_vectors and all(entity in context_vectors for entity in entity_names):
+        context_matrix = np.vstack([context_vectors[entity] for entity in entity_names])
+    else:
+        context_matrix = None
+    if context_matrix is None or context_matrix.shape[1] != topic_vectors.shape[1]:
+        context_matrix = embed_texts(nlp, (' '.join(entity_contexts[entity]) for entity in entity_names))
+    
+    # Similarity of every topic to every entity context
+    get_instrumentation().count("topic_pairs_compared", len(topic_names) * len(entity_names))
+    similarities = cosine_matrix(topic_vectors, context_matrix)
+    
+    # Lower-case every context sentence and entity once for the substring checks
+    entity_sentences = [set(entity_contexts.sentence_ids(entity)) for entity in entity_names]
+    lower_sentences = {i: sentences.text(i).lower() for ids in entity_sentences for i in ids}
+    lower_entities = [entity.lower() for entity in entity_names]
+    # Joined contexts (as ' '.join(entity_contexts[entity])), built on first use
+    joined_contexts = {}
+    
+    def joined_context(e):
+        if e not in joined_contexts:
+            joined_contexts[e] = ' '.join(lower_sentences[i] for i in entity_contexts.sentence_ids(entity_names[e]))
+        return joined_contexts[e]
+    
+    for t, topic in enumerate(topic_names):
+        relevance = topics[topic]
+        topic_lower = topic.lower()
+        mentioned_in = {i for i, text in lower_sentences.items() if topic_lower in text}
+        # Only a match containing the joining space can span two sentences
+        spans_sentences = ' ' in topic_lower
         
-        for topic, relevance in topics.items():
-            topic_doc = self.nlp(topic)
+        for e, entity in enumerate(entity_names):
+            topic_context_similarity = float(similarities[t, e])
             
-            for entity, context in entity_text.items():
-                # Skip if entity or context is empty
-                if not entity or not context:
-                    continue
-                    
-                # Calculate context relevance
-                context_doc = self.nlp(context)
-                topic_context_similarity = topic_doc.similarity(context_doc)
+            # If the topic appears in the entity's context or there's significant semantic similarity
+            if (topic_context_similarity > 0.3 or  # Threshold for semantic similarity
+                not mentioned_in.isdisjoint(entity_sentences[e]) or 
+                lower_entities[e] in topic_lower or
+                (spans_sentences and topic_lower in joined_context(e))):
                 
-                # If the topic appears in the entity's context or there's significant semantic similarity
-                if (topic.lower() in context.lower() or 
-                    entity.lower() in topic.lower() or 
-                    topic_context_similarity > 0.3):  # Threshold for semantic similarity
-                    
-                    # Calculate relationship strength
-                    strength = (topic_context_similarity + relevance) / 2
-                    relationships[topic].append({
-                        'entity': entity,
-                        'strength': strength,
-                        'context_similarity': topic_context_similarity
-                    })
-        
-        return relationships
+                # Calculate relationship strength
+                strength = (topic_context_similarity + relevance) / 2
+                relationships[topic].append({
+                    'entity': entity,
+                    'strength': strength,
+                    'context_similarity': topic_context_similarity
+                })
+    
+    return relationships
 
-    def add_nodes_and_relationships(self, concepts):
-        with self.driver.session() as session:
-            # Add nodes for each entity in concepts
-            for entity_type, entities in concepts['named_entities'].items():
-                for entity in entities:
-                    session.run("MERGE (n:Concept {name: $name, type: $type})", 
-                                name=entity, type=entity_type)
-
-            # Add topic nodes and relationships
-            topic_concept_rels = self._find_topic_concept_relationships(
-                concepts['topics'], 
-                concepts['entity_contexts']
-            )
-
-            # Create topic nodes with their relevance scores
-            for topic, relevance in concepts['topics'].items():
-                # Create topic node
-                session.run("""
-                    MERGE (t:Topic {name: $name})
-                    SET t.relevance = $relevance
-                """, name=topic, relevance=relevance)
-                
-                # Create relationships with related concepts
-                for rel in topic_concept_rels[topic]:
-                    session.run("""
-                        MATCH (t:Topic {name: $topic})
-                        MATCH (c:Concept {name: $entity})
-                        MERGE (t)-[r:RELATED_TO]->(c)
-                        SET r.type = 'topic_association',
-                            r.weight = $strength,
-                            r.contextSimilarity = $context_similarity
-                    """, topic=topic, 
-                         entity=rel['entity'],
-                         strength=rel['strength'],
-                         context_similarity=rel['context_similarity'])
-
-            # Add relationships between topics based on shared concepts
-            session.run("""
-                MATCH (t1:Topic)-[r1:RELATED_TO]->(c:Concept)<-[r2:RELATED_TO]-(t2:Topic)
-                WHERE t1 <> t2
-                WITH t1, t2, AVG(r1.weight + r2.weight) as strength, COUNT(c) as shared
-                WHERE shared > 0
-                MERGE (t1)-[r:RELATED_TO]->(t2)
-                SET r.type = 'topic_similarity',
-                    r.weight = strength,
-                    r.shared_concepts = shared
-            """)
-
-            # Add general relationships
-            for rel_type, rels in concepts['general_relationships'].items():
-                for rel in rels:
-                    if len(rel) == 3:  # if semantic or weighted relationship
-                        session.run("""
-                            MATCH (a:Concept {name: $entity1}), (b:Concept {name: $entity2})
-                            MERGE (a)-[r:RELATED {type: $rel_type, weight: $weight}]->(b)
-                        """, entity1=rel[0], entity2=rel[1], rel_type=rel_type, weight=rel[2])
-                    else:
-                        session.run("""
-                            MATCH (a:Concept {name: $entity1}), (b:Concept {name: $entity2})
-                            MERGE (a)-[r:RELATED {type: $rel_type}]->(b)
-                        """, entity1=rel[0], entity2=rel[1], rel_type=rel_type)
-
-            # Add specific relationships
-            for rel_type, rels in concepts['specific_relationships'].items():
-                if rel_type == 'subject_object':
-                    for rel in rels:
-                        session.run("""
-                            MATCH (a:Concept {name: $subject}), (b:Concept {name: $object})
-                            MERGE (a)-[r:ACTION {type: 'subject_object', verb: $verb}]->(b)
-                        """, subject=rel['subject'], verb=rel['verb'], object=rel['object'])
-                elif rel_type == 'noun_chunks':
-                    for rel in rels:
-                        session.run("""
-                            MATCH (a:Concept {name: $entity1}), (b:Concept {name: $entity2})
-                            MERGE (a)-[r:RELATED {type: 'noun_chunk', relation: $relationship}]->(b)
-                        """, entity1=rel['entity1'], relationship=rel['relationship'], entity2=rel['entity2'])
-
-            # Column relationships from tables
-            for cols, pairs in concepts['column_relationships'].items():
-                col1, col2 = cols.split("_")
-                for pair in pairs:
-                    session.run("""
-                        MERGE (a:Concept {name: $entity1, type: $col1})
-                        MERGE (b:Concept {name: $entity2, type: $col2})
-                        MERGE (a)-[r:RELATED {type: 'column_relationship', relation: $relation}]->(b)
-                    """, entity1=pair[0], entity2=pair[1], col1=col1, col2=col2, relation=f"{col1} <-> {col2}")
+def graph_rows(concepts, topic_concept_rels):
+    """
+    Rows for every node and relationship group written for one document,
+    keyed by group name. ``topic_concept_rels`` is the result of
+    ``find_topic_concept_relationships``.
+
+    Identical relationships are collapsed into one row carrying the number
+    of occurrences (``count``) and, where the records know their sentence,
+    up to ``MAX_CONTEXTS`` example ``contexts``.
+    """
+    # Add nodes for each entity in concepts
+    concept_rows = [{'name': entity, 'type': entity_type}
+                    for entity_type, entities in concepts['named_entities'].items()
+                    for entity in entities]
+
+    topic_rows = [{'name': topic, 'relevance': relevance}
+                  for topic, relevance in concepts['topics'].items()]
+    topic_link_rows = [{'topic': topic,
+                        'entity': rel['entity'],
+                        'strength': rel['strength'],
+                        'context_similarity': rel['context_similarity']}
+                       for topic in concepts['topics']
+                       for rel in topic_concept_rels[topic]]
+
+    # General relationships, split by whether they carry a weight or a
+    # label (the dependency of syntactic pairs)
+    weighted = {}
+    labelled = Counter()
+    unweighted = Counter()
+    for rel_type, rels in concepts['general_relationships'].items():
+        for rel in rels:
+            key = (rel[0], rel[1], rel_type)
+            if len(rel) == 3 and isinstance(rel[2], str):
+                labelled[key + (rel[2],)] += 1
+            elif len(rel) == 3:  # if semantic or weighted relationship
+                count = weighted[key][1] + 1 if key in weighted else 1
+                weighted[key] = (rel[2], count)
+            else:
+                unweighted[key] += 1
+    weighted_rows = [{'entity1': entity1, 'entity2': entity2, 'rel_type': rel_type,
+                      'weight': weight, 'count': count}
+                     for (entity1, entity2, rel_type), (weight, count) in weighted.items()]
+    labelled_rows = [{'entity1': entity1, 'entity2': entity2, 'rel_type': rel_type,
+                      'relation': relation, 'count': count}
+                     for (entity1, entity2, rel_type, relation), count in labelled.items()]
+    unweighted_rows = [{'entity1': entity1, 'entity2': entity2, 'rel_type': rel_type, 'count': count}
+                       for (entity1, entity2, rel_type), count in unweighted.items()]
+
+    # Specific relationships
+    specific = concepts['specific_relationships']
+    action_rows = _collapse(specific.get('subject_object', []), ('subject', 'verb', 'object'))
+    noun_chunk_rows = _collapse(specific.get('noun_chunks', []), ('entity1', 'relationship', 'entity2'))
+
+    # Column relationships from tables; tables that repeat their headers
+    # (e.g. continued across pages) list the same pair more than once
+    column_counts = Counter()
+    for (col1, col2), pairs in concepts['column_relationships'].items():
+        for val1, val2, count in pairs:
+            column_counts[(val1, val2, col1, col2)] += count
+    column_rows = [{'entity1': val1, 'entity2': val2, 'col1': col1, 'col2': col2, 'count': count,
+                    'relation': f"{col1} <-> {col2}"}
+                   for (val1, val2, col1, col2), count in column_counts.items()]
+
+    return {
+        'concept': concept_rows,
+        'topic': topic_rows,
+        'topic_association': topic_link_rows,
+        'weighted': weighted_rows,
+        'labelled': labelled_rows,
+        'unweighted': unweighted_rows,
+        'action': action_rows,
+        'noun_chunk': noun_chunk_rows,
+        'column': column_rows,
+    }
+
+def _collapse(records, fields):
+    """One row per distinct ``fields`` combination, with its count and example sentences."""
+    groups = {}
+    for record in records:
+        key = tuple(getattr(record, field) for field in fields)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {'count': 0, 'contexts': []}
+        group['count'] += 1
+        contexts = group['contexts']
+        if len(contexts) < MAX_CONTEXTS:
+            sentence = record.sentence
+            if sentence not in contexts:
+                contexts.append(sentence)
+    return [dict(zip(fields, key), **group) for key, group in groups.items()]
+
+def document_id(concepts):
+    """
+    Identifier for a document written without one: a digest of its text
+    when the extractor recorded one, otherwise of its entities and topics.
+    """
+    topic_terms = concepts.get('topic_terms')
+    if topic_terms is not None:
+        return f"sha-{topic_terms.digest.hex()}"
+    content = json.dumps([concepts['named_entities'], concepts['topics']], sort_keys=True, default=str)
+    return f"sha-{hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()}"
+
+def _contributions(rows):
+    """The identifying fields and counts of every relationship row, as JSON."""
+    return json.dumps({kind: [{field: row[field] for field in fields} for row in rows[kind]]
+                       for kind, fields in CONTRIBUTION_FIELDS.items() if rows[kind]})
+
+def _concept_names(rows):
+    """Names of every concept the rows of ``graph_rows`` refer to."""
+    names = {row['name'] for row in rows['concept']}
+    names.update(row['entity'] for row in rows['topic_association'])
+    for kind in ('weighted', 'labelled', 'unweighted', 'noun_chunk', 'column'):
+        for row in rows[kind]:
+            names.add(row['entity1'])
+            names.add(row['entity2'])
+    for row in rows['action']:
+        names.add(row['subject'])
+        names.add(row['object'])
+    return sorted(names)
+
+def update_topic_summaries(tx, topics):
+    """
+    Refresh the materialized ``conceptCount`` and ``topConcepts`` of
+    ``topics`` and move ``GraphMeta.topicConceptTotal`` (the sum of all
+    concept counts) by the change. Returns how many topics had stale values.
+    """
+    if not topics:
+        return 0
+    record = tx.run("""
+        UNWIND $topics AS name
+        MATCH (t:Topic {name: name})
+        CALL {
+            WITH t
+            MATCH (t)-[r:RELATED_TO]->(c:Concept)
+            // One entry per name: a topic reaches every concept node of that name
+            WITH c.name as name, MAX(r.weight) as weight
+            ORDER BY weight DESC, name
+            LIMIT $top_concepts
+            RETURN COLLECT(name) as topConcepts
+        }
+        WITH t, topConcepts, t.conceptCount as before, t.topConcepts as beforeTop,
+             COUNT { (t)-[:RELATED_TO]->(:Concept) } as after
+        SET t.conceptCount = after,
+            t.topConcepts = topConcepts
+        WITH SUM(after - COALESCE(before, 0)) as delta,
+             SUM(CASE WHEN before = after AND beforeTop = topConcepts THEN 0 ELSE 1 END) as stale
+        MERGE (m:GraphMeta {name: 'graph'})
+        SET m.topicConceptTotal = COALESCE(m.topicConceptTotal, 0) + delta
+        RETURN stale
+    """, topics=topics, top_concepts=TOP_CONCEPTS).single()
+    return record["stale"] if record else 0
+
+def rebuild_topic_summaries(driver, batch_size=1000):
+    """
+    Recompute the materialized statistics of every topic from its
+    relationships, then reset ``GraphMeta.topicConceptTotal`` to the exact
+    total. Returns ``(topics checked, topics that were stale)``.
+    """
+    checked = stale = 0
+    after = ""
+    with driver.session() as session:
+        while True:
+            # Topic names in keyset-paginated batches
+            names = session.run("""
+                MATCH (t:Topic)
+                WHERE t.name > $after
+                RETURN t.name as name
+                ORDER BY name
+                LIMIT $limit
+            """, after=after, limit=batch_size).value("name")
+            if not names:
+                break
+            stale += session.execute_write(update_topic_summaries, names)
+            checked += len(names)
+            after = names[-1]
+        session.execute_write(_run_query, """
+            CALL {
+                MATCH (:Topic)-[r:RELATED_TO]->(:Concept)
+                RETURN COUNT(r) as total
+            }
+            MERGE (m:GraphMeta {name: 'graph'})
+            SET m.topicConceptTotal = total
+        """)
+        session.execute_write(_run_query, GRAPH_VERSION_BUMP)
+    return checked, stale
+
+def _update_topic_similarity(tx, topics):
+    """
+    Recompute the topic_similarity edges of ``topics`` in both directions.
+    Edges between two topics that are both unaffected cannot have changed.
+    """
+    if not topics:
+        return
+    tx.run("""
+        UNWIND $topics AS name
+        MATCH (:Topic {name: name})-[s:RELATED_TO]-(:Topic)
+        WITH DISTINCT s
+        DELETE s
+    """, topics=topics).consume()
+    tx.run("""
+        UNWIND $topics AS name
+        MATCH (t1:Topic {name: name})-[r1:RELATED_TO]->(c:Concept)<-[r2:RELATED_TO]-(t2:Topic)
+        WHERE t1 <> t2
+        WITH t1, t2, AVG(r1.weight + r2.weight) as strength, COUNT(c) as shared
+        MERGE (t1)-[r:RELATED_TO]->(t2)
+        SET r.type = 'topic_similarity',
+            r.weight = strength,
+            r.shared_concepts = shared
+        MERGE (t2)-[q:RELATED_TO]->(t1)
+        SET q.type = 'topic_similarity',
+            q.weight = strength,
+            q.shared_concepts = shared
+    """, topics=topics).consume()
+
+def _run_query(tx, query, **params):
+    tx.run(query, **params).consume()
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Maintenance of the graph written by Neo4jConnector.")
+    parser.add_argument("--rebuild_topic_summaries", action="store_true",
+                        help="Recompute every topic's conceptCount and topConcepts and report the stale ones.")
+    parser.add_argument("--batch_size", type=int, default=1000, help="Topics updated per write transaction.")
+    args = parser.parse_args()
+    if not args.rebuild_topic_summaries:
+        parser.error("nothing to do; pass --rebuild_topic_summaries")
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    uri = os.environ.get("NEO4J_URI")
+    user = os.environ.get("NEO4J_USERNAME")
+    password = os.environ.get("NEO4J_PASSWORD")
+    if not uri or not user or not password:
+        raise ValueError("Missing one or more required environment variables: NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD")
+
+    driver = GraphDatabase.driver(uri, auth=(user, password))
+    try:
+        ensure_schema(driver)
+        checked, stale = rebuild_topic_summaries(driver, batch_size=args.batch_size)
+        print(f"Rebuilt the summaries of {checked} topics; {stale} were out of date")
+    finally:
+        driver.close()
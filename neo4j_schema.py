@@ -0,0 +1,91 @@
+import logging
+
+# Full-text indexes used by Neo4jSearcher.search_topics(mode="fulltext")
+TOPIC_FULLTEXT_INDEX = "topic_names"
+CONCEPT_FULLTEXT_INDEX = "concept_names"
+
+# Graph version counter, bumped after every ingestion so query caches can
+# tell when their results went stale
+GRAPH_VERSION_BUMP = """
+    MERGE (m:GraphMeta {name: 'graph'})
+    SET m.version = COALESCE(m.version, 0) + 1
+"""
+GRAPH_VERSION_READ = """
+    OPTIONAL MATCH (m:GraphMeta {name: 'graph'})
+    RETURN COALESCE(m.version, 0) AS version
+"""
+
+# Every statement is idempotent, so the schema can be applied on each run
+SCHEMA_STATEMENTS = [
+    # Topics are merged by name alone
+    "CREATE CONSTRAINT topic_name_unique IF NOT EXISTS "
+    "FOR (t:Topic) REQUIRE t.name IS UNIQUE",
+    # Concepts are merged by (name, type); the same name may appear with several types
+    "CREATE CONSTRAINT concept_name_type_unique IF NOT EXISTS "
+    "FOR (c:Concept) REQUIRE (c.name, c.type) IS UNIQUE",
+    # Documents are identified by the id they were ingested under
+    "CREATE CONSTRAINT document_id_unique IF NOT EXISTS "
+    "FOR (d:Document) REQUIRE d.id IS UNIQUE",
+    "CREATE CONSTRAINT graph_meta_name_unique IF NOT EXISTS "
+    "FOR (m:GraphMeta) REQUIRE m.name IS UNIQUE",
+    # Relationship writes and searches match concepts by name only
+    "CREATE INDEX concept_name IF NOT EXISTS FOR (c:Concept) ON (c.name)",
+    "CREATE INDEX concept_type IF NOT EXISTS FOR (c:Concept) ON (c.type)",
+    # get_topic_statistics reads the topics with the most concepts in index order
+    "CREATE INDEX topic_concept_count IF NOT EXISTS FOR (t:Topic) ON (t.conceptCount)",
+    f"CREATE FULLTEXT INDEX {TOPIC_FULLTEXT_INDEX} IF NOT EXISTS "
+    "FOR (t:Topic) ON EACH [t.name]",
+    f"CREATE FULLTEXT INDEX {CONCEPT_FULLTEXT_INDEX} IF NOT EXISTS "
+    "FOR (c:Concept) ON EACH [c.name]",
+]
+
+# Characters with a meaning in Lucene query syntax
+_LUCENE_SPECIAL = set('+-&|!(){}[]^"~*?:\\/')
+
+def ensure_schema(driver, wait_seconds=300):
+    """
+    Create the constraints and indexes the connector and searcher rely on.
+    Statements that fail (e.g. a uniqueness constraint over existing duplicate
+    data) are logged and skipped so ingestion can still proceed.
+    """
+    logger = logging.getLogger(__name__)
+    with driver.session() as session:
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                session.run(statement).consume()
+            except Exception as e:
+                logger.warning(f"Could not apply schema statement '{statement}': {e}")
+        # New indexes are populated in the background; wait so the first queries can use them
+        session.run("CALL db.awaitIndexes($seconds)", seconds=wait_seconds).consume()
+
+def fulltext_query(search_term):
+    """
+    Turn free text into a Lucene query: each word is escaped and matched as
+    a prefix, and any word may match.
+    """
+    words = []
+    for word in search_term.lower().split():
+        escaped = "".join(f"\\{char}" if char in _LUCENE_SPECIAL else char for char in word)
+        words.append(f"{escaped}*")
+    return " OR ".join(words)
+
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    uri = os.environ.get("NEO4J_URI")
+    user = os.environ.get("NEO4J_USERNAME")
+    password = os.environ.get("NEO4J_PASSWORD")
+    if not uri or not user or not password:
+        raise ValueError("Missing one or more required environment variables: NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD")
+
+    driver = GraphDatabase.driver(uri, auth=(user, password))
+    try:
+        ensure_schema(driver)
+        print("Schema is up to date")
+    finally:
+        driver.close()
@@ -1,140 +1,491 @@
 from neo4j import GraphDatabase
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+import copy
+import functools
+import inspect
 import logging
+import time
+from neo4j_schema import GRAPH_VERSION_READ, TOPIC_FULLTEXT_INDEX, fulltext_query
+from query_cache import QueryCache
+
+# Cypher shared by Neo4jSearcher and AsyncNeo4jSearcher
+
+# Connections returned per concept unless the caller asks for another cap
+DEFAULT_MAX_CONNECTIONS = 100
+
+# Bookkeeping Neo4jConnector keeps on relationships, left out of results
+INTERNAL_PROPERTIES = ("documentCount",)
+
+# Concepts of topic t: the count Neo4jConnector materializes on the node,
+# counted from the relationships for topics written before it did
+_CONCEPT_COUNT = "CASE WHEN t.conceptCount IS NULL THEN COUNT { (t)-[:RELATED_TO]->(:Concept) } ELSE t.conceptCount END"
+
+SEARCH_TOPICS_QUERY = """
+    MATCH (t:Topic)
+    WHERE toLower(t.name) CONTAINS toLower($search)
+       OR any(word IN split(toLower($search), ' ')
+             WHERE toLower(t.name) CONTAINS word)
+    WITH t, 
+         CASE 
+             WHEN toLower(t.name) = toLower($search) THEN 1.0
+             WHEN toLower(t.name) CONTAINS toLower($search) THEN 0.8
+             ELSE 0.5 
+         END as matchScore
+    WHERE matchScore >= $min_relevance
+    RETURN {
+        topic: t.name,
+        relevance: COALESCE(t.relevance, 0.0),
+        matchScore: matchScore,
+        relatedConceptsCount: """ + _CONCEPT_COUNT + """,
+        topConcepts: COALESCE(t.topConcepts, [])
+    } as result
+    ORDER BY matchScore DESC, COALESCE(t.relevance, 0.0) DESC, t.name
+"""
+
+SEARCH_TOPICS_FULLTEXT_QUERY = """
+    CALL db.index.fulltext.queryNodes($index, $terms) YIELD node AS t, score
+    WITH t, score,
+         CASE 
+             WHEN toLower(t.name) = toLower($search) THEN 1.0
+             WHEN toLower(t.name) CONTAINS toLower($search) THEN 0.8
+             ELSE 0.5 
+         END as matchScore
+    WHERE matchScore >= $min_relevance
+    RETURN {
+        topic: t.name,
+        relevance: COALESCE(t.relevance, 0.0),
+        matchScore: matchScore,
+        relatedConceptsCount: """ + _CONCEPT_COUNT + """,
+        topConcepts: COALESCE(t.topConcepts, [])
+    } as result
+    ORDER BY matchScore DESC, score DESC, COALESCE(t.relevance, 0.0) DESC, t.name
+"""
+
+# Search results one page at a time: rows after the keyset cursor $after
+# (the sort key of the previous page's last row, or null) up to $limit.
+# Relevance and name break ties so the order is total; the unpaged queries
+# sort the same way, so pages add up to their results
+SEARCH_TOPICS_PAGE_QUERY = """
+    MATCH (t:Topic)
+    WHERE toLower(t.name) CONTAINS toLower($search)
+       OR any(word IN split(toLower($search), ' ')
+             WHERE toLower(t.name) CONTAINS word)
+    WITH t, COALESCE(t.relevance, 0.0) as relevance,
+         CASE 
+             WHEN toLower(t.name) = toLower($search) THEN 1.0
+             WHEN toLower(t.name) CONTAINS toLower($search) THEN 0.8
+             ELSE 0.5 
+         END as matchScore
+    WHERE matchScore >= $min_relevance
+      AND ($after IS NULL
+           OR matchScore < $after.matchScore
+           OR (matchScore = $after.matchScore AND relevance < $after.relevance)
+           OR (matchScore = $after.matchScore AND relevance = $after.relevance AND t.name > $after.topic))
+    WITH t, relevance, matchScore
+    ORDER BY matchScore DESC, relevance DESC, t.name
+    LIMIT $limit
+    RETURN {
+        topic: t.name,
+        relevance: relevance,
+        matchScore: matchScore,
+        relatedConceptsCount: """ + _CONCEPT_COUNT + """,
+        topConcepts: COALESCE(t.topConcepts, [])
+    } as result,
+    {matchScore: matchScore, relevance: relevance, topic: t.name} as cursor
+    ORDER BY matchScore DESC, relevance DESC, t.name
+"""
+
+SEARCH_TOPICS_FULLTEXT_PAGE_QUERY = """
+    CALL db.index.fulltext.queryNodes($index, $terms) YIELD node AS t, score
+    WITH t, score, COALESCE(t.relevance, 0.0) as relevance,
+         CASE 
+             WHEN toLower(t.name) = toLower($search) THEN 1.0
+             WHEN toLower(t.name) CONTAINS toLower($search) THEN 0.8
+             ELSE 0.5 
+         END as matchScore
+    WHERE matchScore >= $min_relevance
+      AND ($after IS NULL
+           OR matchScore < $after.matchScore
+           OR (matchScore = $after.matchScore AND score < $after.score)
+           OR (matchScore = $after.matchScore AND score = $after.score AND relevance < $after.relevance)
+           OR (matchScore = $after.matchScore AND score = $after.score AND relevance = $after.relevance
+               AND t.name > $after.topic))
+    WITH t, score, relevance, matchScore
+    ORDER BY matchScore DESC, score DESC, relevance DESC, t.name
+    LIMIT $limit
+    RETURN {
+        topic: t.name,
+        relevance: relevance,
+        matchScore: matchScore,
+        relatedConceptsCount: """ + _CONCEPT_COUNT + """,
+        topConcepts: COALESCE(t.topConcepts, [])
+    } as result,
+    {matchScore: matchScore, score: score, relevance: relevance, topic: t.name} as cursor
+    ORDER BY matchScore DESC, score DESC, relevance DESC, t.name
+"""
+
+# Connections of concept c, strongest first, capped at $max_connections on
+# the server (OPTIONAL MATCH keeps one all-null entry for isolated concepts)
+_CONCEPT_CONNECTIONS = """
+        CALL {
+            WITH c
+            OPTIONAL MATCH (c)-[rel:RELATED|ACTION]-(other:Concept)
+            WITH DISTINCT other.name as otherConcept, TYPE(rel) as relationType,
+                 COALESCE(rel.weight, 1.0) as relationWeight
+            ORDER BY relationWeight DESC
+            LIMIT $max_connections
+            RETURN COLLECT({
+                otherConcept: otherConcept,
+                relationType: relationType,
+                relationWeight: relationWeight
+            }) as connections
+        }
+"""
+
+# The topic lookup and the concept fetch in one round trip: no row means the
+# topic does not exist, otherwise the top concepts come back as a list.
+# $after is a keyset cursor ({weight, concept, type} of the previous page's
+# last concept) or null for the first page
+TOPIC_CONCEPTS_QUERY = """
+    MATCH (t:Topic {name: $topic})
+    CALL {
+        WITH t
+        MATCH (t)-[r:RELATED_TO]->(c:Concept)
+        WHERE r.weight >= $min_weight
+          AND ($after IS NULL
+               OR r.weight < $after.weight
+               OR (r.weight = $after.weight AND c.name > $after.concept)
+               OR (r.weight = $after.weight AND c.name = $after.concept
+                   AND COALESCE(c.type, '') > $after.type))
+        WITH c, r
+        ORDER BY r.weight DESC, c.name, COALESCE(c.type, '')
+        LIMIT $limit
+""" + _CONCEPT_CONNECTIONS + """
+        WITH c, r, connections
+        ORDER BY r.weight DESC, c.name, COALESCE(c.type, '')
+        RETURN COLLECT({
+            concept: c.name,
+            type: c.type,
+            topicRelationWeight: r.weight,
+            contextSimilarity: r.contextSimilarity,
+            connections: connections
+        }) as concepts
+    }
+    RETURN t.relevance as relevance, concepts
+"""
+
+# Every concept of a topic as its own row, for streaming
+TOPIC_CONCEPTS_STREAM_QUERY = """
+    MATCH (t:Topic {name: $topic})-[r:RELATED_TO]->(c:Concept)
+    WHERE r.weight >= $min_weight
+""" + _CONCEPT_CONNECTIONS + """
+    RETURN {
+        concept: c.name,
+        type: c.type,
+        topicRelationWeight: r.weight,
+        contextSimilarity: r.contextSimilarity,
+        connections: connections
+    } as concept
+    ORDER BY r.weight DESC, c.name, COALESCE(c.type, '')
+"""
+
+CONCEPT_NETWORK_QUERY = """
+    MATCH (t:Topic {name: $topic})-[r1:RELATED_TO]->(c:Concept {name: $concept})
+    CALL {
+        WITH c
+        OPTIONAL MATCH (c)-[r2]-(connected:Concept)
+        WITH DISTINCT connected.name as concept, connected.type as type,
+             TYPE(r2) as relationshipType, properties(r2) as props
+        LIMIT $max_connections
+        RETURN COLLECT({
+            concept: concept,
+            type: type,
+            relationshipType: relationshipType,
+            properties: props
+        }) as connections
+    }
+    RETURN {
+        concept: c.name,
+        type: c.type,
+        topicRelation: {
+            weight: r1.weight,
+            contextSimilarity: r1.contextSimilarity
+        },
+        connections: connections
+    } as result
+"""
+
+# Constant-time reads of what Neo4jConnector materializes: the topic count
+# comes from the count store, the average from GraphMeta.topicConceptTotal
+# and the top topics from the Topic.conceptCount index (topics without the
+# property yet are left out; see rebuild_topic_summaries)
+TOPIC_STATISTICS_QUERY = """
+    MATCH (t:Topic)
+    WITH COUNT(t) as totalTopics
+    OPTIONAL MATCH (m:GraphMeta {name: 'graph'})
+    CALL {
+        MATCH (t:Topic)
+        WHERE t.conceptCount IS NOT NULL
+        WITH t
+        ORDER BY t.conceptCount DESC, t.name
+        LIMIT $top_k
+        RETURN COLLECT({
+            topic: t.name,
+            conceptCount: t.conceptCount,
+            relevance: t.relevance
+        }) as topTopics
+    }
+    RETURN {
+        totalTopics: totalTopics,
+        averageConceptsPerTopic: CASE WHEN totalTopics = 0 THEN null
+                                      ELSE toFloat(m.topicConceptTotal) / totalTopics END,
+        topTopics: topTopics
+    } as stats
+"""
+
+def topic_search_query(search_term: str, mode: str, paged: bool = False):
+    """
+    The Cypher and extra parameters for a topic search, or None when a
+    full-text search has no usable words.
+    """
+    if mode == "fulltext":
+        query = fulltext_query(search_term)
+        if not query:
+            return None
+        cypher = SEARCH_TOPICS_FULLTEXT_PAGE_QUERY if paged else SEARCH_TOPICS_FULLTEXT_QUERY
+        return cypher, {"index": TOPIC_FULLTEXT_INDEX, "terms": query}
+    if mode == "contains":
+        return (SEARCH_TOPICS_PAGE_QUERY if paged else SEARCH_TOPICS_QUERY), {}
+    raise ValueError(f"Unknown search mode: {mode}")
+
+def topic_page_result(records, page_size: int) -> Dict:
+    """Shape SEARCH_TOPICS_*_PAGE_QUERY records into a page with the cursor of the next one."""
+    results = [dict(record["result"]) for record in records]
+    next_cursor = dict(records[-1]["cursor"]) if len(records) == page_size else None
+    return {"results": results, "nextCursor": next_cursor}
+
+def topic_concepts_result(topic_name: str, record, page_size: Optional[int] = None) -> Dict:
+    """
+    Shape a TOPIC_CONCEPTS_QUERY record (or its absence) into the public
+    result; with ``page_size`` it also carries the cursor of the next page.
+    """
+    if not record:
+        return {"error": f"Topic '{topic_name}' not found"}
+    result = {
+        "topic": topic_name,
+        "topicRelevance": record["relevance"],
+        "relatedConcepts": [dict(concept) for concept in record["concepts"]]
+    }
+    if page_size is not None:
+        concepts = result["relatedConcepts"]
+        result["nextCursor"] = concept_cursor(concepts[-1]) if len(concepts) == page_size else None
+    return result
+
+def concept_network_result(record) -> Optional[Dict]:
+    """Shape a CONCEPT_NETWORK_QUERY record, without the relationships' internal properties."""
+    if not record:
+        return None
+    result = dict(record["result"])
+    result["connections"] = [
+        dict(connection, properties=None if connection["properties"] is None else
+             {name: value for name, value in connection["properties"].items() if name not in INTERNAL_PROPERTIES})
+        for connection in result["connections"]
+    ]
+    return result
+
+def concept_cursor(concept: Dict) -> Dict:
+    """Keyset cursor resuming a topic's concept list after ``concept``."""
+    return {"weight": concept["topicRelationWeight"], "concept": concept["concept"],
+            "type": concept["type"] or ""}
+
+def _cached(method):
+    """
+    Serve the method's results from the searcher's query cache when enabled.
+    The key is the method name plus its arguments (with defaults applied).
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None:
+            return method(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple((name, _freeze(value)) for name, value in bound.arguments.items())[1:]
+        version = self.graph_version()
+        hit, value = self.cache.get(key, version)
+        if not hit:
+            value = method(self, *args, **kwargs)
+            self.cache.put(key, version, value)
+        # Callers get their own copy so they cannot alter cached results
+        return copy.deepcopy(value)
+
+    return wrapper
+
+def _freeze(value):
+    """Hashable stand-in for an argument (cursors are dicts)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
 
 class Neo4jSearcher:
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(self, uri: str, user: str, password: str,
+                 cache_size: int = 0, cache_ttl: Optional[float] = 300.0,
+                 version_check_interval: float = 0.0):
+        """
+        Args:
+            cache_size: Maximum cached query results; 0 disables the cache.
+            cache_ttl: Seconds a cached result stays valid (None for no expiry).
+            version_check_interval: Seconds to reuse the last seen graph version
+                before asking the database again. 0 checks on every call, so a
+                finished ingestion is never missed.
+        """
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
         self.logger = logging.getLogger(__name__)
+        self.cache = QueryCache(max_entries=cache_size, ttl=cache_ttl) if cache_size else None
+        self.version_check_interval = version_check_interval
+        self._version = None
+        self._version_checked_at = 0.0
 
     def close(self):
         self.driver.close()
 
-    def search_topics(self, search_term: str, min_relevance: float = 0.3) -> List[Dict]:
+    def graph_version(self) -> int:
+        """Current ingestion counter maintained by Neo4jConnector."""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self.version_check_interval:
+            with self.driver.session() as session:
+                record = session.run(GRAPH_VERSION_READ).single()
+            self._version = record["version"] if record else 0
+            self._version_checked_at = now
+        return self._version
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the query cache (empty when caching is disabled)."""
+        return self.cache.stats() if self.cache else {}
+
+    @_cached
+    def search_topics(self, search_term: str, min_relevance: float = 0.3,
+                      mode: str = "contains", limit: Optional[int] = None) -> List[Dict]:
         """
         Search for topics that match the search term using native Neo4j string operations.
+
+        With ``mode="fulltext"`` candidates come from the topic full-text index
+        (see ``neo4j_schema``) instead of a scan over every topic; each search
+        word matches as a prefix. ``limit`` returns only the best matches.
         """
+        if limit is not None:
+            return self.search_topics_page(search_term, min_relevance, mode, page_size=limit)["results"]
+        query = topic_search_query(search_term, mode)
+        if query is None:
+            return []
+        cypher, params = query
+
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (t:Topic)
-                WHERE toLower(t.name) CONTAINS toLower($search)
-                   OR any(word IN split(toLower($search), ' ')
-                         WHERE toLower(t.name) CONTAINS word)
-                WITH t, 
-                     CASE 
-                         WHEN toLower(t.name) = toLower($search) THEN 1.0
-                         WHEN toLower(t.name) CONTAINS toLower($search) THEN 0.8
-                         ELSE 0.5 
-                     END as matchScore
-                WHERE matchScore >= $min_relevance
-                OPTIONAL MATCH (t)-[r:RELATED_TO]->(c:Concept)
-                WITH t, matchScore, COUNT(DISTINCT c) as conceptCount
-                RETURN {
-                    topic: t.name,
-                    relevance: COALESCE(t.relevance, 0.0),
-                    matchScore: matchScore,
-                    relatedConceptsCount: conceptCount
-                } as result
-                ORDER BY matchScore DESC, t.relevance DESC
-            """, search=search_term, min_relevance=min_relevance)
+            result = session.run(cypher, search=search_term, min_relevance=min_relevance, **params)
             
             return [dict(record["result"]) for record in result]
 
+    @_cached
+    def search_topics_page(self, search_term: str, min_relevance: float = 0.3,
+                           mode: str = "contains", page_size: int = 50,
+                           cursor: Optional[Dict] = None) -> Dict:
+        """
+        One page of ``search_topics`` results. Pass the returned
+        ``nextCursor`` back as ``cursor`` for the following page; it is None
+        after the last page. Pages are found by keyset rather than offset, so
+        later pages cost no more than the first.
+        """
+        query = topic_search_query(search_term, mode, paged=True)
+        if query is None:
+            return {"results": [], "nextCursor": None}
+        cypher, params = query
+
+        with self.driver.session() as session:
+            result = session.run(cypher, search=search_term, min_relevance=min_relevance,
+                                 after=cursor, limit=page_size, **params)
+            return topic_page_result(list(result), page_size)
+
+    def iter_topics(self, search_term: str, min_relevance: float = 0.3,
+                    mode: str = "contains", fetch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Yield ``search_topics`` results one at a time as the driver receives
+        them, ``fetch_size`` records per network round trip. The session stays
+        open until the generator is exhausted or closed.
+        """
+        query = topic_search_query(search_term, mode)
+        if query is None:
+            return
+        cypher, params = query
+
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(cypher, search=search_term, min_relevance=min_relevance, **params)
+            for record in result:
+                yield dict(record["result"])
+
+    @_cached
     def get_topic_concepts(self, topic_name: str, 
                           min_weight: float = 0.3, 
-                          limit: int = 20) -> Dict:
+                          limit: int = 20,
+                          max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
         """
         Get all concepts related to a specific topic with their relationships.
+        The topic existence check is part of the same query. Each concept
+        lists at most ``max_connections`` connections, strongest first.
         """
         with self.driver.session() as session:
-            # First verify topic exists
-            topic_check = session.run("""
-                MATCH (t:Topic {name: $topic})
-                RETURN t.relevance as relevance
-            """, topic=topic_name)
+            result = session.run(TOPIC_CONCEPTS_QUERY, topic=topic_name, min_weight=min_weight,
+                                 limit=limit, max_connections=max_connections, after=None)
             
-            topic_data = topic_check.single()
-            if not topic_data:
-                return {"error": f"Topic '{topic_name}' not found"}
-
-            # Get related concepts with their relationships
-            result = session.run("""
-                MATCH (t:Topic {name: $topic})-[r:RELATED_TO]->(c:Concept)
-                WHERE r.weight >= $min_weight
-                WITH c, r
-                OPTIONAL MATCH (c)-[rel:RELATED|ACTION]-(other:Concept)
-                WITH c, r, 
-                     COLLECT(DISTINCT {
-                         otherConcept: other.name,
-                         relationType: TYPE(rel),
-                         relationWeight: COALESCE(rel.weight, 1.0)
-                     }) as connections
-                RETURN {
-                    concept: c.name,
-                    type: c.type,
-                    topicRelationWeight: r.weight,
-                    contextSimilarity: r.contextSimilarity,
-                    connections: connections
-                } as result
-                ORDER BY r.weight DESC
-                LIMIT $limit
-            """, topic=topic_name, min_weight=min_weight, limit=limit)
-
-            concepts = [dict(record["result"]) for record in result]
-            
-            return {
-                "topic": topic_name,
-                "topicRelevance": topic_data["relevance"],
-                "relatedConcepts": concepts
-            }
+            return topic_concepts_result(topic_name, result.single())
+
+    @_cached
+    def get_topic_concepts_page(self, topic_name: str, min_weight: float = 0.3,
+                                page_size: int = 20, cursor: Optional[Dict] = None,
+                                max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
+        """
+        One page of a topic's concepts, like ``get_topic_concepts`` plus the
+        ``nextCursor`` to pass as ``cursor`` for the next page (None after
+        the last one).
+        """
+        with self.driver.session() as session:
+            result = session.run(TOPIC_CONCEPTS_QUERY, topic=topic_name, min_weight=min_weight,
+                                 limit=page_size, max_connections=max_connections, after=cursor)
+            return topic_concepts_result(topic_name, result.single(), page_size)
+
+    def iter_topic_concepts(self, topic_name: str, min_weight: float = 0.3,
+                            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                            fetch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Yield every concept of a topic (in ``get_topic_concepts`` order and
+        shape) as the driver receives it. Yields nothing for unknown topics.
+        """
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(TOPIC_CONCEPTS_STREAM_QUERY, topic=topic_name, min_weight=min_weight,
+                                 max_connections=max_connections)
+            for record in result:
+                yield dict(record["concept"])
 
-    def search_concept_network(self, topic_name: str, concept_name: str) -> Dict:
+    @_cached
+    def search_concept_network(self, topic_name: str, concept_name: str,
+                               max_connections: int = DEFAULT_MAX_CONNECTIONS) -> Dict:
         """
-        Get detailed information about a specific concept within a topic's context.
+        Get detailed information about a specific concept within a topic's
+        context, with at most ``max_connections`` connections.
         """
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (t:Topic {name: $topic})-[r1:RELATED_TO]->(c:Concept {name: $concept})
-                OPTIONAL MATCH (c)-[r2]-(connected:Concept)
-                WITH c, r1, 
-                     COLLECT(DISTINCT {
-                         concept: connected.name,
-                         type: connected.type,
-                         relationshipType: TYPE(r2),
-                         properties: properties(r2)
-                     }) as connections
-                RETURN {
-                    concept: c.name,
-                    type: c.type,
-                    topicRelation: {
-                        weight: r1.weight,
-                        contextSimilarity: r1.contextSimilarity
-                    },
-                    connections: connections
-                } as result
-            """, topic=topic_name, concept=concept_name)
+            result = session.run(CONCEPT_NETWORK_QUERY, topic=topic_name, concept=concept_name,
+                                 max_connections=max_connections)
             
-            record = result.single()
-            return dict(record["result"]) if record else None
+            return concept_network_result(result.single())
 
-    def get_topic_statistics(self) -> Dict:
+    @_cached
+    def get_topic_statistics(self, top_k: int = 5) -> Dict:
         """
-        Get general statistics about topics in the knowledge graph.
+        Get general statistics about topics in the knowledge graph, with the
+        ``top_k`` topics that have the most concepts.
         """
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (t:Topic)
-                OPTIONAL MATCH (t)-[r:RELATED_TO]->(c:Concept)
-                WITH t, COUNT(DISTINCT c) as conceptCount
-                RETURN {
-                    totalTopics: COUNT(t),
-                    averageConceptsPerTopic: AVG(conceptCount),
-                    topTopics: COLLECT({
-                        topic: t.name,
-                        conceptCount: conceptCount,
-                        relevance: t.relevance
-                    })[..5]
-                } as stats
-            """)
+            result = session.run(TOPIC_STATISTICS_QUERY, top_k=top_k)
             
             return dict(result.single()["stats"])
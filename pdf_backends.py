@@ -0,0 +1,165 @@
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import pdfplumber
+import PyPDF2
+from PyPDF2.generic import ContentStream
+
+# Speed/accuracy trade-offs selectable with ``get_backend``
+PDF_PROFILES = ("accurate", "fast")
+
+class PdfplumberBackend:
+    """
+    The ``accurate`` profile: pdfplumber's layout-aware text on every page.
+
+    Table extraction only runs on pages that have both horizontal and
+    vertical ruling lines. pdfplumber's default (``lines``) table strategy
+    builds cells from exactly those edges, so skipping the other pages
+    finds the same tables.
+    """
+
+    def open(self, pdf_path):
+        return pdfplumber.open(pdf_path)
+
+    def close(self, pdf):
+        pdf.close()
+
+    def page_count(self, pdf):
+        return len(pdf.pages)
+
+    def read_page(self, pdf, number):
+        """``(text, tables, table_scanned)`` of page ``number`` of an opened PDF."""
+        page = pdf.pages[number]
+        text = page.extract_text() or ""
+        scan = _has_ruling_grid(page)
+        tables = page.extract_tables() if scan else []
+        # Drop the parsed layout objects of the finished page
+        page.close()
+        return text, tables, scan
+
+class FastBackend:
+    """
+    The ``fast`` profile: PyPDF2 text extraction, which skips pdfminer's
+    layout analysis entirely.
+
+    Each page's content stream is scanned for path-drawing operators; only
+    pages drawing at least ``min_ruling_lines`` line segments (rectangles
+    count as four) are opened with pdfplumber to extract tables.
+    """
+
+    def __init__(self, min_ruling_lines=6):
+        self.min_ruling_lines = min_ruling_lines
+
+    def open(self, pdf_path):
+        return _FastDocument(pdf_path)
+
+    def close(self, document):
+        if document.plumber is not None:
+            document.plumber.close()
+
+    def page_count(self, document):
+        return len(document.reader.pages)
+
+    def read_page(self, document, number):
+        """``(text, tables, table_scanned)`` of page ``number`` of an opened PDF."""
+        page = document.reader.pages[number]
+        text = page.extract_text() or ""
+        tables = []
+        scan = self._ruling_segments(page) >= self.min_ruling_lines
+        if scan:
+            # Opened on the first page that needs it, then kept for the others
+            if document.plumber is None:
+                document.plumber = pdfplumber.open(document.path)
+            plumber_page = document.plumber.pages[number]
+            tables = plumber_page.extract_tables()
+            plumber_page.close()
+        return text, tables, scan
+
+    @staticmethod
+    def _ruling_segments(page):
+        contents = page.get_contents()
+        if contents is None:
+            return 0
+        if not isinstance(contents, ContentStream):
+            contents = ContentStream(contents, page.pdf)
+        segments = 0
+        for _, operator in contents.operations:
+            if operator == b"l":
+                segments += 1
+            elif operator == b"re":
+                segments += 4
+        return segments
+
+class _FastDocument:
+    """A PDF opened by ``FastBackend``: the PyPDF2 reader and, once needed, pdfplumber."""
+
+    def __init__(self, pdf_path):
+        self.path = pdf_path
+        self.reader = PyPDF2.PdfReader(pdf_path)
+        self.plumber = None
+
+def get_backend(profile="accurate"):
+    if profile == "accurate":
+        return PdfplumberBackend()
+    if profile == "fast":
+        return FastBackend()
+    raise ValueError(f"Unknown PDF profile: {profile}")
+
+def iter_pages(backend, pdf_path, page_workers=1, pages_per_task=8):
+    """
+    Yield ``(text, tables, table_scanned)`` for each page in order.
+
+    The PDF is opened once and read page by page. With ``page_workers`` > 1
+    the pages are read in that many processes, each holding its own open
+    copy of the file, ``pages_per_task`` consecutive pages per task. Only
+    two tasks per worker are in flight at a time, so a slow consumer keeps
+    memory bounded; results are still yielded in page order.
+    """
+    document = backend.open(pdf_path)
+    try:
+        page_count = backend.page_count(document)
+        if page_workers <= 1 or page_count <= pages_per_task:
+            for number in range(page_count):
+                yield backend.read_page(document, number)
+            return
+    finally:
+        backend.close(document)
+
+    batches = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+    workers = min(page_workers, len(batches))
+    logging.getLogger(__name__).debug(f"Reading {page_count} pages of {pdf_path} in {len(batches)} tasks")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_in_worker,
+                             initargs=(backend, pdf_path)) as pool:
+        batches = iter(batches)
+        pending = deque(pool.submit(_read_in_worker, start, stop)
+                        for start, stop in islice(batches, 2 * workers))
+        while pending:
+            pages = pending.popleft().result()
+            for start, stop in islice(batches, 1):
+                pending.append(pool.submit(_read_in_worker, start, stop))
+            yield from pages
+
+# The PDF opened once per page-reading worker process
+_worker_backend = None
+_worker_document = None
+
+def _open_in_worker(backend, pdf_path):
+    global _worker_backend, _worker_document
+    _worker_backend = backend
+    _worker_document = backend.open(pdf_path)
+
+def _read_in_worker(start, stop):
+    return [_worker_backend.read_page(_worker_document, number) for number in range(start, stop)]
+
+def _has_ruling_grid(page):
+    """Whether the page has both horizontal and vertical edges to build table cells from."""
+    horizontal = vertical = False
+    for edge in page.edges:
+        if edge["orientation"] == "h":
+            horizontal = True
+        else:
+            vertical = True
+        if horizontal and vertical:
+            return True
+    return False
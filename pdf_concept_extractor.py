@@ -1,141 +1,446 @@
-import PyPDF2
+import re
 import spacy
 import numpy as np
 import pandas as pd
 from collections import Counter, defaultdict
-from sklearn.feature_extraction.text import TfidfVectorizer
 from keybert import KeyBERT
-import pdfplumber
 import networkx as nx
-from itertools import combinations
+from itertools import combinations, islice
+from similarity import embed_texts, similar_pairs
+from keyword_extraction import KeywordExtractor
+from topic_model import CorpusTopicModel
+from pdf_backends import get_backend, iter_pages
+from concept_records import EntityContexts, NounChunkRelation, SentenceTable, SubjectObject
+from instrumentation import get_instrumentation, timed_stage
 
-def extract_concepts_from_pdf(pdf_path):
+# Places where a streamed chunk may end: sentence punctuation followed by whitespace
+_SENTENCE_END = re.compile(r'[.!?]\s')
+
+class ConceptExtractor:
     """
-    Extract key concepts from a PDF document, including tables, and analyze relationships.
-    No Java dependency required.
+    Long-lived concept extraction engine.
+
+    Owns the spaCy pipeline and the KeyBERT model so they are loaded once per
+    process and reused for every document. The loaded ``nlp`` object can be
+    shared with other components such as ``Neo4jConnector``.
     """
-    # Load NLP models
-    nlp = spacy.load("en_core_web_sm")
-    kw_model = KeyBERT()
+
+    def __init__(self, model_name="en_core_web_sm", nlp=None, kw_model=None,
+                 similarity_top_k=None, similarity_block_size=1024,
+                 chunk_size=None, nlp_batch_size=4, keyword_diversity="maxsum",
+                 table_key_columns=None, max_column_pairs=None, max_chunk_distance=None,
+                 pdf_profile="accurate", page_workers=1, topic_model=None):
+        # Load NLP models (or reuse ones that were already loaded)
+        self.nlp = nlp if nlp is not None else spacy.load(model_name)
+        self.kw_model = kw_model if kw_model is not None else KeyBERT()
+        # Batched keyword scoring with phrase embeddings cached across documents
+        self.keyword_extractor = KeywordExtractor(self.kw_model, diversity=keyword_diversity)
+        # PDF reading: "accurate" (pdfplumber) or "fast" (PyPDF2 text, tables
+        # only on pages with ruling lines), pages read by this many processes
+        self.pdf_backend = get_backend(pdf_profile)
+        self.page_workers = page_workers
+        # Table column pairs: only pairs involving the first N columns, and at
+        # most this many pairs per table (None considers every pair)
+        self.table_key_columns = table_key_columns
+        self.max_column_pairs = max_column_pairs
+        # Noun-chunk relationships: only relate chunks at most this many chunks
+        # apart within a sentence (None relates every pair)
+        self.max_chunk_distance = max_chunk_distance
+        # Semantic similarity: optional per-entity cap and rows per matrix block
+        self.similarity_top_k = similarity_top_k
+        self.similarity_block_size = similarity_block_size
+        # Streaming mode: characters per sentence-aligned chunk (None parses the
+        # whole document at once) and chunks per nlp.pipe batch
+        self.chunk_size = chunk_size
+        self.nlp_batch_size = nlp_batch_size
+        # Topics are scored against the document frequencies of every document
+        # this model has seen; pass a loaded CorpusTopicModel to persist them
+        self.topic_model = topic_model if topic_model is not None else CorpusTopicModel()
+
+    def extract(self, pdf_path):
+        """
+        Extract key concepts from a PDF document, including tables, and analyze relationships.
+        No Java dependency required.
+        """
+        try:
+            if self.chunk_size:
+                return self.extract_streaming(pdf_path)
+            text, tables = self.extract_text_and_tables(pdf_path)
+            return self.extract_from_text(text, tables)
+            
+        except Exception as e:
+            print(f"Error processing PDF: {str(e)}")
+            return None
+
+    def extract_from_text(self, text, tables=()):
+        """
+        Run every extraction stage over already extracted text and tables.
+        The text is parsed by spaCy exactly once and the resulting Doc is
+        shared by the entity, relationship and noun-chunk stages.
+        """
+        metrics = get_instrumentation()
+        metrics.count("characters", len(text))
+        with metrics.stage("parse"):
+            doc = self.nlp(text)
+        
+        # Context sentences are stored once and shared by every stage's records
+        sentences = SentenceTable()
+        entities, entity_contexts = self.extract_entities(doc, sentences)
+        context_vectors = self.compute_context_vectors(doc)
+        
+        general_relationships, concept_graph = self.analyze_relationships(doc, entities)
+        specific_relationships = self.extract_concept_relationships(doc, sentences)
+        
+        return self._build_concepts(text, tables, entities, entity_contexts, context_vectors,
+                                    general_relationships, concept_graph, specific_relationships)
+
+    def extract_streaming(self, pdf_path):
+        """
+        Extract concepts page by page in sentence-aligned chunks.
+
+        Chunks go through ``nlp.pipe`` in batches of ``nlp_batch_size`` and
+        entity counts, contexts and relationships are merged as each chunk
+        is parsed, so only a few chunks are ever held as spaCy Docs. The raw
+        text is still kept for the document-level keyword and topic stages.
+        """
+        metrics = get_instrumentation()
+        text_parts = []
+        tables = []
+        entities = {}
+        sentences = SentenceTable()
+        entity_contexts = EntityContexts(sentences)
+        context_sums = {}
+        context_tokens = Counter()
+        cooccurrence = []
+        syntactic = []
+        specific_relationships = defaultdict(list)
+        
+        def chunks():
+            for chunk_text, chunk_tables in self.iter_text_chunks(pdf_path):
+                text_parts.append(chunk_text)
+                tables.extend(chunk_tables)
+                yield chunk_text
+        
+        # Reading pages and parsing overlap here, so they are timed as one stage
+        docs = self.nlp.pipe(chunks(), batch_size=self.nlp_batch_size)
+        while True:
+            with metrics.stage("read_and_parse"):
+                doc = next(docs, None)
+            if doc is None:
+                break
+            metrics.count("chunks")
+            metrics.count("characters", len(doc.text))
+            chunk_entities, chunk_contexts = self.extract_entities(doc, sentences)
+            for label, counts in chunk_entities.items():
+                entities.setdefault(label, Counter()).update(counts)
+            entity_contexts.merge(chunk_contexts)
+            
+            sums, tokens = self._context_vector_sums(doc)
+            for entity, vector in sums.items():
+                context_sums[entity] = context_sums[entity] + vector if entity in context_sums else vector
+            context_tokens.update(tokens)
+            
+            cooccurrence.extend(self.cooccurrence_relationships(doc))
+            syntactic.extend(self.syntactic_relationships(doc))
+            for rel_type, rels in self.extract_concept_relationships(doc, sentences).items():
+                specific_relationships[rel_type].extend(rels)
+        
+        entities = {label: dict(counts) for label, counts in entities.items()}
+        context_vectors = {entity: context_sums[entity] / context_tokens[entity] for entity in context_sums}
+        general_relationships, concept_graph = self._build_general_relationships(
+            cooccurrence, self.semantic_relationships(entities), syntactic)
+        
+        return self._build_concepts("".join(text_parts), tables, entities, entity_contexts, context_vectors,
+                                    general_relationships, concept_graph, specific_relationships)
+
+    def _build_concepts(self, text, tables, entities, entity_contexts, context_vectors,
+                        general_relationships, concept_graph, specific_relationships):
+        # The document text and every table are scored in one batch
+        with get_instrumentation().stage("keywords"):
+            keywords, *table_keywords = self.keyword_extractor.extract(
+                [text] + [table.to_string() for table in tables])
+        table_concepts, column_relationships = self.process_table_content(tables, table_keywords)
+        topic_terms = self.extract_topic_terms(text)
+        
+        concepts = {
+            'named_entities': entities,
+            'entity_contexts': entity_contexts,
+            'context_vectors': context_vectors,
+            'keywords': keywords,
+            'topics': self.topic_model.score(topic_terms),
+            'topic_terms': topic_terms,
+            'table_concepts': table_concepts,
+            'column_relationships': column_relationships,
+            'general_relationships': general_relationships,
+            'specific_relationships': specific_relationships,
+            'concept_graph': concept_graph
+        }
+        
+        return concepts
+
+    def extract_many(self, pdf_paths):
+        """
+        Extract concepts from several PDFs with the same warmed models.
+
+        Yields ``(pdf_path, concepts)`` pairs; ``concepts`` is None for files
+        that failed, exactly as with ``extract``.
+        """
+        for pdf_path in pdf_paths:
+            yield pdf_path, self.extract(pdf_path)
+
+    @timed_stage("pdf_read")
+    def extract_text_and_tables(self, pdf_path):
+        """Extract both regular text and tabular data from PDF using the configured backend"""
+        text_parts = []
+        tables = []
+        
+        for page_text, page_tables in self.iter_pages(pdf_path):
+            text_parts.append(page_text)
+            tables.extend(page_tables)
+        
+        return "".join(text_parts), tables
+    
+    def iter_pages(self, pdf_path):
+        """Yield ``(text, tables)`` for each page of the PDF, in page order"""
+        metrics = get_instrumentation()
+        for text, tables_on_page, table_scanned in iter_pages(self.pdf_backend, pdf_path, self.page_workers):
+            metrics.count("pages")
+            metrics.count("pages_table_scanned", int(table_scanned))
+            tables = []
+            for table in tables_on_page:
+                # Convert to pandas DataFrame
+                if table:
+                    cleaned_table = [[str(cell).strip() if cell is not None else ""
+                                      for cell in row] for row in table]
+                    header = _clean_headers(cleaned_table[0])
+                    data = cleaned_table[1:]
+                    df = pd.DataFrame(data, columns=header)
+                    tables.append(df)
+            
+            yield text, tables
     
-    def extract_text_and_tables(pdf_path):
-        """Extract both regular text and tabular data from PDF using pdfplumber"""
-        text = ""
+    def iter_text_chunks(self, pdf_path):
+        """
+        Yield ``(text, tables)`` chunks of roughly ``chunk_size`` characters.
+        Chunks end at a sentence boundary where one exists, and joining all
+        chunk texts gives back the full document text.
+        """
+        buffer = ""
         tables = []
         
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                # Extract text
-                text += page.extract_text() or ""
-                
-                # Extract tables
-                tables_on_page = page.extract_tables()
-                if tables_on_page:
-                    for table in tables_on_page:
-                        # Convert to pandas DataFrame
-                        if table:
-                            cleaned_table = [[str(cell).strip() if cell is not None else "" 
-                                              for cell in row] for row in table]
-                            header = cleaned_table[0]
-                            data = cleaned_table[1:]
-                            df = pd.DataFrame(data, columns=header)
-                            tables.append(df)
+        for page_text, page_tables in self.iter_pages(pdf_path):
+            buffer += page_text
+            tables.extend(page_tables)
+            while len(buffer) >= self.chunk_size:
+                cut = _chunk_boundary(buffer, self.chunk_size)
+                yield buffer[:cut], tables
+                buffer = buffer[cut:]
+                tables = []
         
-        return text, tables
+        if buffer or tables:
+            yield buffer, tables
     
-    def process_table_content(tables):
-        """Extract concepts from tabular data"""
+    @timed_stage("tables")
+    def process_table_content(self, tables, table_keywords=None):
+        """
+        Extract concepts from tabular data. ``table_keywords`` are the
+        per-table keyword dicts when they were already extracted in a batch.
+        """
+        get_instrumentation().count("tables", len(tables))
         table_concepts = []
-        column_relationships = defaultdict(list)
+        pair_counts = defaultdict(Counter)
         
-        for table in tables:
-            table_text = table.to_string()
-            table_concepts.extend(extract_keywords(table_text, kw_model))
-            
-            for col1, col2 in combinations(table.columns, 2):
-                try:
-                    pairs = zip(table[col1].dropna(), table[col2].dropna())
-                    for val1, val2 in pairs:
-                        if isinstance(val1, str) and isinstance(val2, str):
-                            column_relationships[f"{col1}_{col2}"].append((val1, val2))
-                except:
-                    continue
+        if table_keywords is None:
+            table_keywords = self.keyword_extractor.extract(table.to_string() for table in tables)
+        
+        for table, keywords in zip(tables, table_keywords):
+            table_concepts.extend(keywords)
+            # Tables with the same headers add up to one count per value pair
+            for columns, pairs in self.table_column_relationships(table).items():
+                for val1, val2, count in pairs:
+                    pair_counts[columns][(val1, val2)] += count
         
+        column_relationships = defaultdict(list)
+        for columns, counts in pair_counts.items():
+            column_relationships[columns] = [(val1, val2, count) for (val1, val2), count in counts.items()]
         return table_concepts, column_relationships
     
-    def extract_entities(text, nlp):
-        """Extract named entities with enhanced context"""
-        doc = nlp(text)
+    def table_column_relationships(self, table):
+        """
+        Value pairs that share a row, for every considered pair of columns.
+
+        Returns ``{(col1, col2): [(value1, value2, count), ...]}`` with each
+        distinct pair listed once. Only non-empty string cells take part.
+        Each column is factorized to integer codes once, so pairs are
+        combined and counted with NumPy instead of row by row.
+        """
+        table = table.set_axis(_clean_headers(table.columns), axis=1)
+        codes = {}
+        uniques = {}
+        for column in table.columns:
+            values = table[column]
+            is_text = _text_cells(values)
+            # Cells that are not text become NaN, which factorize codes as -1
+            codes[column], uniques[column] = pd.factorize(values.where(is_text))
+        
+        column_pairs = combinations(table.columns, 2)
+        if self.table_key_columns is not None:
+            key_columns = set(table.columns[:self.table_key_columns])
+            column_pairs = ((col1, col2) for col1, col2 in column_pairs
+                            if col1 in key_columns or col2 in key_columns)
+        column_pairs = list(islice(column_pairs, self.max_column_pairs))
+        get_instrumentation().count("column_pairs", len(column_pairs))
+        
+        relationships = {}
+        for col1, col2 in column_pairs:
+            codes1, codes2 = codes[col1], codes[col2]
+            both = (codes1 >= 0) & (codes2 >= 0)
+            if not both.any():
+                continue
+            width = len(uniques[col2])
+            combined, counts = np.unique(codes1[both].astype(np.int64) * width + codes2[both],
+                                         return_counts=True)
+            values1 = uniques[col1][combined // width]
+            values2 = uniques[col2][combined % width]
+            relationships[(col1, col2)] = [(val1, val2, int(count))
+                                           for val1, val2, count in zip(values1, values2, counts)]
+        
+        return relationships
+    
+    @timed_stage("entities")
+    def extract_entities(self, doc, sentences=None):
+        """
+        Extract named entities with enhanced context from a parsed Doc.
+        Context sentences go into ``sentences`` (a new table when not given).
+        """
+        get_instrumentation().count("entity_mentions", len(doc.ents))
         entities = {}
-        entity_contexts = defaultdict(list)
+        entity_contexts = EntityContexts(sentences if sentences is not None else SentenceTable())
+        sentence_ids = {}
         
         for ent in doc.ents:
             if ent.label_ not in entities:
                 entities[ent.label_] = []
             entities[ent.label_].append(ent.text)
             sent = ent.sent
-            entity_contexts[ent.text].append(sent.text)
+            if sent.start not in sentence_ids:
+                sentence_ids[sent.start] = entity_contexts.sentences.add(sent.text)
+            entity_contexts.add(ent.text, sentence_ids[sent.start])
         
         for label in entities:
             entities[label] = dict(Counter(entities[label]))
             
         return entities, entity_contexts
     
-    def analyze_relationships(doc, entities, threshold=0.5):
-        """Analyze relationships between concepts using various methods"""
-        relationships = defaultdict(list)
-        G = nx.Graph()
+    def compute_context_vectors(self, doc):
+        """
+        Vector of each entity's joined contexts, taken from the parsed Doc.
+        Averages the token vectors of every sentence the entity is mentioned
+        in, so the connector does not have to run the pipeline on the
+        contexts again.
+        """
+        sums, token_counts = self._context_vector_sums(doc)
+        return {text: sums[text] / token_counts[text] for text in sums}
+    
+    @timed_stage("context_vectors")
+    def _context_vector_sums(self, doc):
+        """Summed token vectors and token counts of each entity's context sentences"""
+        sums = {}
+        token_counts = Counter()
+        sent_sums = {}
         
+        for ent in doc.ents:
+            sent = ent.sent
+            if sent.start not in sent_sums:
+                sent_sums[sent.start] = sent.vector * len(sent)
+            if ent.text in sums:
+                sums[ent.text] = sums[ent.text] + sent_sums[sent.start]
+            else:
+                sums[ent.text] = sent_sums[sent.start].copy()
+            token_counts[ent.text] += len(sent)
+        
+        return sums, token_counts
+    
+    def analyze_relationships(self, doc, entities, threshold=0.5):
+        """Analyze relationships between concepts using various methods"""
+        return self._build_general_relationships(
+            self.cooccurrence_relationships(doc),
+            self.semantic_relationships(entities, threshold),
+            self.syntactic_relationships(doc)
+        )
+    
+    @timed_stage("cooccurrence")
+    def cooccurrence_relationships(self, doc):
+        """Pairs of different entities mentioned in the same sentence"""
+        pairs = []
         for sent in doc.sents:
             sent_entities = [ent.text for ent in sent.ents]
             for ent1, ent2 in combinations(sent_entities, 2):
                 if ent1 != ent2:
-                    G.add_edge(ent1, ent2, type='co-occurrence')
-                    relationships['co-occurrence'].append((ent1, ent2))
+                    pairs.append((ent1, ent2))
+        return pairs
+    
+    @timed_stage("semantic_similarity")
+    def semantic_relationships(self, entities, threshold=0.5):
+        """Pairs of entities whose vectors are more similar than ``threshold``"""
+        # Embed every distinct entity text once and compare them all in blocks
+        entity_texts = list(dict.fromkeys(
+            text for label_entities in entities.values() for text in label_entities
+        ))
+        vectors = embed_texts(self.nlp, entity_texts)
+        pairs = [(entity_texts[i], entity_texts[j], similarity)
+                 for i, j, similarity in similar_pairs(vectors, threshold,
+                                                       top_k=self.similarity_top_k,
+                                                       block_size=self.similarity_block_size)]
+        metrics = get_instrumentation()
+        metrics.count("distinct_entities", len(entity_texts))
+        metrics.count("pairs_compared", len(entity_texts) * (len(entity_texts) - 1) // 2)
+        metrics.count("semantic_pairs", len(pairs))
+        return pairs
+    
+    @timed_stage("syntactic")
+    def syntactic_relationships(self, doc):
+        """Head/dependent pairs for subject and object dependencies"""
+        return [(token.head.text, token.text, token.dep_)
+                for token in doc if token.dep_ in ['nsubj', 'dobj', 'pobj']]
+    
+    def _build_general_relationships(self, cooccurrence, semantic, syntactic):
+        relationships = defaultdict(list)
+        G = nx.Graph()
+        
+        for ent1, ent2 in cooccurrence:
+            G.add_edge(ent1, ent2, type='co-occurrence')
+            relationships['co-occurrence'].append((ent1, ent2))
         
-        for ent1, ent2 in combinations(entities.keys(), 2):
-            similarity = nlp(ent1).similarity(nlp(ent2))
-            if similarity > threshold:
-                G.add_edge(ent1, ent2, type='semantic', weight=similarity)
-                relationships['semantic'].append((ent1, ent2, similarity))
+        for ent1, ent2, similarity in semantic:
+            G.add_edge(ent1, ent2, type='semantic', weight=similarity)
+            relationships['semantic'].append((ent1, ent2, similarity))
         
-        for token in doc:
-            if token.dep_ in ['nsubj', 'dobj', 'pobj']:
-                head = token.head.text
-                dependent = token.text
-                relationships['syntactic'].append((head, dependent, token.dep_))
+        if syntactic:
+            relationships['syntactic'].extend(syntactic)
         
         return relationships, G
     
-    def extract_keywords(text, kw_model):
-        keywords = kw_model.extract_keywords(
-            text,
-            keyphrase_ngram_range=(1, 2),
-            stop_words='english',
-            use_maxsum=True,
-            nr_candidates=20,
-            top_n=10
-        )
-        return dict(keywords)
+    def extract_keywords(self, text):
+        return self.keyword_extractor.extract([text])[0]
     
-    def extract_topics(text):
-        vectorizer = TfidfVectorizer(
-            max_features=20,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        vectors = vectorizer.fit_transform([text])
-        feature_names = vectorizer.get_feature_names_out()
-        scores = vectors.toarray()[0]
-        
-        top_indices = scores.argsort()[-10:][::-1]
-        return {feature_names[i]: float(scores[i]) for i in top_indices}
+    @timed_stage("topics")
+    def extract_topic_terms(self, text):
+        return self.topic_model.document_terms(text)
+    
+    def extract_topics(self, text):
+        """Top topics of ``text`` by corpus TF-IDF; the document is added to the corpus."""
+        return self.topic_model.score(self.extract_topic_terms(text))
 
-    # New function for extracting concept relationships
-    def extract_concept_relationships(text, nlp):
-        """Extract explicit relationships between concepts using dependency parsing and semantic patterns."""
-        doc = nlp(text)
+    @timed_stage("concept_relationships")
+    def extract_concept_relationships(self, doc, sentences=None):
+        """
+        Extract explicit relationships between concepts using dependency parsing and semantic patterns.
+        Records reference their sentence in ``sentences`` (a new table when not given).
+        """
         relationships = defaultdict(list)
+        if sentences is None:
+            sentences = SentenceTable()
         
         def get_subject_object_pairs(sent):
             pairs = []
@@ -149,64 +454,119 @@ def extract_concepts_from_pdf(pdf_path):
                         elif child.dep_ in ["dobj", "pobj"]:
                             obj = child
                     if subj and obj:
-                        pairs.append({
-                            'subject': subj.text,
-                            'verb': token.text,
-                            'object': obj.text,
-                            'sentence': sent.text
-                        })
+                        pairs.append((subj.text, token.text, obj.text))
             return pairs
 
         def get_noun_chunk_relationships(sent):
             chunks = list(sent.noun_chunks)
+            if len(chunks) < 2:
+                return []
+            # connecting[prefix[i - sent.start]:prefix[j - sent.start]] are the
+            # VERB/ADP tokens in doc[i:j], so each chunk pair is a lookup
+            # instead of a rescan of the tokens between them
+            prefix = [0]
+            connecting = []
+            for token in sent:
+                if token.pos_ in ("VERB", "ADP"):
+                    connecting.append(token.text)
+                prefix.append(len(connecting))
+            distance = self.max_chunk_distance or len(chunks)
             rels = []
             for i, chunk1 in enumerate(chunks):
-                for chunk2 in chunks[i+1:]:
-                    if any(token.pos_ in ["VERB", "ADP"] for token in doc[chunk1.end:chunk2.start]):
-                        connecting_words = ' '.join(token.text for token in doc[chunk1.end:chunk2.start]
-                                                    if token.pos_ in ["VERB", "ADP"])
-                        rels.append({
-                            'entity1': chunk1.text,
-                            'relationship': connecting_words,
-                            'entity2': chunk2.text,
-                            'sentence': sent.text
-                        })
+                first = prefix[chunk1.end - sent.start]
+                for chunk2 in chunks[i+1:i+1+distance]:
+                    last = prefix[chunk2.start - sent.start]
+                    if last > first:
+                        rels.append((chunk1.text, ' '.join(connecting[first:last]), chunk2.text))
             return rels
 
         for sent in doc.sents:
-            relationships['subject_object'].extend(get_subject_object_pairs(sent))
-            relationships['noun_chunks'].extend(get_noun_chunk_relationships(sent))
+            pairs = get_subject_object_pairs(sent)
+            rels = get_noun_chunk_relationships(sent)
+            if not pairs and not rels:
+                continue
+            # Every record of the sentence references one shared copy of its text
+            sentence_id = sentences.add(sent.text)
+            relationships['subject_object'].extend(
+                SubjectObject(*pair, sentence_id=sentence_id, sentences=sentences) for pair in pairs)
+            relationships['noun_chunks'].extend(
+                NounChunkRelation(*rel, sentence_id=sentence_id, sentences=sentences) for rel in rels)
         
         return relationships
 
+
+def _text_cells(values):
+    """Mask of the non-empty string cells of a column, without a Python call per cell."""
     try:
-        text, tables = extract_text_and_tables(pdf_path)
-        doc = nlp(text)
-        
-        table_concepts, column_relationships = process_table_content(tables)
-        
-        entities, entity_contexts = extract_entities(text, nlp)
-        
-        general_relationships, concept_graph = analyze_relationships(doc, entities)
-        specific_relationships = extract_concept_relationships(text, nlp)
-        
-        concepts = {
-            'named_entities': entities,
-            'entity_contexts': entity_contexts,
-            'keywords': extract_keywords(text, kw_model),
-            'topics': extract_topics(text),
-            'table_concepts': table_concepts,
-            'column_relationships': column_relationships,
-            'general_relationships': general_relationships,
-            'specific_relationships': specific_relationships,
-            'concept_graph': concept_graph
-        }
-        
-        return concepts
-        
-    except Exception as e:
-        print(f"Error processing PDF: {str(e)}")
-        return None
+        # Cells that are not strings strip to NaN
+        stripped = values.str.strip()
+    except AttributeError:
+        # No string cells at all
+        return pd.Series(False, index=values.index)
+    return stripped.notna() & stripped.ne("")
+
+def _clean_headers(headers):
+    """
+    Table headers that are all non-empty and distinct: blank headers become
+    ``column_<n>`` and repeated ones get a ``(2)``, ``(3)``... suffix.
+    """
+    cleaned = []
+    taken = set()
+    for index, header in enumerate(headers, start=1):
+        base = (str(header).strip() if header is not None else "") or f"column_{index}"
+        name, copy = base, 1
+        while name in taken:
+            copy += 1
+            name = f"{base} ({copy})"
+        taken.add(name)
+        cleaned.append(name)
+    return cleaned
+
+def _chunk_boundary(text, limit):
+    """Index at which to cut ``text`` so the chunk is at most ``limit`` characters"""
+    window = text[:limit]
+    last_end = None
+    for match in _SENTENCE_END.finditer(window):
+        last_end = match.end()
+    if last_end:
+        return last_end
+    # No sentence end in the window; fall back to the last space
+    space = window.rfind(' ')
+    return space + 1 if space > 0 else limit
+
+# Bump whenever a change to the extraction code changes its output
+EXTRACTOR_VERSION = 4
+
+# Settings that only change how the work is scheduled, not its result
+_SCHEDULING_OPTIONS = ("page_workers",)
+
+def extractor_version(model_name="en_core_web_sm", **options):
+    """
+    Identify the extractor code, spaCy model and settings that produce a result,
+    without loading any models. Used to key cached extraction results.
+    """
+    model_version = spacy.util.get_package_version(model_name) or "unknown"
+    settings = ",".join(f"{name}={options[name]}" for name in sorted(options)
+                        if name not in _SCHEDULING_OPTIONS)
+    return f"pdf2graph-{EXTRACTOR_VERSION}/{model_name}-{model_version}/{settings}"
+
+_default_extractor = None
+
+def get_default_extractor():
+    """Return the process-wide ConceptExtractor, loading the models on first use."""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = ConceptExtractor()
+    return _default_extractor
+
+def extract_concepts_from_pdf(pdf_path, extractor=None):
+    """
+    Extract key concepts from a PDF document, including tables, and analyze relationships.
+    Thin wrapper over ``ConceptExtractor.extract`` that reuses the process-wide
+    models unless an explicit ``extractor`` is given.
+    """
+    extractor = extractor or get_default_extractor()
+    return extractor.extract(pdf_path)
 
 def format_concepts(concepts):
     """Format extracted concepts and relationships for readable output."""
@@ -239,10 +599,10 @@ def format_concepts(concepts):
                 output += f"  - {rel[0]} <-> {rel[1]}\n"
     
     output += "\nColumn Relationships in Tables:\n"
-    for cols, pairs in concepts['column_relationships'].items():
-        output += f"  - {cols.replace('_', ' <-> ')}:\n"
-        for pair in pairs[:3]:  # Show top 3 examples
-            output += f"    {pair[0]} <-> {pair[1]}\n"
+    for (col1, col2), pairs in concepts['column_relationships'].items():
+        output += f"  - {col1} <-> {col2}:\n"
+        for val1, val2, count in pairs[:3]:  # Show top 3 examples
+            output += f"    {val1} <-> {val2} (x{count})\n"
     
     output += format_relationships(concepts['specific_relationships'])
     
@@ -255,14 +615,14 @@ def format_relationships(relationships):
     if relationships.get('subject_object'):
         output += "\nSubject-Verb-Object Relationships:\n"
         for rel in relationships['subject_object']:
-            output += f"• {rel['subject']} -> {rel['verb']} -> {rel['object']}\n"
-            output += f"  Context: {rel['sentence']}\n"
+            output += f"• {rel.subject} -> {rel.verb} -> {rel.object}\n"
+            output += f"  Context: {rel.sentence}\n"
     
     if relationships.get('noun_chunks'):
         output += "\nNoun Phrase Relationships:\n"
         for rel in relationships['noun_chunks']:
-            output += f"• {rel['entity1']} -> {rel['relationship']} -> {rel['entity2']}\n"
-            output += f"  Context: {rel['sentence']}\n"
+            output += f"• {rel.entity1} -> {rel.relationship} -> {rel.entity2}\n"
+            output += f"  Context: {rel.sentence}\n"
     
     return output
 
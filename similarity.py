@@ -0,0 +1,76 @@
+import numpy as np
+
+def embed_texts(nlp, texts, batch_size=256):
+    """
+    Embed each text once with the spaCy pipeline and return a (n, dim) matrix.
+    Rows follow the order of ``texts``; the vectors are the same ones
+    ``Doc.similarity`` compares.
+    """
+    texts = list(texts)
+    width = nlp.vocab.vectors_length
+    vectors = [doc.vector for doc in nlp.pipe(texts, batch_size=batch_size)]
+    if not vectors:
+        return np.zeros((0, width), dtype=np.float32)
+    return np.vstack(vectors).astype(np.float32, copy=False)
+
+def normalize_rows(matrix):
+    """Scale every row to unit length; all-zero rows stay zero (similarity 0.0)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def cosine_matrix(left, right):
+    """Cosine similarity between every row of ``left`` and every row of ``right``."""
+    return normalize_rows(left) @ normalize_rows(right).T
+
+def similar_pairs(vectors, threshold=0.5, top_k=None, block_size=1024):
+    """
+    Find all pairs of rows whose cosine similarity is above ``threshold``.
+
+    Similarities are computed ``block_size`` rows at a time so memory stays
+    at O(block_size * n) regardless of how many rows there are. When
+    ``top_k`` is given, no row takes part in more than ``top_k`` pairs:
+    each row proposes its ``top_k`` strongest partners and the proposals
+    are accepted strongest first while both rows are under the cap.
+    Returns ``(i, j, similarity)`` tuples with ``i < j`` in ascending
+    ``(i, j)`` order.
+    """
+    unit = normalize_rows(vectors)
+    n = unit.shape[0]
+    pairs = {}
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        sims = unit[start:end] @ unit.T
+
+        for offset, row in enumerate(sims):
+            i = start + offset
+            if top_k is None:
+                # Only the upper triangle; every pair is seen once
+                candidates = np.nonzero(row[i + 1:] > threshold)[0] + i + 1
+            else:
+                row[i] = -np.inf
+                candidates = np.nonzero(row > threshold)[0]
+                if len(candidates) > top_k:
+                    strongest = np.argpartition(row[candidates], -top_k)[-top_k:]
+                    candidates = candidates[strongest]
+
+            for j in candidates:
+                key = (i, int(j)) if i < j else (int(j), i)
+                pairs[key] = float(row[j])
+
+    if top_k is not None:
+        pairs = _cap_partners(pairs, top_k)
+    return [(i, j, similarity) for (i, j), similarity in sorted(pairs.items())]
+
+def _cap_partners(pairs, top_k):
+    """Keep the strongest pairs such that no row is in more than ``top_k`` of them."""
+    partners = {}
+    kept = {}
+    for (i, j), similarity in sorted(pairs.items(), key=lambda item: (-item[1], item[0])):
+        if partners.get(i, 0) < top_k and partners.get(j, 0) < top_k:
+            kept[(i, j)] = similarity
+            partners[i] = partners.get(i, 0) + 1
+            partners[j] = partners.get(j, 0) + 1
+    return kept
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+import pytest
+import spacy
+from spacy.language import Language
+
+# The modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+FIXTURE_POS = {
+    "Acme": "PROPN", "Beta": "PROPN", "Bob": "PROPN", "Berlin": "PROPN",
+    "builds": "VERB", "manages": "VERB", "buys": "VERB", "test": "VERB",
+    "engines": "NOUN", "factory": "NOUN", "engineers": "NOUN", "parts": "NOUN",
+    "in": "ADP", "from": "ADP", "at": "ADP", "for": "ADP",
+    "the": "DET", "new": "ADJ",
+}
+
+FIXTURE_TEXT = (
+    "Acme builds engines in Berlin. Bob manages the factory for Acme. "
+    "Beta buys new engines from Acme. The engineers at Beta test parts from Bob."
+)
+
+@Language.component("fixture_parser")
+def fixture_parser(doc):
+    """
+    Deterministic stand-in for a trained parser on the fixture vocabulary:
+    the first verb of a sentence is its root, nouns before it are subjects,
+    nouns after it objects, and nouns after a preposition its objects.
+    """
+    for sent in list(doc.sents):
+        tokens = list(sent)
+        for token in tokens:
+            token.pos_ = FIXTURE_POS.get(token.text, FIXTURE_POS.get(token.lower_, "PUNCT"))
+        root = next((token for token in tokens if token.pos_ == "VERB"), tokens[0])
+        for index, token in enumerate(tokens):
+            previous = tokens[index - 1] if index else None
+            if token is root:
+                token.dep_ = "ROOT"
+                token.head = token
+            elif token.pos_ in ("DET", "ADJ"):
+                token.dep_ = "det" if token.pos_ == "DET" else "amod"
+                token.head = next(t for t in tokens[index:] if t.pos_ in ("NOUN", "PROPN"))
+            elif token.pos_ in ("NOUN", "PROPN"):
+                preposition = next((t for t in reversed(tokens[:index]) if t.pos_ not in ("DET", "ADJ")), None)
+                if preposition is not None and preposition.pos_ == "ADP":
+                    token.dep_ = "pobj"
+                    token.head = preposition
+                else:
+                    token.dep_ = "nsubj" if token.i < root.i else "dobj"
+                    token.head = root
+            elif token.pos_ == "ADP" and previous is not None and previous.pos_ == "NOUN" and previous.i < root.i:
+                token.dep_ = "prep"
+                token.head = previous
+            else:
+                token.dep_ = "prep" if token.pos_ == "ADP" else "punct"
+                token.head = root
+    return doc
+
+def make_fixture_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("fixture_parser")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "ORG", "pattern": "Acme"}, {"label": "ORG", "pattern": "Beta"},
+                        {"label": "PERSON", "pattern": "Bob"}, {"label": "GPE", "pattern": "Berlin"}])
+    return nlp
+
+@pytest.fixture(scope="session")
+def nlp():
+    return make_fixture_nlp()
@@ -0,0 +1,81 @@
+import pickle
+import pytest
+from conftest import FIXTURE_TEXT
+from concept_records import EntityContexts, SentenceTable, SubjectObject
+from extraction_cache import ExtractionCache
+
+def test_sentence_table_stores_each_sentence_once():
+    table = SentenceTable()
+    first = table.add("Acme builds engines.")
+    second = table.add("Bob manages the factory.")
+    assert table.add("Acme builds engines.") == first != second
+    assert len(table) == 2
+
+    restored = pickle.loads(pickle.dumps(table))
+    assert [restored.text(i) for i in range(len(restored))] == ["Acme builds engines.", "Bob manages the factory."]
+    # Adding to an unpickled table still finds the sentences it holds
+    assert restored.add("Bob manages the factory.") == second
+    assert restored.add("Beta buys parts.") == 2 and len(restored) == 3
+
+def test_equal_records_hash_alike():
+    left, right = SentenceTable(), SentenceTable()
+    right.add("Another sentence first.")
+    records = [SubjectObject("Acme", "builds", "engines", sentence_id=table.add("Acme builds engines."),
+                             sentences=table) for table in (left, right)]
+    assert records[0] == records[1]
+    assert len({*records}) == 1
+    other = SubjectObject("Acme", "builds", "parts", sentence_id=0, sentences=left)
+    assert {records[0]: 1}.get(other) is None
+
+@pytest.fixture
+def extracted(nlp):
+    pytest.importorskip("keybert")
+    from pdf_concept_extractor import ConceptExtractor
+    extractor = ConceptExtractor(nlp=nlp, kw_model=object())
+    doc = nlp(FIXTURE_TEXT)
+    entities, contexts = extractor.extract_entities(doc)
+    return entities, contexts, extractor.extract_concept_relationships(doc)
+
+def test_records_round_trip_through_extraction_cache(extracted, tmp_path):
+    _, contexts, relationships = extracted
+    cache = ExtractionCache(tmp_path / "cache.sqlite")
+    try:
+        cache.put("key", {'entity_contexts': contexts, 'specific_relationships': relationships})
+        restored = cache.get("key")
+    finally:
+        cache.close()
+    assert isinstance(restored['entity_contexts'], EntityContexts)
+    assert dict(restored['entity_contexts']) == dict(contexts)
+    for rel_type, records in relationships.items():
+        assert records and restored['specific_relationships'][rel_type] == records
+        assert [record.as_dict() for record in restored['specific_relationships'][rel_type]] == \
+            [record.as_dict() for record in records]
+
+def baseline_format_relationships(relationships):
+    # format_relationships as it was for plain dict records
+    output = "\nExtracted Relationships:\n"
+    if relationships.get('subject_object'):
+        output += "\nSubject-Verb-Object Relationships:\n"
+        for rel in relationships['subject_object']:
+            output += f"• {rel['subject']} -> {rel['verb']} -> {rel['object']}\n"
+            output += f"  Context: {rel['sentence']}\n"
+    if relationships.get('noun_chunks'):
+        output += "\nNoun Phrase Relationships:\n"
+        for rel in relationships['noun_chunks']:
+            output += f"• {rel['entity1']} -> {rel['relationship']} -> {rel['entity2']}\n"
+            output += f"  Context: {rel['sentence']}\n"
+    return output
+
+def test_format_concepts_matches_plain_values(extracted):
+    from pdf_concept_extractor import format_concepts
+    entities, contexts, relationships = extracted
+    concepts = {'named_entities': entities, 'entity_contexts': contexts, 'keywords': {'engines': 0.5},
+                'table_concepts': [], 'general_relationships': {}, 'column_relationships': {},
+                'specific_relationships': relationships}
+    plain_relationships = {rel_type: [record.as_dict() for record in records]
+                           for rel_type, records in relationships.items()}
+    # Everything before the relationships, from a plain {entity: [sentences]} mapping
+    head = format_concepts(dict(concepts, entity_contexts=dict(contexts), specific_relationships={}))
+    head = head.removesuffix(baseline_format_relationships({}))
+    assert format_concepts(concepts) == head + baseline_format_relationships(plain_relationships)
+    assert "Context: Acme builds engines in Berlin." in format_concepts(concepts)
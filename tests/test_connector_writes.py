@@ -0,0 +1,47 @@
+import logging
+import pytest
+import instrumentation
+from benchmarks.fake_driver import FakeDriver, FakeSession, FakeTransaction
+from instrumentation import Instrumentation
+from neo4j_integration import Neo4jConnector
+from test_graph_rows import make_concepts
+
+class RetryingSession(FakeSession):
+    """Runs every transaction function twice, as the driver does after a transient error."""
+
+    def execute_write(self, work, *args, **kwargs):
+        work(FakeTransaction(self._driver), *args, **kwargs)
+        return super().execute_write(work, *args, **kwargs)
+
+class RetryingDriver(FakeDriver):
+    def session(self, **kwargs):
+        return RetryingSession(self)
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = Instrumentation(enabled=True)
+    monkeypatch.setattr(instrumentation, "_instrumentation", metrics)
+    return metrics
+
+def write(nlp, driver):
+    connector = Neo4jConnector("bolt://localhost:7687", "neo4j", "password", nlp=nlp, manage_schema=False)
+    connector.driver = driver
+    connector.add_nodes_and_relationships(make_concepts(), "a.pdf")
+    connector.remove_document("a.pdf")
+
+def test_retried_writes_are_counted_once(nlp, metrics, caplog):
+    with caplog.at_level(logging.INFO, logger="neo4j_integration"):
+        write(nlp, FakeDriver())
+    once = metrics.snapshot(reset=True)
+    logged = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Wrote ")]
+    caplog.clear()
+
+    driver = RetryingDriver()
+    with caplog.at_level(logging.INFO, logger="neo4j_integration"):
+        write(nlp, driver)
+    retried = metrics.snapshot()
+    assert driver.transactions == 2
+    assert retried["counters"]["rows_written"] == once["counters"]["rows_written"] > 0
+    assert retried["stage_calls"]["neo4j_write"] == once["stage_calls"]["neo4j_write"]
+    assert retried["stage_calls"]["topic_similarity"] == once["stage_calls"]["topic_similarity"] == 2
+    assert len([record for record in caplog.records if record.getMessage().startswith("Wrote ")]) == len(logged)
@@ -0,0 +1,66 @@
+import sqlite3
+import pytest
+import extraction_cache
+from extraction_cache import ExtractionCache
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache.sqlite")
+    yield cache
+    cache.close()
+
+def write_pdf(path, content=b"%PDF-1.4 same bytes"):
+    path.write_bytes(content)
+    return path
+
+def test_same_content_hits_under_another_path(cache, tmp_path):
+    first = write_pdf(tmp_path / "a.pdf")
+    (tmp_path / "moved").mkdir()
+    moved = write_pdf(tmp_path / "moved" / "renamed.pdf")
+    cache.put(ExtractionCache.key_for(first, "v1"), {"topics": {"engines": 0.9}})
+    assert cache.get(ExtractionCache.key_for(moved, "v1")) == {"topics": {"engines": 0.9}}
+    changed = write_pdf(tmp_path / "changed.pdf", b"%PDF-1.4 other bytes")
+    assert cache.get(ExtractionCache.key_for(changed, "v1")) is None
+
+def test_extractor_changes_miss(cache, tmp_path, monkeypatch):
+    pytest.importorskip("keybert")
+    import pdf_concept_extractor
+    from pdf_concept_extractor import extractor_version
+    pdf = write_pdf(tmp_path / "a.pdf")
+    version = extractor_version(chunk_size=1000)
+    cache.put(ExtractionCache.key_for(pdf, version), {"topics": {}})
+    assert cache.get(ExtractionCache.key_for(pdf, extractor_version(chunk_size=1000))) is not None
+    assert cache.get(ExtractionCache.key_for(pdf, extractor_version(chunk_size=2000))) is None
+    monkeypatch.setattr(pdf_concept_extractor, "EXTRACTOR_VERSION", pdf_concept_extractor.EXTRACTOR_VERSION + 1)
+    assert cache.get(ExtractionCache.key_for(pdf, extractor_version(chunk_size=1000))) is None
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    now = iter(range(1000, 2000))
+    monkeypatch.setattr(extraction_cache.time, "time", lambda: next(now))
+    payload = {"text": "x" * 100}
+    probe = ExtractionCache(tmp_path / "probe.sqlite")
+    probe.put("probe", payload)
+    entry_size = probe.total_size()
+    probe.close()
+
+    cache = ExtractionCache(tmp_path / "cache.sqlite", max_bytes=3 * entry_size)
+    try:
+        for key in ("a", "b", "c"):
+            cache.put(key, payload)
+        assert cache.get("a") is not None
+        cache.put("d", payload)
+        assert cache.get("b") is None
+        assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+        assert cache.total_size() <= cache.max_bytes
+    finally:
+        cache.close()
+
+def test_corrupt_entry_is_dropped(cache):
+    cache.put("key", {"topics": {}})
+    cache.conn.execute("UPDATE extractions SET data = ? WHERE key = 'key'", (sqlite3.Binary(b"not zlib"),))
+    cache.conn.commit()
+    assert cache.get("key") is None
+    assert cache.conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0] == 0
+    # The re-extracted result is stored again
+    cache.put("key", {"topics": {"engines": 0.5}})
+    assert cache.get("key") == {"topics": {"engines": 0.5}}
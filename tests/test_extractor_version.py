@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip("keybert")
+from pdf_concept_extractor import extractor_version
+
+def test_scheduling_options_do_not_change_the_version():
+    options = {'chunk_size': None, 'pdf_profile': 'accurate', 'max_chunk_distance': None}
+    assert extractor_version(**options, page_workers=4) == extractor_version(**options, page_workers=1)
+    assert extractor_version(**options) == extractor_version(**options, page_workers=2)
+
+def test_output_options_change_the_version():
+    assert extractor_version(pdf_profile='fast') != extractor_version(pdf_profile='accurate')
+    assert extractor_version(max_chunk_distance=3) != extractor_version(max_chunk_distance=None)
@@ -0,0 +1,33 @@
+from neo4j_integration import graph_rows
+
+def make_concepts(prefix=""):
+    return {
+        'named_entities': {'ORG': {f'{prefix}Acme': 2, f'{prefix}Beta': 1}},
+        'entity_contexts': {},
+        'topics': {},
+        'general_relationships': {
+            'co-occurrence': [(f'{prefix}Acme', f'{prefix}Beta'), (f'{prefix}Acme', f'{prefix}Beta')],
+            'syntactic': [('builds', f'{prefix}Acme', 'nsubj')],
+        },
+        'specific_relationships': {},
+        # Two tables with the same headers, e.g. one continued on the next page
+        'column_relationships': {('Company', 'Region'): [(f'{prefix}Acme', f'{prefix}Berlin', 1),
+                                                         (f'{prefix}Beta', f'{prefix}Paris', 2),
+                                                         (f'{prefix}Acme', f'{prefix}Berlin', 3)]},
+    }
+
+def test_repeated_column_pairs_become_one_row():
+    rows = graph_rows(make_concepts(), {})
+    column_rows = sorted(rows['column'], key=lambda row: row['entity1'])
+    assert [(row['entity1'], row['entity2'], row['count']) for row in column_rows] == \
+        [('Acme', 'Berlin', 4), ('Beta', 'Paris', 2)]
+    assert all(row['relation'] == 'Company <-> Region' for row in column_rows)
+
+def test_relationship_rows_are_unique():
+    rows = graph_rows(make_concepts(), {})
+    assert rows['unweighted'] == [{'entity1': 'Acme', 'entity2': 'Beta', 'rel_type': 'co-occurrence', 'count': 2}]
+    for kind, fields in (('column', ('entity1', 'entity2', 'col1', 'col2')),
+                         ('unweighted', ('entity1', 'entity2', 'rel_type')),
+                         ('labelled', ('entity1', 'entity2', 'rel_type', 'relation'))):
+        keys = [tuple(row[field] for field in fields) for row in rows[kind]]
+        assert len(keys) == len(set(keys)), kind
@@ -0,0 +1,63 @@
+import logging
+import re
+import instrumentation
+from instrumentation import Instrumentation, timed_stage
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*\{[a-z_]+="(?:[^"\\\n]|\\["\\n])*"\} [0-9]+(?:\.[0-9]+)?$')
+
+def record_some(metrics):
+    with metrics.document("a.pdf"):
+        with metrics.stage("parse"):
+            pass
+        metrics.count("entities", 3)
+    metrics.merge({"stage_seconds": {"parse": 1.0}, "stage_calls": {"parse": 1}, "counters": {"entities": 1}})
+
+def test_disabled_instrumentation_records_nothing(monkeypatch, caplog):
+    metrics = Instrumentation(enabled=False)
+    monkeypatch.setattr(instrumentation, "_instrumentation", metrics)
+    timed_stage("decorated")(lambda: None)()
+    with caplog.at_level(logging.INFO, logger="instrumentation"):
+        record_some(metrics)
+    assert metrics.snapshot() == {"stage_seconds": {}, "stage_calls": {}, "counters": {}}
+    assert not caplog.records
+
+def test_worker_totals_merge():
+    parent = Instrumentation(enabled=True)
+    workers = [Instrumentation(enabled=True) for _ in range(2)]
+    for metrics, entities in zip(workers, (3, 4)):
+        with metrics.document("doc.pdf"):
+            with metrics.stage("parse"):
+                pass
+            with metrics.stage("parse"):
+                pass
+            metrics.count("entities", entities)
+    for metrics in workers:
+        snapshot = metrics.snapshot(reset=True)
+        assert metrics.snapshot()["counters"] == {}
+        parent.merge(snapshot)
+    with parent.stage("upload"):
+        pass
+
+    totals = parent.snapshot()
+    assert totals["counters"] == {"entities": 7}
+    assert totals["stage_calls"] == {"parse": 4, "upload": 1}
+    assert set(totals["stage_seconds"]) == {"parse", "upload"}
+    assert all(seconds >= 0 for seconds in totals["stage_seconds"].values())
+
+def test_prometheus_output_is_well_formed(tmp_path):
+    metrics = Instrumentation(enabled=True)
+    with metrics.stage("parse"):
+        pass
+    metrics.count("rows_written", 5)
+    metrics.count('odd "name"\\', 1)
+    path = tmp_path / "metrics.prom"
+    metrics.write_prometheus(path)
+
+    lines = path.read_text().splitlines()
+    samples = [line for line in lines if not line.startswith("#")]
+    assert samples and all(SAMPLE.match(line) for line in samples), samples
+    for metric in ("pdf2graph_stage_seconds_total", "pdf2graph_stage_calls_total", "pdf2graph_items_total"):
+        assert f"# TYPE {metric} counter" in lines
+    assert 'pdf2graph_items_total{name="rows_written"} 5' in lines
+    assert 'pdf2graph_items_total{name="odd \\"name\\"\\\\"} 1' in lines
+    assert not (tmp_path / "metrics.prom.tmp").exists()
@@ -0,0 +1,57 @@
+import hashlib
+import numpy as np
+import pytest
+
+pytest.importorskip("keybert")
+from keybert import KeyBERT
+from keybert.backend._base import BaseEmbedder
+from keyword_extraction import KeywordExtractor
+
+TEXTS = [
+    "Graph databases store nodes and relationships. Query engines traverse graph relationships quickly.",
+    "Region Revenue Berlin 120 Paris 95 Madrid 80 revenue growth by region",
+    "   ",
+    "Solar panels convert sunlight into electricity. Battery storage smooths solar electricity supply.",
+]
+
+class HashEmbedder(BaseEmbedder):
+    """Deterministic embeddings derived from each text, counting what it embeds."""
+
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def embed(self, documents, verbose=False):
+        self.embedded.extend(documents)
+        return np.vstack([np.random.default_rng(
+            int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        ).standard_normal(16) for text in documents])
+
+@pytest.fixture
+def kw_model():
+    return KeyBERT(model=HashEmbedder())
+
+@pytest.mark.parametrize("diversity", ["maxsum", "mmr", "none"])
+def test_batch_matches_keybert(kw_model, diversity):
+    extractor = KeywordExtractor(kw_model, diversity=diversity)
+    options = {"use_maxsum": diversity == "maxsum", "use_mmr": diversity == "mmr"}
+    expected = [dict(kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english',
+                                               top_n=10, nr_candidates=20, diversity=0.5, **options))
+                if text.strip() else {} for text in TEXTS]
+    results = extractor.extract(TEXTS)
+    assert [sorted(result) for result in results] == [sorted(keywords) for keywords in expected]
+    for result, keywords in zip(results, expected):
+        assert result == pytest.approx(keywords, abs=1e-4)
+
+def test_seen_phrases_are_not_embedded_again(kw_model):
+    embedder = kw_model.model
+    extractor = KeywordExtractor(kw_model, diversity="none")
+    extractor.extract(TEXTS[:2])
+    phrases = extractor.cache_info()["phrases"]
+    assert phrases and len(embedder.embedded) == phrases + 2
+
+    # A text whose phrases were all seen before only embeds the text itself
+    embedder.embedded.clear()
+    extractor.extract([TEXTS[0]])
+    assert embedder.embedded == [TEXTS[0]]
+    assert extractor.cache_info()["phrases"] == phrases
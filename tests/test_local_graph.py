@@ -0,0 +1,28 @@
+import networkx as nx
+import numpy as np
+import pytest
+from local_graph import LocalGraph
+
+def round_trip(graph, tmp_path):
+    path = tmp_path / "graph.p2g"
+    graph.save(path)
+    loaded = LocalGraph.load(path)
+    for name in LocalGraph.ARRAYS:
+        expected = getattr(graph, name)
+        actual = getattr(loaded, name)
+        assert actual.dtype == expected.dtype, name
+        assert np.array_equal(actual, expected, equal_nan=actual.dtype.kind == 'f'), name
+    return loaded
+
+@pytest.mark.parametrize("edges", [[], [("Acme", "Berlin"), ("Acme", "Beta")]])
+def test_save_load_round_trip(tmp_path, edges):
+    concept_graph = nx.Graph()
+    concept_graph.add_nodes_from(["Acme", "Beta", "Berlin"])
+    concept_graph.add_edges_from(edges, type='co-occurrence')
+    loaded = round_trip(LocalGraph.from_networkx(concept_graph), tmp_path)
+    assert sorted(loaded.name(node) for node in range(len(loaded.node_name))) == ["Acme", "Berlin", "Beta"]
+    assert len(loaded.cc_target) == 2 * len(edges)
+
+def test_save_load_empty_graph(tmp_path):
+    loaded = round_trip(LocalGraph.from_networkx(nx.Graph()), tmp_path)
+    assert len(loaded.node_name) == 0
@@ -0,0 +1,71 @@
+"""
+Runs against a real Neo4j server when NEO4J_TEST_URI, NEO4J_TEST_USERNAME
+and NEO4J_TEST_PASSWORD are set; skipped otherwise. Every name it writes is
+prefixed with a random tag and removed again at the end.
+"""
+import os
+import uuid
+import pytest
+from neo4j_integration import Neo4jConnector
+from test_graph_rows import make_concepts
+
+NEO4J_ENV = ("NEO4J_TEST_URI", "NEO4J_TEST_USERNAME", "NEO4J_TEST_PASSWORD")
+pytestmark = pytest.mark.skipif(not all(os.environ.get(name) for name in NEO4J_ENV),
+                                reason="needs a Neo4j server (NEO4J_TEST_URI, NEO4J_TEST_USERNAME, NEO4J_TEST_PASSWORD)")
+
+def relationship_counts(connector, prefix):
+    with connector.driver.session() as session:
+        return sorted(session.run("""
+            MATCH (a:Concept)-[r]->(b:Concept)
+            WHERE a.name STARTS WITH $prefix
+            RETURN a.name as start, b.name as end, r.type as type, r.count as count
+        """, prefix=prefix).data(), key=lambda row: (row['start'], row['end'], row['type']))
+
+@pytest.fixture
+def connector(nlp):
+    uri, user, password = (os.environ[name] for name in NEO4J_ENV)
+    connector = Neo4jConnector(uri, user, password, nlp=nlp)
+    yield connector
+    connector.close()
+
+def test_reingest_replaces_counts(connector):
+    prefix = f"test-{uuid.uuid4().hex[:8]}-"
+    document = f"{prefix}doc.pdf"
+    concepts = make_concepts(prefix)
+    try:
+        connector.add_nodes_and_relationships(concepts, document)
+        first = relationship_counts(connector, prefix)
+        assert {'start': f'{prefix}Acme', 'end': f'{prefix}Berlin', 'type': 'column_relationship', 'count': 4} in first
+        assert {'start': f'{prefix}Acme', 'end': f'{prefix}Beta', 'type': 'co-occurrence', 'count': 2} in first
+
+        connector.add_nodes_and_relationships(concepts, document)
+        assert relationship_counts(connector, prefix) == first
+
+        # A second document adds to the shared edges and takes its share out again
+        connector.add_nodes_and_relationships(concepts, f"{prefix}other.pdf")
+        doubled = relationship_counts(connector, prefix)
+        assert [row['count'] for row in doubled] == [2 * row['count'] for row in first]
+        connector.remove_document(f"{prefix}other.pdf")
+        assert relationship_counts(connector, prefix) == first
+    finally:
+        connector.remove_document(f"{prefix}other.pdf")
+        connector.remove_document(document)
+    assert relationship_counts(connector, prefix) == []
+
+def test_top_concepts_match_export(connector, nlp, tmp_path):
+    from test_topic_summaries import exported_top_concepts, make_topic_concepts
+    from graph_export import export_concepts
+    prefix = f"test-{uuid.uuid4().hex[:8]}-"
+    concepts = make_topic_concepts(prefix)
+    try:
+        connector.add_nodes_and_relationships(concepts, f"{prefix}a.pdf")
+        connector.add_nodes_and_relationships(concepts, f"{prefix}b.pdf")
+        with connector.driver.session() as session:
+            stored = session.run("MATCH (t:Topic {name: $name}) RETURN t.topConcepts as top",
+                                 name=f"{prefix}factory engines").single()["top"]
+    finally:
+        connector.remove_document(f"{prefix}b.pdf")
+        connector.remove_document(f"{prefix}a.pdf")
+    export_concepts([concepts, concepts], tmp_path, nlp)
+    assert len(set(stored)) == len(stored) == 10
+    assert stored == exported_top_concepts(tmp_path)[f"{prefix}factory engines"]
@@ -0,0 +1,29 @@
+import pytest
+from benchmarks.synthetic_pdfs import generate_pdf
+from pdf_backends import PdfplumberBackend, FastBackend, iter_pages
+
+class CountingBackend(PdfplumberBackend):
+    opened = 0
+
+    def open(self, pdf_path):
+        CountingBackend.opened += 1
+        return super().open(pdf_path)
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdfs") / "report.pdf"
+    generate_pdf(path, 12, table_density=0.5, seed=1)
+    return path
+
+def test_sequential_read_opens_the_pdf_once(pdf_path):
+    CountingBackend.opened = 0
+    pages = list(iter_pages(CountingBackend(), pdf_path, pages_per_task=4))
+    assert len(pages) == 12
+    assert CountingBackend.opened == 1
+
+@pytest.mark.parametrize("backend", [PdfplumberBackend(), FastBackend()], ids=["accurate", "fast"])
+def test_page_workers_read_the_same_pages(pdf_path, backend):
+    sequential = list(iter_pages(backend, pdf_path))
+    parallel = list(iter_pages(backend, pdf_path, page_workers=2, pages_per_task=4))
+    assert parallel == sequential
+    assert any(tables for _, tables, _ in sequential)
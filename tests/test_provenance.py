@@ -0,0 +1,75 @@
+import csv
+import json
+import pytest
+from benchmarks.fake_driver import FakeDriver
+from neo4j_integration import CONTRIBUTION_FIELDS, Neo4jConnector, document_id
+from test_graph_rows import make_concepts
+
+class StoredDocuments:
+    """Responder keeping the contributions written for each Document node."""
+
+    def __init__(self):
+        self.contributions = {}
+
+    def __call__(self, query, params):
+        if "d.contributions = $contributions" in query:
+            self.contributions[params["document"]] = params["contributions"]
+        if "AS contributions" in query:
+            return [{"contributions": self.contributions.get(params["document"]), "topics": []}]
+        return [{"stale": 0}]
+
+@pytest.fixture
+def connector(nlp):
+    connector = Neo4jConnector("bolt://localhost:7687", "neo4j", "password", nlp=nlp, manage_schema=False)
+    connector.driver = FakeDriver(StoredDocuments())
+    return connector
+
+def removal_rows(queries):
+    return [row for query, params in queries if "r.documentCount - 1" in query for row in params["rows"]]
+
+def test_reingest_withdraws_what_was_written(connector):
+    connector.add_nodes_and_relationships(make_concepts(), "a.pdf")
+    assert not removal_rows(connector.driver.queries)
+    stored = json.loads(connector.driver.responder.contributions["a.pdf"])
+    assert stored['column'] == [
+        {'entity1': 'Acme', 'entity2': 'Berlin', 'col1': 'Company', 'col2': 'Region',
+         'relation': 'Company <-> Region', 'count': 4},
+        {'entity1': 'Beta', 'entity2': 'Paris', 'col1': 'Company', 'col2': 'Region',
+         'relation': 'Company <-> Region', 'count': 2}]
+    assert set(stored) <= set(CONTRIBUTION_FIELDS)
+
+    connector.driver.reset()
+    connector.add_nodes_and_relationships(make_concepts(), "a.pdf")
+    withdrawn = removal_rows(connector.driver.queries)
+    assert sorted(map(json.dumps, withdrawn)) == sorted(json.dumps(row) for rows in stored.values() for row in rows)
+
+def test_shared_relationships_carry_no_document_lists(connector):
+    connector.add_nodes_and_relationships(make_concepts(), "a.pdf")
+    for query, params in connector.driver.queries:
+        assert "$document IN" not in query and "documentCounts" not in query
+        if "MERGE (a)-[r:" in query:
+            assert "r.documentCount = COALESCE(r.documentCount, 0) + 1" in query
+
+def test_document_id_is_derived_when_missing(connector):
+    document = connector.add_nodes_and_relationships(make_concepts())
+    assert document == document_id(make_concepts())
+    assert document in connector.driver.responder.contributions
+    assert document_id(make_concepts("x")) != document
+
+def test_concept_network_hides_provenance():
+    from neo4j_searcher import Neo4jSearcher
+    network = {"concept": "Acme", "type": "ORG", "topicRelation": {"weight": 0.5, "contextSimilarity": 0.4},
+               "connections": [{"concept": "Beta", "type": "ORG", "relationshipType": "RELATED",
+                                "properties": {"type": "co-occurrence", "count": 2, "documentCount": 1}}]}
+    searcher = Neo4jSearcher("bolt://localhost:7687", "neo4j", "password")
+    searcher.driver = FakeDriver(lambda query, params: [{"result": network}])
+    result = searcher.search_concept_network("engines", "Acme")
+    assert result["connections"][0]["properties"] == {"type": "co-occurrence", "count": 2}
+
+def test_export_counts_contributing_documents(tmp_path, nlp):
+    from graph_export import export_concepts, node_id
+    export_concepts([make_concepts(), make_concepts()], tmp_path, nlp)
+    with open(tmp_path / "related.csv", encoding="utf-8") as f:
+        rows = {(row[":START_ID(Concept)"], row[":END_ID(Concept)"]): row for row in csv.DictReader(f)}
+    row = rows[node_id('Concept', 'Acme', 'ORG'), node_id('Concept', 'Beta', 'ORG')]
+    assert (row["count:long"], row["documentCount:long"]) == ("4", "2")
@@ -0,0 +1,110 @@
+import pytest
+import query_cache
+import neo4j_searcher
+from benchmarks.fake_driver import FakeDriver
+from neo4j_schema import GRAPH_VERSION_READ
+from neo4j_searcher import Neo4jSearcher
+from query_cache import QueryCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def store(cache, key, version, value):
+    """Look up, then store, in the order the searcher uses the cache."""
+    cache.get(key, version)
+    cache.put(key, version, value)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache.time, "monotonic", clock)
+    return clock
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = QueryCache(max_entries=2, ttl=None)
+    store(cache, "a", 1, "A")
+    store(cache, "b", 1, "B")
+    assert cache.get("a", 1) == (True, "A")
+    store(cache, "c", 1, "C")
+    assert cache.get("b", 1) == (False, None)
+    assert cache.get("a", 1) == (True, "A") and cache.get("c", 1) == (True, "C")
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+def test_entries_expire_after_ttl(clock):
+    cache = QueryCache(ttl=10.0)
+    store(cache, "a", 1, "A")
+    clock.now += 10.0
+    assert cache.get("a", 1) == (True, "A")
+    clock.now += 0.5
+    assert cache.get("a", 1) == (False, None)
+    assert cache.stats()["size"] == 0
+
+def test_new_graph_version_drops_everything(clock):
+    cache = QueryCache()
+    store(cache, "a", 1, "A")
+    assert cache.get("a", 2) == (False, None)
+    # A result computed against the old version is not kept
+    cache.put("a", 1, "A")
+    assert cache.get("a", 2) == (False, None)
+    store(cache, "a", 2, "A2")
+    assert cache.get("a", 2) == (True, "A2")
+    assert cache.stats()["graphVersion"] == 2
+
+class Graph:
+    """Responder serving a graph version and one topic, counting the topic searches."""
+
+    def __init__(self):
+        self.version = 1
+        self.searches = 0
+        self.version_reads = 0
+
+    def __call__(self, query, params):
+        if query == GRAPH_VERSION_READ:
+            self.version_reads += 1
+            return [{"version": self.version}]
+        self.searches += 1
+        return [{"result": {"topic": "engines", "relevance": 0.9, "topConcepts": ["Acme"]}}]
+
+@pytest.fixture
+def searcher(clock, monkeypatch):
+    monkeypatch.setattr(neo4j_searcher.time, "monotonic", clock)
+    searcher = Neo4jSearcher("bolt://localhost:7687", "neo4j", "password", cache_size=8, cache_ttl=60.0)
+    searcher.driver = FakeDriver(Graph())
+    return searcher
+
+def test_searcher_serves_repeated_calls_from_cache(searcher):
+    graph = searcher.driver.responder
+    first = searcher.search_topics("engines")
+    assert searcher.search_topics("engines", min_relevance=0.3) == first
+    assert graph.searches == 1
+    searcher.search_topics("engines", min_relevance=0.5)
+    assert graph.searches == 2
+    assert searcher.cache_stats()["hits"] == 1
+
+def test_searcher_requeries_after_ingestion(searcher):
+    graph = searcher.driver.responder
+    searcher.search_topics("engines")
+    graph.version += 1
+    searcher.search_topics("engines")
+    assert graph.searches == 2
+
+def test_searcher_results_are_copies(searcher):
+    searcher.search_topics("engines")[0]["topConcepts"].append("changed")
+    assert searcher.search_topics("engines")[0]["topConcepts"] == ["Acme"]
+    assert searcher.driver.responder.searches == 1
+
+def test_version_check_interval_bounds_staleness(searcher, clock):
+    graph = searcher.driver.responder
+    searcher.version_check_interval = 5.0
+    searcher.search_topics("engines")
+    graph.version += 1
+    clock.now += 4.0
+    searcher.search_topics("engines")
+    assert graph.searches == 1 and graph.version_reads == 1
+    clock.now += 1.0
+    searcher.search_topics("engines")
+    assert graph.searches == 2 and graph.version_reads == 2
@@ -0,0 +1,26 @@
+from collections import Counter
+import numpy as np
+from similarity import similar_pairs
+
+def partner_counts(pairs):
+    return Counter(index for i, j, _ in pairs for index in (i, j))
+
+def test_top_k_caps_every_entity():
+    # Row 0 is a hub close to every other row
+    rng = np.random.default_rng(0)
+    hub = np.ones(8, dtype=np.float32)
+    vectors = np.vstack([hub] + [hub + rng.normal(0, 0.1, 8) for _ in range(9)])
+    for top_k in (1, 2, 3):
+        pairs = similar_pairs(vectors, threshold=0.5, top_k=top_k, block_size=4)
+        assert pairs
+        assert max(partner_counts(pairs).values()) <= top_k
+
+def test_top_k_keeps_strongest_pair():
+    vectors = np.array([[1.0, 0.0], [1.0, 0.05], [1.0, 0.3], [0.0, 1.0]], dtype=np.float32)
+    pairs = similar_pairs(vectors, threshold=0.5, top_k=1)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 1)]
+
+def test_without_top_k_every_pair_above_threshold():
+    vectors = np.array([[1.0, 0.0], [1.0, 0.05], [1.0, 0.3], [0.0, 1.0]], dtype=np.float32)
+    assert [(i, j) for i, j, _ in similar_pairs(vectors, threshold=0.5, block_size=2)] == \
+        [(0, 1), (0, 2), (1, 2)]
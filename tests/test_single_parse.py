@@ -0,0 +1,115 @@
+"""
+The single-parse pipeline must produce what the original per-stage
+functions (each running ``nlp(text)`` itself) produced on the same text.
+The semantic stage is left out: it was changed on purpose to compare
+entity texts instead of labels.
+"""
+from collections import Counter, defaultdict
+from itertools import combinations
+import pytest
+from conftest import FIXTURE_TEXT
+
+pytest.importorskip("keybert")
+from pdf_concept_extractor import ConceptExtractor
+
+# The stage functions as they were before the pipeline shared one Doc
+
+def baseline_extract_entities(text, nlp):
+    doc = nlp(text)
+    entities = {}
+    entity_contexts = defaultdict(list)
+    for ent in doc.ents:
+        if ent.label_ not in entities:
+            entities[ent.label_] = []
+        entities[ent.label_].append(ent.text)
+        entity_contexts[ent.text].append(ent.sent.text)
+    for label in entities:
+        entities[label] = dict(Counter(entities[label]))
+    return entities, entity_contexts
+
+def baseline_general_relationships(doc):
+    relationships = defaultdict(list)
+    for sent in doc.sents:
+        sent_entities = [ent.text for ent in sent.ents]
+        for ent1, ent2 in combinations(sent_entities, 2):
+            if ent1 != ent2:
+                relationships['co-occurrence'].append((ent1, ent2))
+    for token in doc:
+        if token.dep_ in ['nsubj', 'dobj', 'pobj']:
+            relationships['syntactic'].append((token.head.text, token.text, token.dep_))
+    return relationships
+
+def baseline_concept_relationships(text, nlp):
+    doc = nlp(text)
+    relationships = defaultdict(list)
+    for sent in doc.sents:
+        for token in sent:
+            if token.pos_ == "VERB":
+                subj = obj = None
+                for child in token.children:
+                    if child.dep_ in ["nsubj", "nsubjpass"]:
+                        subj = child
+                    elif child.dep_ in ["dobj", "pobj"]:
+                        obj = child
+                if subj and obj:
+                    relationships['subject_object'].append(
+                        {'subject': subj.text, 'verb': token.text, 'object': obj.text, 'sentence': sent.text})
+        chunks = list(sent.noun_chunks)
+        for i, chunk1 in enumerate(chunks):
+            for chunk2 in chunks[i+1:]:
+                if any(token.pos_ in ["VERB", "ADP"] for token in doc[chunk1.end:chunk2.start]):
+                    connecting_words = ' '.join(token.text for token in doc[chunk1.end:chunk2.start]
+                                                if token.pos_ in ["VERB", "ADP"])
+                    relationships['noun_chunks'].append(
+                        {'entity1': chunk1.text, 'relationship': connecting_words,
+                         'entity2': chunk2.text, 'sentence': sent.text})
+    return relationships
+
+@pytest.fixture
+def extractor(nlp):
+    return ConceptExtractor(nlp=nlp, kw_model=object())
+
+def test_entities_match_baseline(extractor, nlp):
+    entities, contexts = extractor.extract_entities(nlp(FIXTURE_TEXT))
+    expected_entities, expected_contexts = baseline_extract_entities(FIXTURE_TEXT, nlp)
+    assert entities == expected_entities
+    assert dict(contexts) == dict(expected_contexts)
+
+def test_general_relationships_match_baseline(extractor, nlp):
+    doc = nlp(FIXTURE_TEXT)
+    entities, _ = extractor.extract_entities(doc)
+    relationships, graph = extractor.analyze_relationships(doc, entities)
+    expected = baseline_general_relationships(doc)
+    assert relationships['co-occurrence'] == expected['co-occurrence']
+    assert relationships['syntactic'] == expected['syntactic']
+    assert expected['co-occurrence'] and expected['syntactic']
+
+def test_concept_relationships_match_baseline(extractor, nlp):
+    relationships = extractor.extract_concept_relationships(nlp(FIXTURE_TEXT))
+    expected = baseline_concept_relationships(FIXTURE_TEXT, nlp)
+    for rel_type in ('subject_object', 'noun_chunks'):
+        assert expected[rel_type]
+        assert [record.as_dict() for record in relationships[rel_type]] == expected[rel_type]
+
+def test_streaming_matches_single_parse(extractor, nlp):
+    doc = nlp(FIXTURE_TEXT)
+    entities, contexts = extractor.extract_entities(doc)
+    relationships = extractor.extract_concept_relationships(doc)
+
+    # The same text split into sentence-aligned chunks, as extract_streaming parses it
+    chunk_entities = defaultdict(Counter)
+    chunk_contexts = defaultdict(list)
+    chunk_relationships = defaultdict(list)
+    for chunk in nlp.pipe([sent.text_with_ws for sent in doc.sents]):
+        found, found_contexts = extractor.extract_entities(chunk)
+        for label, counts in found.items():
+            chunk_entities[label].update(counts)
+        for entity in found_contexts:
+            chunk_contexts[entity].extend(found_contexts[entity])
+        for rel_type, records in extractor.extract_concept_relationships(chunk).items():
+            chunk_relationships[rel_type].extend(record.as_dict() for record in records)
+
+    assert {label: dict(counts) for label, counts in chunk_entities.items()} == entities
+    assert dict(chunk_contexts) == dict(contexts)
+    assert dict(chunk_relationships) == {rel_type: [record.as_dict() for record in records]
+                                         for rel_type, records in relationships.items()}
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("keybert")
+from pdf_concept_extractor import ConceptExtractor, _text_cells
+
+def test_text_cells_only_non_empty_strings():
+    values = pd.Series(["Acme", " ", None, 3, float("nan"), "Beta ", ""], dtype=object)
+    assert _text_cells(values).tolist() == [True, False, False, False, False, True, False]
+    assert not _text_cells(pd.Series([1, 2, 3])).any()
+
+def test_column_pairs_are_counted(nlp):
+    extractor = ConceptExtractor(nlp=nlp, kw_model=object())
+    table = pd.DataFrame([["Acme", "Berlin", "1"], ["Acme", "Berlin", ""], ["Beta", None, "2"]],
+                         columns=["Company", "", "Company"])
+    relationships = extractor.table_column_relationships(table)
+    assert relationships[("Company", "column_2")] == [("Acme", "Berlin", 2)]
+    assert relationships[("Company", "Company (2)")] == [("Acme", "1", 1), ("Beta", "2", 1)]
@@ -0,0 +1,15 @@
+from neo4j_integration import find_topic_concept_relationships
+
+def associated(nlp, topics, entity_contexts):
+    relationships = find_topic_concept_relationships(nlp, topics, entity_contexts)
+    return {topic: sorted(rel['entity'] for rel in rels) for topic, rels in relationships.items()}
+
+def test_topic_spanning_two_context_sentences_matches(nlp):
+    # The fixture pipeline has no vectors, so only the substring checks can match
+    entity_contexts = {
+        "Acme": ["Acme sells solar", "panels worldwide."],
+        "Beta": ["Beta sells wind turbines."],
+        "Bob": ["Bob buys panels.", "Solar is cheap."],
+    }
+    found = associated(nlp, {"solar panels": 0.8, "wind turbines": 0.6, "solar": 0.5}, entity_contexts)
+    assert found == {"solar panels": ["Acme"], "wind turbines": ["Beta"], "solar": ["Acme", "Bob"]}
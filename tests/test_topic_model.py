@@ -0,0 +1,91 @@
+import logging
+from pathlib import Path
+import pytest
+from extraction_cache import ExtractionCache
+from topic_model import CorpusTopicModel
+
+FEATURES = 2 ** 12
+
+def model(path=None):
+    return CorpusTopicModel(path, n_features=FEATURES)
+
+def test_frequencies_persist_and_accumulate(tmp_path):
+    path = tmp_path / "topics.npz"
+    first = model(path)
+    first.score(first.document_terms("graph databases store nodes"))
+    first.save()
+
+    second = CorpusTopicModel.load(path)
+    assert second.n_features == FEATURES and second.n_documents == 1
+    second.score(second.document_terms("graph queries traverse nodes"))
+    second.save()
+
+    third = CorpusTopicModel.load(path)
+    assert third.n_documents == 2
+    assert third.document_frequencies[third._columns(["nodes"])].tolist() == [2]
+    assert third.document_frequencies[third._columns(["databases"])].tolist() == [1]
+
+def test_counted_document_is_not_counted_again(tmp_path):
+    path = tmp_path / "topics.npz"
+    topic_model = model(path)
+    text = "graph databases store nodes"
+    assert topic_model.add(topic_model.document_terms(text))
+    assert not topic_model.add(topic_model.document_terms(text))
+    topic_model.save()
+
+    reloaded = CorpusTopicModel.load(path)
+    reloaded.score(reloaded.document_terms(text))
+    assert reloaded.n_documents == 1
+    assert reloaded.document_frequencies.max() == 1
+
+def test_empty_texts_are_not_counted():
+    topic_model = model()
+    for text in ("", "   \n", "the and of"):
+        terms = topic_model.document_terms(text)
+        assert topic_model.score(terms) == {}
+        assert not topic_model.add(terms)
+    assert topic_model.n_documents == 0
+    assert topic_model.add(topic_model.document_terms("graph databases"))
+
+def test_load_rejects_other_hashing_options(tmp_path):
+    path = tmp_path / "topics.npz"
+    model(path).save()
+    assert CorpusTopicModel.load(path, n_features=FEATURES, ngram_range=(1, 2)).n_features == FEATURES
+    with pytest.raises(ValueError, match="n_features"):
+        CorpusTopicModel.load(path, n_features=2 ** 20)
+    with pytest.raises(ValueError, match="ngram_range"):
+        CorpusTopicModel.load(path, ngram_range=(1, 1))
+
+class RecordingConnector:
+    def __init__(self):
+        self.topics = []
+
+    def add_nodes_and_relationships(self, concepts, document=None):
+        self.topics.append(concepts['topics'])
+
+def test_cache_hit_is_rescored_against_current_corpus(tmp_path):
+    pytest.importorskip("keybert")
+    from main import IngestSummary, upload_concepts
+
+    topic_model = model()
+    pdf_file = Path("report.pdf")
+    terms = topic_model.document_terms("graph nodes graph edges graph storage")
+    cache = ExtractionCache(tmp_path / "cache.sqlite")
+    cache.put("report", {'topic_terms': terms, 'topics': {}})
+    connector = RecordingConnector()
+    summary = IngestSummary()
+    logger = logging.getLogger(__name__)
+    try:
+        upload_concepts(connector, pdf_file, cache.get("report"), summary, logger, topic_model)
+        # Later documents make "graph" common, so it weighs less on the next run
+        for text in ("graph theory", "graph layouts", "graph drawing"):
+            topic_model.score(topic_model.document_terms(text))
+        upload_concepts(connector, pdf_file, cache.get("report"), summary, logger, topic_model)
+    finally:
+        cache.close()
+
+    first, second = connector.topics
+    assert topic_model.n_documents == 4
+    assert second == topic_model.score(terms, update=False)
+    assert second["graph"] < first["graph"]
+    assert summary.uploaded == ["report.pdf", "report.pdf"] and not summary.upload_failed
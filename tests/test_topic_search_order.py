@@ -0,0 +1,57 @@
+"""
+Paged and unpaged topic searches must return topics in the same order. The
+Neo4j test runs against a real server when NEO4J_TEST_URI,
+NEO4J_TEST_USERNAME and NEO4J_TEST_PASSWORD are set.
+"""
+import os
+import uuid
+import pytest
+from local_graph import LocalSearcher, _GraphBuilder
+from neo4j_searcher import Neo4jSearcher
+from test_neo4j_reingest import NEO4J_ENV
+
+# Ties on relevance and topics without one
+RELEVANCES = [0.9, 0.5, None, 0.5, 0.0, None, 0.5, 0.2, 0.9, None]
+
+def topic_names(prefix):
+    return [f"{prefix}topic {i:02d}" for i in range(len(RELEVANCES))]
+
+def expected_order(prefix):
+    topics = zip(topic_names(prefix), RELEVANCES)
+    return [name for name, _ in sorted(topics, key=lambda topic: (-(topic[1] or 0.0), topic[0]))]
+
+def test_local_search_sorts_missing_relevance_as_zero():
+    builder = _GraphBuilder()
+    for name, relevance in zip(topic_names(""), RELEVANCES):
+        builder.add_node(name, 'Topic', name, None, relevance)
+    searcher = LocalSearcher(builder.build())
+    results = searcher.search_topics("topic")
+    assert [result["topic"] for result in results] == expected_order("")
+    assert searcher.search_topics("topic", limit=4) == results[:4]
+
+@pytest.mark.skipif(not all(os.environ.get(name) for name in NEO4J_ENV),
+                    reason="needs a Neo4j server (NEO4J_TEST_URI, NEO4J_TEST_USERNAME, NEO4J_TEST_PASSWORD)")
+def test_pages_add_up_to_unpaged_results():
+    prefix = f"test-{uuid.uuid4().hex[:8]}-"
+    searcher = Neo4jSearcher(*(os.environ[name] for name in NEO4J_ENV))
+    topics = [{"name": name, "relevance": relevance} for name, relevance in zip(topic_names(prefix), RELEVANCES)]
+    try:
+        with searcher.driver.session() as session:
+            session.run("UNWIND $topics AS topic CREATE (t:Topic {name: topic.name}) "
+                        "SET t.relevance = topic.relevance", topics=topics).consume()
+        unpaged = searcher.search_topics(prefix)
+        assert [result["topic"] for result in unpaged] == expected_order(prefix)
+
+        pages, cursor = [], None
+        while True:
+            page = searcher.search_topics_page(prefix, page_size=3, cursor=cursor)
+            pages += page["results"]
+            cursor = page["nextCursor"]
+            if cursor is None:
+                break
+        assert pages == unpaged
+        assert searcher.search_topics(prefix, limit=4) == unpaged[:4]
+    finally:
+        with searcher.driver.session() as session:
+            session.run("MATCH (t:Topic) WHERE t.name STARTS WITH $prefix DETACH DELETE t", prefix=prefix).consume()
+        searcher.close()
@@ -0,0 +1,33 @@
+import csv
+from graph_export import ARRAY_DELIMITER, export_concepts
+from local_graph import LocalGraph
+from neo4j_integration import TOP_CONCEPTS
+
+def make_topic_concepts(prefix=""):
+    """One topic mentioned with twelve companies that also appear, typed differently, in a table."""
+    topic = f"{prefix}factory engines"
+    names = [f"{prefix}Maker{i:02d}" for i in range(12)]
+    return {
+        'named_entities': {'ORG': {name: 1 for name in names}},
+        'entity_contexts': {name: [f"{name} builds the {topic}."] for name in names},
+        'topics': {topic: 0.8},
+        'general_relationships': {},
+        'specific_relationships': {},
+        'column_relationships': {('Company', 'Region'): [(name, f"{prefix}Berlin", 1) for name in names]},
+    }
+
+def exported_top_concepts(directory):
+    with open(directory / "topics.csv", encoding="utf-8") as f:
+        return {row["name"]: row["topConcepts:string[]"].split(ARRAY_DELIMITER) for row in csv.DictReader(f)}
+
+def test_top_concepts_are_distinct(tmp_path, nlp):
+    # The second document's topic associations reach both concept nodes of each name
+    concepts = make_topic_concepts()
+    export_concepts([concepts, concepts], tmp_path, nlp)
+    exported = exported_top_concepts(tmp_path)["factory engines"]
+    assert exported == sorted(concepts['named_entities']['ORG'])[:TOP_CONCEPTS]
+
+    graph = LocalGraph.from_import_csv(tmp_path)
+    topic = graph.find_topic("factory engines")
+    assert graph.topic_degree(topic) == 24
+    assert graph.top_concepts(topic) == exported
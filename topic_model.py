@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+import numpy as np
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+
+class DocumentTerms:
+    """
+    What the topic model needs to know about one document, without its text.
+
+    ``columns`` are the hashed columns of every distinct term (for document
+    frequencies) and ``counts`` the term counts of its most frequent terms
+    (the topic candidates). Small enough to travel in ``concepts`` dicts, the
+    extraction cache and between worker processes.
+    """
+    __slots__ = ('digest', 'n_features', 'columns', 'counts')
+
+    def __init__(self, digest, n_features, columns, counts):
+        self.digest = digest
+        self.n_features = n_features
+        self.columns = columns
+        self.counts = counts
+
+class CorpusTopicModel:
+    """
+    Corpus-level TF-IDF topic scoring without a fitted vocabulary.
+
+    Terms (unigrams and bigrams by default) are hashed into ``n_features``
+    columns the way ``HashingVectorizer`` does, and the number of documents
+    containing each column is kept in a single array. Scoring a document adds
+    it to those document frequencies once (documents are recognized by a
+    digest of their text) and weighs its ``max_candidates`` most frequent
+    terms by the corpus IDF, with the same smoothing and l2 norm as
+    ``TfidfVectorizer``. Nothing is ever refitted, so a corpus is one pass.
+
+    With a ``path`` the state is saved every ``save_every`` new documents
+    and by ``save``; ``load`` continues from it. Documents without any
+    terms (e.g. empty text) are scored but never counted.
+    """
+
+    def __init__(self, path=None, n_features=2 ** 20, ngram_range=(1, 2), stop_words='english',
+                 top_n=10, max_candidates=50, save_every=1000):
+        self.path = path
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.top_n = top_n
+        self.max_candidates = max_candidates
+        self.save_every = save_every
+        self.logger = logging.getLogger(__name__)
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=self.ngram_range,
+                                            stop_words=stop_words, alternate_sign=False, norm=None)
+        self._analyzer = self.vectorizer.build_analyzer()
+        # HashingVectorizer's own hasher settings, applied to single terms
+        self._hasher = FeatureHasher(n_features=n_features, input_type="string", alternate_sign=False)
+        self.document_frequencies = np.zeros(n_features, dtype=np.uint32)
+        self.n_documents = 0
+        self._digests = set()
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path, **options):
+        """
+        The model saved at ``path``, or a new one that will be saved there.
+        Raises ``ValueError`` when ``options`` disagree with its saved hashing
+        settings (``n_features``, ``ngram_range``, ``stop_words``).
+        """
+        if not Path(path).exists():
+            return cls(path, **options)
+        with np.load(path) as state:
+            config = json.loads(str(state["config"]))
+            for name, saved in config.items():
+                if name in options and json.loads(json.dumps(options[name])) != saved:
+                    raise ValueError(f"{path} was saved with {name}={saved!r}, not {options[name]!r}")
+            model = cls(path, **{**options, **config})
+            model.document_frequencies = state["document_frequencies"].astype(np.uint32)
+            model.n_documents = int(state["n_documents"])
+            model._digests = {digest.tobytes() for digest in state["digests"]}
+        model.logger.info(f"Loaded topic model with {model.n_documents} documents from {path}")
+        return model
+
+    def save(self, path=None):
+        """Write the state to ``path`` (default: the model's path), replacing it atomically."""
+        path = Path(path or self.path)
+        config = {"n_features": self.n_features, "ngram_range": list(self.ngram_range),
+                  "stop_words": self.stop_words}
+        digests = np.frombuffer(b"".join(sorted(self._digests)), dtype=np.uint8).reshape(-1, 16)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, config=np.array(json.dumps(config)),
+                                document_frequencies=self.document_frequencies,
+                                n_documents=np.array(self.n_documents), digests=digests)
+        os.replace(temp_path, path)
+        self._unsaved = 0
+
+    def document_terms(self, text):
+        """Hash the terms of ``text`` into a ``DocumentTerms`` record."""
+        counts = Counter(self._analyzer(text))
+        columns = np.unique(self._columns(list(counts))).astype(np.int32)
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return DocumentTerms(digest, self.n_features, columns, dict(counts.most_common(self.max_candidates)))
+
+    def add(self, terms):
+        """Count ``terms``' document in the corpus; False when it was already counted or has no terms."""
+        if terms.n_features != self.n_features:
+            raise ValueError(f"Terms hashed into {terms.n_features} columns, the model has {self.n_features}")
+        # Every empty text has the same digest; none of them is a document to count
+        if not len(terms.columns) or terms.digest in self._digests:
+            return False
+        self.document_frequencies[terms.columns] += 1
+        self.n_documents += 1
+        self._digests.add(terms.digest)
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.save_every:
+            self.save()
+        return True
+
+    def idf(self, terms):
+        """Smoothed inverse document frequency of each term."""
+        frequencies = self.document_frequencies[self._columns(terms)]
+        return np.log((1 + self.n_documents) / (1 + frequencies)) + 1
+
+    def score(self, terms, update=True):
+        """``{term: score}`` for the ``top_n`` topics of a document, adding it to the corpus first."""
+        if update:
+            self.add(terms)
+        if not terms.counts:
+            return {}
+        names = list(terms.counts)
+        scores = np.fromiter(terms.counts.values(), dtype=float, count=len(names)) * self.idf(names)
+        scores /= np.linalg.norm(scores)
+        top_indices = scores.argsort()[-self.top_n:][::-1]
+        return {names[i]: float(scores[i]) for i in top_indices}
+
+    def _columns(self, terms):
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+        return self._hasher.transform([[term] for term in terms]).indices